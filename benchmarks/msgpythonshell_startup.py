@@ -0,0 +1,152 @@
+"""Benchmark of the startup latency of
+:class:`crl.interactivesessions.shells.msgpythonshell.MsgPythonShell`. The
+compressed launcher is compared to the command sequence with the bootstrap
+cache of the target both in the cache miss and in the cache hit cases. The
+local *serverterminal* stand-ins of the tests are used as the remote end so
+the latency excludes the connection setup and the spawning of the
+interpreter.
+
+Usage::
+
+    python benchmarks/msgpythonshell_startup.py [--count COUNT]
+"""
+from __future__ import print_function
+import argparse
+import os
+import sys
+import shutil
+import tempfile
+from contextlib import contextmanager
+from multiprocessing import Process
+import mock
+from monotonic import monotonic
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# pylint: disable=wrong-import-position
+from crl.interactivesessions.shells.msgpythonshell import (  # noqa: E402
+    MsgPythonShell)
+from crl.interactivesessions.shells import remotemodules  # noqa: E402
+from tests.shells.terminals.serverterminal import (  # noqa: E402
+    ServerProcess,
+    ServerTerminal)
+from tests.shells.terminals.promptpythonserver import (  # noqa: E402
+    PromptPythonServer)
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+class _ChunklessServerComm(remotemodules.servercomm.ServerComm):
+    def write(self, s):
+        self._write(s)
+        self._flush()
+
+
+class _CountingServerTerminal(ServerTerminal):
+    def __init__(self, *args, **kwargs):
+        super(_CountingServerTerminal, self).__init__(*args, **kwargs)
+        self.sent_bytes = 0
+
+    def send(self, s):
+        self.sent_bytes += len(s)
+        super(_CountingServerTerminal, self).send(s)
+
+
+def _create_server():
+    server = PromptPythonServer()
+    server.set_comm_factory(_ChunklessServerComm.create)
+    server.set_pythoncmdline_factory(remotemodules.pythoncmdline.PythonCmdline)
+    return server
+
+
+def _create_serverprocess():
+    serverprocess = ServerProcess()
+    serverprocess.set_process_factory(Process)
+    serverprocess.set_server_factory(_create_server)
+    return serverprocess
+
+
+def _create_terminal():
+    terminal = _CountingServerTerminal()
+    terminal.set_serverprocess_factory(_create_serverprocess)
+    terminal.start()
+    return terminal
+
+
+def _measure_start(compressed_launch):
+    MsgPythonShell.set_compressed_launch(compressed_launch)
+    terminal = _create_terminal()
+    shell = MsgPythonShell()
+    shell.set_terminal(terminal)
+    start = monotonic()
+    shell.start()
+    elapsed = monotonic() - start
+    sent_bytes = terminal.sent_bytes
+    shell.exit()
+    terminal.join(timeout=3)
+    return elapsed, sent_bytes
+
+
+@contextmanager
+def _runtime_dir():
+    orig = os.environ.get('XDG_RUNTIME_DIR')
+    runtime_dir = tempfile.mkdtemp()
+    os.environ['XDG_RUNTIME_DIR'] = runtime_dir
+    try:
+        yield runtime_dir
+    finally:
+        shutil.rmtree(runtime_dir)
+        if orig is None:
+            del os.environ['XDG_RUNTIME_DIR']
+        else:
+            os.environ['XDG_RUNTIME_DIR'] = orig
+
+
+def _cache_miss():
+    with _runtime_dir():
+        return _measure_start(compressed_launch=False)
+
+
+def _cache_hit():
+    with _runtime_dir():
+        _measure_start(compressed_launch=False)
+        return _measure_start(compressed_launch=False)
+
+
+def _compressed():
+    return _measure_start(compressed_launch=True)
+
+
+STARTUPS = [('cache miss', _cache_miss),
+            ('cache hit', _cache_hit),
+            ('compressed', _compressed)]
+
+
+@contextmanager
+def _mock_term_functions():
+    with mock.patch('termios.tcgetattr'):
+        with mock.patch('termios.tcsetattr', return_value=None):
+            with mock.patch('tty.setraw', return_value=None):
+                yield None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20,
+                        help='number of startups of each kind')
+    args = parser.parse_args()
+    print('{:<12} {:>12} {:>12} {:>12}'.format(
+        'startup', 'median ms', 'max ms', 'sent bytes'))
+    with _mock_term_functions():
+        for name, startup in STARTUPS:
+            results = [startup() for _ in range(args.count)]
+            latencies = sorted(elapsed for elapsed, _ in results)
+            print('{:<12} {:>12.1f} {:>12.1f} {:>12}'.format(
+                name,
+                latencies[len(latencies) // 2] * 1000,
+                latencies[-1] * 1000,
+                results[-1][1]))
+    MsgPythonShell.set_compressed_launch(False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Microbenchmark of the local memory and the attribute access overhead of
+the remote proxies. The proxies are compared to a stand-in with the
+previous *__dict__* based layout. No remote end is needed as only the local
+operations of the proxies are measured.
+
+Usage::
+
+    python benchmarks/proxies.py [--count COUNT]
+"""
+from __future__ import print_function
+import argparse
+import gc
+import timeit
+from crl.interactivesessions.remoteproxies import _RemoteProxy
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+class _OfflineTerminal(object):
+    session_id = 'benchmark'
+
+
+class _Spec(object):
+    def method(self):
+        pass
+
+
+class _DictLayoutProxy(object):
+    """Stand-in of the proxy keeping its state in *__dict__*."""
+
+    def __init__(self, session, remote_name, local_spec=None):
+        self.__dict__['_session'] = session
+        self.__dict__['_handle'] = remote_name
+        self.__dict__['_spec'] = local_spec
+        self.__dict__['__parent'] = None
+        self.__dict__['_is_remote_owned'] = False
+        self.__dict__['_remote_proxy_type_key'] = None
+        self.__dict__['_remote_proxy_default_timeout'] = 3600
+        self.__dict__['_remote_proxy_session_id'] = session.session_id
+        self.__dict__['_remote_proxy_timeout'] = 3600
+        self.__dict__['_remote_proxy_response'] = None
+        self.__dict__['_remote_proxy_is_async'] = False
+        if local_spec:
+            self.__dict__['method'] = lambda *args, **kwargs: None
+
+    def __getattr__(self, name):
+        if name in self.__dict__:
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name, val):
+        raise AttributeError(name)
+
+
+def _create_remote_proxy(session, remote_name, local_spec=None):
+    return _RemoteProxy(session, remote_name, local_spec=local_spec,
+                        is_remote_owned=False)
+
+
+def _create_proxies(factory, count):
+    session = _OfflineTerminal()
+    return [factory(session, 'obj{}'.format(i)) for i in range(count)]
+
+
+def _get_memory_per_proxy(factory, count):
+    try:
+        import tracemalloc
+    except ImportError:
+        return float('nan')
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    proxies = _create_proxies(factory, count)
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del proxies
+    return float(size) / count
+
+
+def _get_access_time(proxy, attr, number):
+    return timeit.timeit(lambda: getattr(proxy, attr), number=number) / number * 1e9
+
+
+FACTORIES = [('dict layout', _DictLayoutProxy),
+             ('_RemoteProxy', _create_remote_proxy)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000,
+                        help='number of proxies in memory measurement')
+    parser.add_argument('--number', type=int, default=1000000,
+                        help='number of attribute accesses in timing')
+    args = parser.parse_args()
+    print('{:<16} {:>14} {:>16} {:>16}'.format(
+        'proxy', 'bytes/proxy', 'internal ns/get', 'method ns/get'))
+    for name, factory in FACTORIES:
+        proxy = factory(_OfflineTerminal(), 'obj')
+        spec_proxy = factory(_OfflineTerminal(), 'obj', local_spec=_Spec)
+        print('{:<16} {:>14.1f} {:>16.1f} {:>16.1f}'.format(
+            name,
+            _get_memory_per_proxy(factory, args.count),
+            _get_access_time(proxy, '_handle', args.number),
+            _get_access_time(spec_proxy, 'method', args.number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,31 @@
 import os
 import sys
+import time
 import types
 import pickle
 import base64
+import itertools
 import traceback
 import threading
 if os.name == 'posix':
     import fcntl
 import struct
 from io import BytesIO
+from collections import OrderedDict
 from contextlib import contextmanager
 from functools import wraps
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+try:
+    from inspect import getattr_static
+except ImportError:
+    getattr_static = getattr
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -19,6 +34,7 @@ TOKEN = b'+7_<sf80UBtd%umz'
 SIZE_PACKER = struct.Struct('!I')
 PY3 = (sys.version_info.major == 3)
 UNICODE_TYPE = str if PY3 else unicode  # pylint: disable=undefined-variable; # noqa F821
+SAFE_DESCRIPTOR_TYPES = (types.MemberDescriptorType, types.GetSetDescriptorType)
 
 
 def get_python_file_path():
@@ -38,6 +54,38 @@ class RunnerHandlerUnableToDeserialize(Exception):
 _PROXY_CONTAINER = _Container()
 
 
+class _CodeCache(object):
+    """Thread-safe least recently used cache of at most *maxsize* code
+    objects keyed by the source.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._codes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_code_object(self, code):
+        with self._lock:
+            try:
+                code_obj = self._codes.pop(code)
+            except KeyError:
+                code_obj = self._compile(code)
+                if len(self._codes) >= self.maxsize:
+                    self._codes.popitem(last=False)
+            self._codes[code] = code_obj
+            return code_obj
+
+    @staticmethod
+    def _compile(code):
+        try:
+            return compile(code, '', 'eval')
+        except SyntaxError:
+            return compile(code, '', 'single')
+
+    def __len__(self):
+        return len(self._codes)
+
+
 def create_module(modulename):
     n = (modulename.encode('utf-8')
          if not PY3 and isinstance(modulename, UNICODE_TYPE) else
@@ -92,17 +140,344 @@ class FileHandle(object):
         self._write_stdout_with_flush(to_be_flushed)
 
 
+class _WorkerPool(object):
+    """Pool of persistent worker threads. Each submitted task is executed
+    immediately either by an idle worker or by a new worker so that blocking
+    tasks do not delay the other tasks. At most *max_idle* workers are kept
+    waiting for new tasks and the workers exit after being idle for
+    *idle_timeout* seconds.
+    """
+
+    def __init__(self, max_idle=4, idle_timeout=60):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._size = 0
+
+    @property
+    def size(self):
+        """Number of worker threads."""
+        return self._size
+
+    def submit(self, task):
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            else:
+                self._start_worker()
+        self._tasks.put(task)
+
+    def _start_worker(self):
+        thread = threading.Thread(target=self._work)
+        thread.daemon = True
+        thread.start()
+        self._size += 1
+
+    def _work(self):
+        while True:
+            try:
+                task = self._tasks.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                if self._stop_if_idle():
+                    return
+                continue
+            try:
+                task()
+            finally:
+                if not self._set_idle_or_stop():
+                    return
+
+    def _stop_if_idle(self):
+        # If all the idle workers are reserved by submit, the task is
+        # already on its way to this worker.
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+                self._size -= 1
+                return True
+            return False
+
+    def _set_idle_or_stop(self):
+        with self._lock:
+            if self._idle >= self.max_idle:
+                self._size -= 1
+                return False
+            self._idle += 1
+            return True
+
+
+class _ChunkedIterator(object):
+    """Iterator reading ahead at most *read_ahead* items of *iterable* in a
+    background thread. The items are returned in chunks of at most
+    *max_items* items or about *max_bytes* bytes. Only the first item of the
+    chunk is waited for so the chunks contain the items available.
+
+    The reading is stopped by :meth:`close` which is called also when the
+    iterator is deleted. The thread stops after the item being read from
+    *iterable*, if any.
+    """
+    _end = object()
+    _stop_check_interval = 0.1
+
+    def __init__(self, iterable, max_items, max_bytes, read_ahead):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._items = queue.Queue(maxsize=read_ahead)
+        self._stop = threading.Event()
+        self._error = None
+        self._exhausted = False
+        self._thread = threading.Thread(
+            target=self._read, args=(iter(iterable), self._items, self._stop))
+        self._thread.daemon = True
+        self._thread.start()
+
+    @classmethod
+    def _read(cls, iterator, items, stop):
+        try:
+            for item in iterator:
+                if not cls._put(items, (item, None), stop):
+                    return
+        except Exception as e:  # pylint: disable=broad-except
+            e.trace = traceback.format_list(traceback.extract_tb(sys.exc_info()[2]))
+            cls._put(items, (cls._end, e), stop)
+        else:
+            cls._put(items, (cls._end, None), stop)
+
+    @classmethod
+    def _put(cls, items, entry, stop):
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=cls._stop_check_interval)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def close(self):
+        """Stop reading ahead."""
+        self._stop.set()
+
+    def __del__(self):
+        self.close()
+
+    def get_chunk(self):
+        """Return tuple of the list of the next items and boolean which is
+        *True* if the iterator is exhausted.
+        """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        chunk = []
+        size = 0
+        block = True
+        while not (self._exhausted or self._is_full(chunk, size)):
+            try:
+                item, error = self._items.get(block=block)
+            except queue.Empty:
+                break
+            block = False
+            if item is self._end:
+                self._set_end(error, chunk)
+                break
+            chunk.append(item)
+            size += self._get_size(item)
+        return chunk, self._exhausted
+
+    def _is_full(self, chunk, size):
+        return len(chunk) >= self.max_items or size >= self.max_bytes
+
+    def _set_end(self, error, chunk):
+        self._exhausted = error is None
+        if error is not None:
+            if not chunk:
+                raise error
+            self._error = error
+
+    @staticmethod
+    def _get_size(item):
+        try:
+            return len(item)
+        except TypeError:
+            return 1
+
+
+class _StdoutCapture(object):
+    """Capture of the *sys.stdout* writes of the current thread. While
+    any thread is capturing, *sys.stdout* is replaced by this object which
+    writes to the buffer of the current thread or, if the thread is not
+    capturing, to the original stream.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._count = 0
+        self._original = None
+
+    @contextmanager
+    def capture(self):
+        buf = StringIO()
+        self._start(buf)
+        try:
+            yield buf
+        finally:
+            self._stop()
+
+    def _start(self, buf):
+        with self._lock:
+            if not self._count:
+                self._original = sys.stdout
+                sys.stdout = self
+            self._count += 1
+        self._local.buf = buf
+
+    def _stop(self):
+        self._local.buf = None
+        with self._lock:
+            self._count -= 1
+            if not self._count:
+                sys.stdout = self._original
+                self._original = None
+
+    def _get_stream(self):
+        buf = getattr(self._local, 'buf', None)
+        return self._original if buf is None else buf
+
+    def write(self, s):
+        return self._get_stream().write(s)
+
+    def flush(self):
+        self._get_stream().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._get_stream(), name)
+
+
+class _ResponseExpired(KeyError):
+    pass
+
+
+class _ResponseStore(object):
+    """Store of the responses not yet requested by the client. If the
+    limits are set, the completed responses are evicted if they are not
+    requested in *max_age* seconds or if there are more than *max_size*
+    completed responses in the store. The completed responses are kept
+    in the completion order so that the oldest ones are evicted first.
+    By default, no responses are evicted.
+    The running responses are never evicted. The ids of the latest evicted
+    responses are remembered so that the requests of the evicted responses
+    can be told from the requests of the unknown ones. The response ids are
+    never reused.
+    """
+
+    def __init__(self, max_age=None, max_size=None):
+        self.max_age = max_age
+        self.max_size = max_size
+        self.evicted_expired = 0
+        self.evicted_overflow = 0
+        self._id_iter = itertools.count()
+        self._responses = OrderedDict()
+        self._completed = OrderedDict()
+        self._evicted_ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_limits(self, max_age, max_size):
+        with self._lock:
+            self.max_age = max_age
+            self.max_size = max_size
+            self._evict()
+
+    def new_id(self):
+        with self._lock:
+            return next(self._id_iter)
+
+    def add(self, response_id, response):
+        with self._lock:
+            self._responses[response_id] = response
+            if response.done:
+                self._completed[response_id] = response
+            self._evict()
+
+    def set_done(self, response_id):
+        """Mark response *response_id* completed if it is in the store.
+        """
+        with self._lock:
+            response = self._responses.get(response_id)
+            if response is not None:
+                self._completed.setdefault(response_id, response)
+
+    def get(self, response_id):
+        """Return response *response_id*.
+
+        Raises:
+            _ResponseExpired: if the response is evicted.
+            KeyError: if the response is unknown.
+        """
+        with self._lock:
+            self._evict()
+            try:
+                return self._responses[response_id]
+            except KeyError:
+                if response_id in self._evicted_ids:
+                    raise _ResponseExpired(response_id)
+                raise
+
+    def remove(self, response_id):
+        with self._lock:
+            self._responses.pop(response_id, None)
+            self._completed.pop(response_id, None)
+
+    def get_stats(self):
+        with self._lock:
+            self._evict()
+            return {'size': len(self._responses),
+                    'completed': len(self._completed),
+                    'running': len(self._responses) - len(self._completed),
+                    'evicted_expired': self.evicted_expired,
+                    'evicted_overflow': self.evicted_overflow,
+                    'max_age': self.max_age,
+                    'max_size': self.max_size}
+
+    def _evict(self):
+        if self.max_age is None and self.max_size is None:
+            return
+        if self.max_age is not None:
+            expired_time = time.time() - self.max_age
+            while self._completed:
+                response_id, response = next(iter(self._completed.items()))
+                if response.done_time >= expired_time:
+                    break
+                self._evict_response(response_id)
+                self.evicted_expired += 1
+        while self.max_size is not None and len(self._completed) > self.max_size:
+            self._evict_response(next(iter(self._completed)))
+            self.evicted_overflow += 1
+
+    def _evict_response(self, response_id):
+        del self._responses[response_id]
+        del self._completed[response_id]
+        self._evicted_ids[response_id] = None
+        while len(self._evicted_ids) > max(self.max_size or 0, 1000):
+            self._evicted_ids.popitem(last=False)
+
+    def __len__(self):
+        return len(self._responses)
+
+
 class _Response(object):
     def __init__(self, function, runnerhandler, *args, **kwargs):
         self.response = None
+        self.done_time = None
         self.function = function
         self.runnerhandler = runnerhandler
         self.args = args
         self.kwargs = kwargs.copy()
         self.timeout = None
         self._handle_timeout_kwarg()
-        self.thread = None
-        self.response_id = id(self)
+        self._done = threading.Event()
+        self.response_id = runnerhandler.responses.new_id()
 
     def _handle_timeout_kwarg(self):
         try:
@@ -114,23 +489,32 @@ class _Response(object):
     def set_response(self, response):
         self.response = response
 
+    @property
+    def done(self):
+        return self._done.is_set()
+
     def run(self):
-        with self.runnerhandler.contextmgr(self):
-            self.set_response(
-                self.function(self.runnerhandler, *self.args, **self.kwargs))
+        try:
+            with self.runnerhandler.contextmgr(self):
+                self.set_response(
+                    self.function(self.runnerhandler, *self.args, **self.kwargs))
+        finally:
+            self.done_time = time.time()
+            self._done.set()
+            self.runnerhandler.responses.set_done(self.response_id)
+            self.runnerhandler.notify_done()
 
-    def run_in_thread(self):
-        self.thread = threading.Thread(target=self.run)
-        self.thread.start()
+    def run_in_worker(self):
+        self.runnerhandler.workers.submit(self.run)
         return self.get_response_with_timeout(self.timeout)
 
     def get_response_with_timeout(self, timeout):
         if timeout is None or timeout >= 0:
-            self.thread.join(timeout)
-        return self._get_response_from_thread(timeout)
+            self._done.wait(timeout)
+        return self._get_response_from_worker(timeout)
 
-    def _get_response_from_thread(self, timeout):
-        if (timeout is not None and timeout < 0) or self.thread.is_alive():
+    def _get_response_from_worker(self, timeout):
+        if (timeout is not None and timeout < 0) or not self._done.is_set():
             return self._store_and_return_response()
         self.runnerhandler.remove_response(self.response_id)
         return self._serialize(*self.response)
@@ -140,17 +524,17 @@ class _Response(object):
         return self._serialize(b'timeout', self.response_id)
 
     def _serialize(self, steeringstring, obj):
-        return self.runnerhandler.pickler.dumps(
-            (steeringstring, self.runnerhandler.pickler.dumps(obj, protocol=0)),
-            protocol=0)
+        return self.runnerhandler.serialize_response(steeringstring, obj)
 
 
 def responsethread(function, *args, **kwargs):
     # pylint: disable=unused-argument
     @wraps(function)
     def inner_function(runnerhandler, *args, **kwargs):
+        runnerhandler.collect_garbage(kwargs.pop('garbage', ()),
+                                      kwargs['locals_'])
         return _Response(
-            function, runnerhandler, *args, **kwargs).run_in_thread()
+            function, runnerhandler, *args, **kwargs).run_in_worker()
 
     return inner_function
 
@@ -160,15 +544,31 @@ class _RunnerHandler(object):
     def __init__(self):
         self.contextmgr = None
         self.pickler = None
+        self.protocol = 0
         self._handled_types = None
-        self._responses = dict()
+        self.responses = _ResponseStore()
+        self._local = threading.local()
+        self.codecache = _CodeCache()
+        self.workers = _WorkerPool()
+        self._done_condition = threading.Condition()
+        self.stdoutcapture = _StdoutCapture()
+
+    @property
+    def params(self):
+        """Parameters of the request executed in the current thread. The
+        requests refer to the parameters instead of embedding the values so
+        that the compiled code can be reused.
+        """
+        return self._local.params
 
     def initialize(self,
                    contextmgr=None,
                    pickler=pickle,
+                   protocol=0,
                    handled_types=None):
         self.contextmgr = contextmgr or self.pickle_errors
         self.pickler = pickler
+        self.protocol = protocol
         self._handled_types = (self._default_handled_types
                                if handled_types is None else
                                handled_types)
@@ -181,17 +581,35 @@ class _RunnerHandler(object):
                  [long, unicode])  # pylint: disable=undefined-variable; # noqa: F821
         return common + pydep
 
+    def serialize_response(self, steeringstring, obj):
+        return self.pickler.dumps(
+            (steeringstring, self.pickler.dumps(obj, protocol=self.protocol)),
+            protocol=self.protocol)
+
+    def notify_done(self):
+        with self._done_condition:
+            self._done_condition.notify_all()
+
     def add_response(self, response_id, response):
-        self._responses[response_id] = response
+        self.responses.add(response_id, response)
 
     def _get_response(self, response_id):
-        return self._responses[response_id]
+        return self.responses.get(response_id)
 
     def remove_response(self, response_id):
-        try:
-            del self._responses[response_id]
-        except KeyError:
-            pass
+        self.responses.remove(response_id)
+
+    def get_response_store_stats(self):
+        """Return dictionary of the size, the limits and the eviction
+        counters of the response store.
+        """
+        return self.responses.get_stats()
+
+    def set_response_store_limits(self, max_age, max_size):
+        self.responses.set_limits(max_age=max_age, max_size=max_size)
+
+    def _serialize_expired(self, response_id):
+        return self.serialize_response(b'expired', response_id)
 
     @classmethod
     def deserialize(cls, content, unpickler=pickle.Unpickler):
@@ -224,11 +642,13 @@ class _RunnerHandler(object):
             response.set_response((b'exception', e))
 
     @responsethread
-    def run(self, code, locals_):
+    def run(self, code, locals_, params=()):
+        self._local.params = params
         return (b'run', self._get_object(code, locals_))
 
     @responsethread
-    def assign_and_run(self, handle, code, locals_):
+    def assign_and_run(self, handle, code, locals_, params=()):
+        self._local.params = params
         self._get_object('{handle} = {code}'.format(
             handle=handle, code=code), locals_)
         return self._get_handled(handle, locals_)
@@ -237,9 +657,195 @@ class _RunnerHandler(object):
     def run_and_return_handled(self, code, locals_):
         return self._get_handled(code, locals_)
 
-    def get_response(self, response_id, timeout):
-        return self._get_response(
-            response_id).get_response_with_timeout(timeout)
+    @responsethread
+    def run_batch(self, calls, locals_):
+        return (b'batch', [self._run_batch_call(call, locals_) for call in calls])
+
+    def _run_batch_call(self, call, locals_):
+        handle, code, params = call
+        self._local.params = params
+        try:
+            if handle is None:
+                steeringstring, obj = b'run', self._get_object(code, locals_)
+            else:
+                self._get_object('{handle} = {code}'.format(
+                    handle=handle, code=code), locals_)
+                steeringstring, obj = self._get_handled(handle, locals_)
+            return (steeringstring, self.pickler.dumps(obj, protocol=self.protocol))
+        except Exception as e:  # pylint: disable=broad-except
+            e.trace = self._extract_tb()
+            return (b'exception', self.pickler.dumps(e, protocol=self.protocol))
+
+    def get_response(self, response_id, timeout, locals_=None, garbage=()):
+        self.collect_garbage(garbage, locals_)
+        try:
+            response = self._get_response(response_id)
+        except _ResponseExpired:
+            return self._serialize_expired(response_id)
+        return response.get_response_with_timeout(timeout)
+
+    def get_responses(self, response_ids, timeout, wait_all=False,
+                      locals_=None, garbage=()):
+        """Wait until any or, if *wait_all* is *True*, all of the responses
+        *response_ids* are completed or until *timeout* expires. Return
+        serialized list of the response ids and the serialized responses of
+        the completed responses.
+        """
+        self.collect_garbage(garbage, locals_)
+        responses = []
+        expired = []
+        for response_id in response_ids:
+            try:
+                responses.append(self._get_response(response_id))
+            except _ResponseExpired:
+                expired.append((response_id, self._serialize_expired(response_id)))
+        if wait_all or not expired:
+            self._wait_responses(responses, timeout, all if wait_all else any)
+        return self.serialize_response(
+            b'responses',
+            expired + [(r.response_id, r.get_response_with_timeout(0))
+                       for r in responses if r.done])
+
+    def _wait_responses(self, responses, timeout, condition):
+        deadline = None if timeout is None else time.time() + timeout
+        with self._done_condition:
+            while responses and not condition(r.done for r in responses):
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return
+                self._done_condition.wait(remaining)
+
+    @classmethod
+    def get_type_spec(cls, obj, name):
+        """Return tuple of the type key of *obj* and dictionary mapping
+        the public attribute names of *obj* and attribute *name* to their
+        callability. Missing attributes are not included.
+
+        The attributes are looked up statically without triggering
+        properties or other descriptors except the attribute *name* if it
+        is available only dynamically, e.g. via *__getattr__*. In *Python 2*
+        the attributes are looked up dynamically.
+        """
+        spec = {}
+        for attr in dir(obj):
+            if not attr.startswith('_') or attr == name:
+                cls._set_static_callability(spec, obj, attr)
+        if name not in spec:
+            cls._set_callability(spec, obj, name)
+        return cls._get_type_key(obj), spec
+
+    @staticmethod
+    def _set_static_callability(spec, obj, attr):
+        try:
+            value = getattr_static(obj, attr)
+            if isinstance(value, (staticmethod, classmethod)):
+                value = value.__func__
+            elif isinstance(value, SAFE_DESCRIPTOR_TYPES):
+                value = getattr(obj, attr)
+            spec[attr] = callable(value)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    @staticmethod
+    def _set_callability(spec, obj, attr):
+        try:
+            spec[attr] = callable(getattr(obj, attr))
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    @staticmethod
+    def _get_type_key(obj):
+        objtype = type(obj)
+        key = '{0}.{1}'.format(objtype.__module__,
+                               getattr(objtype, '__qualname__', objtype.__name__))
+        if isinstance(obj, (type, types.ModuleType)):
+            key += ':{0}.{1}'.format(getattr(obj, '__module__', ''), obj.__name__)
+        return key
+
+    @staticmethod
+    def define_procedure(name, source):
+        """Execute *source* in a namespace of its own and return the
+        function *name* defined by it.
+        """
+        # pylint: disable=exec-used
+        namespace = {'__name__': '<procedure {0}>'.format(name)}
+        exec(compile(source, namespace['__name__'], 'exec'), namespace)
+        return namespace[name]
+
+    def execute_python(self, code):
+        """Evaluate expression *code* or, if *code* is not an expression,
+        execute the statements in a namespace of their own. Return tuple of
+        the value of the expression or *None*, the captured *stdout* and the
+        formatted exception or *None*.
+        """
+        return self._call_with_captured_stdout(self._exec_or_eval, code)
+
+    def call_python_function(self, name, args, kwargs):
+        """Call function of dotted *name* with *args* and *kwargs*. The
+        longest importable prefix of *name* is imported. The return value is
+        as in :meth:`.execute_python`.
+        """
+        return self._call_with_captured_stdout(
+            lambda: self.import_object(name)(*args, **kwargs))
+
+    def _call_with_captured_stdout(self, function, *args):
+        value = exception = None
+        with self.stdoutcapture.capture() as buf:
+            try:
+                value = function(*args)
+            except Exception:  # pylint: disable=broad-except
+                exception = ''.join(traceback.format_exception_only(
+                    *sys.exc_info()[:2])).rstrip('\n')
+        return value, buf.getvalue(), exception
+
+    @staticmethod
+    def _exec_or_eval(code):
+        # pylint: disable=exec-used
+        namespace = {'__name__': '__main__'}
+        try:
+            code_obj = compile(code, '<python>', 'eval')
+        except SyntaxError:
+            exec(compile(code, '<python>', 'exec'), namespace)
+            return None
+        return eval(code_obj, namespace)
+
+    @staticmethod
+    def import_object(name):
+        """Return object of dotted *name* after importing the longest
+        importable module prefix of *name*.
+        """
+        parts = name.split('.')
+        for i in range(len(parts), 0, -1):
+            try:
+                obj = __import__('.'.join(parts[:i]))
+            except ImportError:
+                continue
+            for part in parts[1:]:
+                obj = getattr(obj, part)
+            return obj
+        raise ImportError('No module named {0}'.format(parts[0]))
+
+    @staticmethod
+    def create_chunked_iterator(iterable, max_items, max_bytes, read_ahead):
+        return _ChunkedIterator(iterable, max_items, max_bytes, read_ahead)
+
+    @staticmethod
+    def collect_garbage(garbage, locals_):
+        """Delete the proxy handles *garbage* piggy-backed to the request.
+        If the deletion fails, the handles are deleted one by one ignoring
+        the missing handles.
+        """
+        # pylint: disable=exec-used
+        if not garbage:
+            return
+        try:
+            exec('del {}'.format(', '.join(garbage)), locals_)
+        except Exception:  # pylint: disable=broad-except
+            for handle in garbage:
+                try:
+                    exec('del {}'.format(handle), locals_)
+                except Exception:  # pylint: disable=broad-except
+                    pass
 
     def _get_handled(self, code, locals_):
         obj = self._get_object(code, locals_)
@@ -256,13 +862,8 @@ class _RunnerHandler(object):
                 return True
         return False
 
-    @staticmethod
-    def _get_object(code, locals_):
-        try:
-            code_obj = compile(code, '', 'eval')
-        except SyntaxError:
-            code_obj = compile(code, '', 'single')
-        return eval(code_obj, locals_)
+    def _get_object(self, code, locals_):
+        return eval(self.codecache.get_code_object(code), locals_)
 
 
 _RUNNERHANDLER = _RunnerHandler()
@@ -0,0 +1,63 @@
+import math
+from monotonic import monotonic
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+class _AdaptiveSizing(object):
+    """Adaptive sizing of the pools of :class:`._terminalpools._TerminalPools`.
+
+    The warm size of the pool is the peak demand of the pool during the
+    last *window* seconds multiplied by *headroom* and rounded up, but at
+    most the maximum size of the pool. Free unshared items exceeding the warm
+    size are removed so that the idle targets release their terminals while
+    the busy targets keep some spare terminals for rising demand. Pools
+    smaller than the warm size can be pre-warmed up to the warm size, e.g.
+    after the terminals have been closed by the target reboot.
+
+    Args:
+        window: length of the demand observation window in seconds.
+        headroom: multiplier of the peak demand for the warm size.
+    """
+
+    def __init__(self, window, headroom):
+        self.window = float(window)
+        self.headroom = float(headroom)
+        self._trim_interval = self.window / 10
+        self._next_trim = monotonic() + self._trim_interval
+
+    def get_warm_size(self, pool):
+        peak = pool.get_peak_demand(self.window)
+        return min(pool.maxsize, int(math.ceil(peak * self.headroom)))
+
+    def trim(self, pool):
+        """Remove free items exceeding the warm size of *pool*.
+
+        Return:
+            Number of removed items.
+        """
+        excess = pool.size - self.get_warm_size(pool)
+        return pool.remove_n_free(excess) if excess > 0 else 0
+
+    def get_prewarm_count(self, pool):
+        """Return the number of items missing from *pool* compared to the
+        warm size of *pool*.
+        """
+        return max(0, self.get_warm_size(pool) - pool.size)
+
+    def trim_all(self, pools):
+        """Trim each pool in *pools*.
+
+        Return:
+            Number of removed items.
+        """
+        self._next_trim = monotonic() + self._trim_interval
+        return sum(self.trim(pool) for pool in pools)
+
+    def trim_all_if_due(self, pools):
+        """Trim each pool in *pools* if a tenth of the window has elapsed
+        since the previous trimming of all pools.
+        """
+        if monotonic() >= self._next_trim:
+            self.trim_all(pools)
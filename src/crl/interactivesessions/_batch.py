@@ -0,0 +1,98 @@
+from collections import namedtuple
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+_BatchCall = namedtuple('_BatchCall', ['handle', 'code', 'params'])
+
+
+class _BatchFuture(object):
+    """Future of a call queued to :class:`._Batch`. The value of the future
+    is available after the batch is sent.
+    """
+
+    def __init__(self, call):
+        self.call = call
+        self._done = False
+        self._result = None
+        self._exception = None
+        self._response_wraps = []
+
+    def add_response_wrap(self, response_wrap):
+        """Add *response_wrap* to be applied to the response of the call.
+        The wraps are applied in the order of addition.
+
+        Return:
+            This future.
+        """
+        self._response_wraps.append(response_wrap)
+        return self
+
+    def set_response(self, response):
+        try:
+            for response_wrap in self._response_wraps:
+                response = response_wrap(response)
+        except Exception as e:  # pylint: disable=broad-except
+            self.set_exception(e)
+            return
+        self._result = response
+        self._done = True
+
+    def set_exception(self, exception):
+        self._exception = exception
+        self._done = True
+
+    def done(self):
+        return self._done
+
+    def exception(self):
+        """Return the exception raised by the call or *None*."""
+        self._raise_if_not_done()
+        return self._exception
+
+    def result(self):
+        """Return the value of the call or raise the exception raised by the
+        call.
+        """
+        self._raise_if_not_done()
+        if self._exception is not None:
+            raise self._exception  # pylint: disable=raising-bad-type
+        return self._result
+
+    def _raise_if_not_done(self):
+        if not self._done:
+            raise RuntimeError('Batch containing the call is not sent yet')
+
+
+class _Batch(object):
+    """Queue of the calls to be sent in a single request."""
+
+    def __init__(self):
+        self.futures = []
+
+    def add(self, python_call, handle=None):
+        """Queue :class:`.runnerterminal._PythonCall` *python_call*. If
+        *handle* is given, the value is assigned to *handle* in the remote
+        end.
+
+        Return:
+            :class:`._BatchFuture` of the call.
+        """
+        future = _BatchFuture(_BatchCall(handle=handle,
+                                         code=python_call.code,
+                                         params=tuple(python_call.params)))
+        self.futures.append(future)
+        return future
+
+    @property
+    def calls(self):
+        return [future.call for future in self.futures]
+
+    def set_exception(self, exception):
+        for future in self.futures:
+            if not future.done():
+                future.set_exception(exception)
+
+    def __len__(self):
+        return len(self.futures)
@@ -1,6 +1,8 @@
 import logging
 import itertools
-from collections import Counter
+from ._poolstatistics import (
+    _PoolStatistics,
+    _PeakDemand)
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -8,21 +10,15 @@ __copyright__ = 'Copyright (C) 2019, Nokia'
 LOGGER = logging.getLogger(__name__)
 
 
-class SharedCounter(object):
-    def __init__(self):
-        self._shared = Counter()
-
-    def incr(self, item):
-        self._shared[id(item)] += 1
-
-    def decr(self, item):
-        self._shared[id(item)] -= 1
-
-    def get_count(self, item):
-        return self._shared[id(item)]
+class _PoolItemState(object):
+    """Compact pool state of the single item. The *shared* is the shared
+    counter of the item and *inuse* tells whether the item is in use.
+    """
+    __slots__ = ('shared', 'inuse')
 
-    def clear(self, item):
-        self._shared[id(item)] = 0
+    def __init__(self):
+        self.shared = 0
+        self.inuse = True
 
 
 class _Pool(object):
@@ -39,19 +35,29 @@ class _Pool(object):
     Args:
         factory: callable for creating a new pool item.
         exception: Exception to be raised in case Pool operation failure.
+        resized: callable which is called with the change of the pool size
+            whenever items are created or removed.
 
     Attributes:
         free: set of free items
         inuse: set of items in use
+        statistics: :class:`._poolstatistics._PoolStatistics` of the pool
+        demand: :class:`._poolstatistics._PeakDemand` of the number of
+            items in use or shared
     """
 
-    def __init__(self, factory, exception=Exception):
+    def __init__(self, factory, exception=Exception, resized=lambda delta: None):
         self.factory = factory
         self._maxsize = 0
         self.exception = exception
+        self._resized = resized
         self.inuse = set()
         self.free = set()
-        self._sharedcounter = SharedCounter()
+        self._unshared_free = set()
+        self._states = {}
+        self._shared_size = 0
+        self.statistics = _PoolStatistics()
+        self.demand = _PeakDemand()
 
     def get(self):
         """Get free item from the pool. If there is no free items, create a new
@@ -59,8 +65,18 @@ class _Pool(object):
         """
         item = self._get_item()
         self.inuse.add(item)
+        self.demand.add(self._get_current_demand())
         return item
 
+    def _get_current_demand(self):
+        return self.size - len(self._unshared_free)
+
+    def get_peak_demand(self, window):
+        """Return peak number of items in use or shared during the last
+        *window* seconds.
+        """
+        return max(self.demand.get_peak(window), self._get_current_demand())
+
     def set_maxsize(self, maxsize):
         """Set maximum size of the pool.
 
@@ -80,11 +96,7 @@ class _Pool(object):
         self._maxsize = maxsize
 
     def _get_shared_free_size(self):
-        shared_free_size = 0
-        for i in self.free:
-            if self._sharedcounter.get_count(i):
-                shared_free_size += 1
-        return shared_free_size
+        return len(self.free) - len(self._unshared_free)
 
     @property
     def maxsize(self):
@@ -101,40 +113,116 @@ class _Pool(object):
         """Set of items in the pool"""
         return self.inuse.copy().union(self.free)
 
+    @property
+    def shared_size(self):
+        """Number of shared items in the pool."""
+        return self._shared_size
+
+    def get_statistics(self):
+        """Return dictionary of the pool sizes combined with
+        :meth:`._poolstatistics._PoolStatistics.as_dict`.
+        """
+        statistics = self.statistics.as_dict()
+        statistics.update({'size': self.size,
+                           'maxsize': self.maxsize,
+                           'free': len(self.free),
+                           'inuse': len(self.inuse),
+                           'shared': self.shared_size})
+        return statistics
+
     def _get_item(self):
         try:
-            return self.free.pop()
+            item = self.free.pop()
         except KeyError:
-            if len(self.inuse) >= self.maxsize:
-                raise self.exception(
-                    'Cannot create a new item to the pool: '
-                    'the maximum size of the pool exceeded.')
-            return self.factory()
+            return self._create_item()
+        self._unshared_free.discard(item)
+        self._states[item].inuse = True
+        self.statistics.add_hit()
+        return item
+
+    def _create_item(self):
+        if len(self.inuse) >= self.maxsize:
+            raise self.exception(
+                'Cannot create a new item to the pool: '
+                'the maximum size of the pool exceeded.')
+        self.statistics.add_miss()
+        item = self.factory()
+        self._states[item] = _PoolItemState()
+        self._resized(1)
+        return item
+
+    def add_free(self, n):
+        """Create as many as possible but at most *n* new free unshared items
+        without exceeding the maximum size of the pool.
+
+        Args:
+            n(int): Number of items to be created.
+
+        Return:
+            List of the created items.
+        """
+        items = []
+        for _ in range(max(0, min(n, self.maxsize - self.size))):
+            item = self.factory()
+            state = _PoolItemState()
+            state.inuse = False
+            self._states[item] = state
+            self.free.add(item)
+            self._unshared_free.add(item)
+            self._resized(1)
+            items.append(item)
+        return items
 
     def put(self, item):
         """Put item to the pool as free."""
         self.inuse.remove(item)
         self.free.add(item)
+        state = self._states[item]
+        state.inuse = False
+        if not state.shared:
+            self._unshared_free.add(item)
 
     def put_incr_shared(self, item):
         """Put item back to the pool as shared i.e. increment shared counter.
         """
         self.put(item)
-        self._sharedcounter.incr(item)
+        self._add_shared(item, 1)
 
     def decr_shared(self, item):
         """Decrement shared counter of the item.
         """
-        self._sharedcounter.decr(item)
+        self._add_shared(item, -1)
+
+    def _add_shared(self, item, incr):
+        state = self._states.get(item)
+        if state is None:
+            return
+        was_shared = bool(state.shared)
+        state.shared += incr
+        if was_shared != bool(state.shared):
+            self._update_shared(item, state)
+
+    def _update_shared(self, item, state):
+        if state.shared:
+            self._shared_size += 1
+            self._unshared_free.discard(item)
+        else:
+            self._shared_size -= 1
+            if not state.inuse:
+                self._unshared_free.add(item)
 
     def close(self):
         """Close pool. Try to call *close* of each item.
         """
-        for i in self.items:
+        items = self.items
+        for i in items:
             self._try_to_close_item(i)
+        self._resized(-len(items))
         self.inuse = set()
         self.free = set()
-        self._sharedcounter = SharedCounter()
+        self._unshared_free = set()
+        self._states = {}
+        self._shared_size = 0
 
     @staticmethod
     def _try_to_close_item(item):
@@ -148,12 +236,14 @@ class _Pool(object):
         """Remove item and try to call item *close*.
         """
         self._try_to_close_item(item)
-        self._sharedcounter.clear(item)
-        for itemset in [self.inuse, self.free]:
-            try:
-                itemset.remove(item)
-            except KeyError:
-                pass
+        state = self._states.pop(item, None)
+        if state is not None:
+            self._resized(-1)
+            if state.shared:
+                self._shared_size -= 1
+        self.inuse.discard(item)
+        self.free.discard(item)
+        self._unshared_free.discard(item)
 
     def remove_every_nth_free(self, n):
         """Remove as many as possible but at most every *n*th unshared free
@@ -180,12 +270,9 @@ class _Pool(object):
         for (removed_count, item) in self._n_size_slice_of_enumerated_unshared_free(n):
             self.remove(item)
 
+        self.statistics.add_evictions(removed_count)
         return removed_count
 
     def _n_size_slice_of_enumerated_unshared_free(self, n):
-        return enumerate(itertools.islice(self._unshared_free(), max(0, n)), start=1)
-
-    def _unshared_free(self):
-        for i in self.free.copy():
-            if not self._sharedcounter.get_count(i):
-                yield i
+        return enumerate(
+            list(itertools.islice(self._unshared_free, max(0, n))), start=1)
@@ -0,0 +1,119 @@
+import math
+from collections import deque
+from monotonic import monotonic
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+class _LatencySamples(object):
+    """Bounded collection of latency samples in seconds. Only the latest
+    *maxlen* samples are kept for the percentile calculation.
+    """
+    percents = [50, 90, 99]
+
+    def __init__(self, maxlen=1000):
+        self._samples = deque(maxlen=maxlen)
+        self._count = 0
+
+    def add(self, latency):
+        self._samples.append(latency)
+        self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def get_percentiles(self):
+        """Return dictionary of nearest-rank percentiles *p50*, *p90*, *p99*
+        and the maximum *max* of the samples. The values are *None* if there
+        are no samples.
+        """
+        samples = sorted(self._samples)
+        percentiles = {'p{}'.format(p): self._get_percentile(samples, p)
+                       for p in self.percents}
+        percentiles['max'] = samples[-1] if samples else None
+        return percentiles
+
+    @staticmethod
+    def _get_percentile(samples, percent):
+        if not samples:
+            return None
+        rank = int(math.ceil(percent * len(samples) / 100.0)) - 1
+        return samples[max(0, rank)]
+
+
+class _PeakDemand(object):
+    """Sliding window maximum of the demand samples. Only the samples which
+    can still become the maximum of some window are stored so the memory
+    usage is bounded by the number of the distinct demand levels.
+    """
+
+    def __init__(self):
+        self._samples = deque()
+
+    def add(self, demand):
+        while self._samples and self._samples[-1][1] <= demand:
+            self._samples.pop()
+        self._samples.append((monotonic(), demand))
+
+    def get_peak(self, window):
+        """Return maximum of the demand samples added during the last
+        *window* seconds or 0 if there are no such samples.
+        """
+        oldest = monotonic() - window
+        while self._samples and self._samples[0][0] < oldest:
+            self._samples.popleft()
+        return self._samples[0][1] if self._samples else 0
+
+
+class _PoolStatistics(object):
+    """Counters and latencies of :class:`._pool._Pool` operations.
+
+    Attributes:
+        hits: number of items got from the free items
+        misses: number of items created because there was no free items
+        creations: number of item creations reported via
+            :meth:`.add_creation` including recoveries
+        evictions: number of free items removed due to the pool size
+            limitations
+        recoveries: number of item re-creations reported via
+            :meth:`.add_creation`
+        creation_latencies: :class:`._LatencySamples` of creations
+        checkout_waits: :class:`._LatencySamples` of checkouts
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.creations = 0
+        self.evictions = 0
+        self.recoveries = 0
+        self.creation_latencies = _LatencySamples()
+        self.checkout_waits = _LatencySamples()
+
+    def add_hit(self):
+        self.hits += 1
+
+    def add_miss(self):
+        self.misses += 1
+
+    def add_evictions(self, evictions):
+        self.evictions += evictions
+
+    def add_creation(self, latency, is_recovery=False):
+        self.creations += 1
+        if is_recovery:
+            self.recoveries += 1
+        self.creation_latencies.add(latency)
+
+    def add_checkout_wait(self, wait):
+        self.checkout_waits.add(wait)
+
+    def as_dict(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'creations': self.creations,
+                'evictions': self.evictions,
+                'recoveries': self.recoveries,
+                'creation_latency': self.creation_latencies.get_percentiles(),
+                'checkout_wait': self.checkout_waits.get_percentiles()}
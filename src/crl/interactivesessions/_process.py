@@ -26,6 +26,21 @@ class RunResult(namedtuple('RunResult', ['status', 'stdout', 'stderr'])):
                     stderr=unic_to_string(py23_unic(self.stderr)))
 
 
+class PythonResult(namedtuple('PythonResult',
+                              ['status', 'value', 'stdout', 'exception'])):
+    """Result of the *Python* execution in the remote interpreter. The
+    *status* is *'0'* on success and *'1'* if *exception* was raised.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def create(cls, value, stdout, exception):
+        return cls(status='0' if exception is None else '1',
+                   value=value,
+                   stdout=to_string(stdout).rstrip('\r\n'),
+                   exception=exception)
+
+
 def rstrip_runresult(result):
     return RunResult(status=str(result.status),
                      stdout=to_string(result.stdout).rstrip('\r\n'),
@@ -55,12 +70,14 @@ class _ProcessBase(object):
                  executable,
                  shelldicts,
                  properties,
-                 timeout=None):
+                 timeout=None,
+                 poolhandle=None):
         self.cmd = cmd
         self.executable = executable
         self.shelldicts = shelldicts
         self.properties = properties
         self.timeout = timeout
+        self.poolhandle = poolhandle
         self.terminalpools = _TerminalPools()
         self.terminal = None
         self.proxies = None
@@ -112,15 +129,21 @@ class _ProcessBase(object):
                          self.cmd, e.__class__.__name__, e)
 
     def _initialize_terminal(self):
-        self.terminal = self.terminalpools.get(self.shelldicts,
-                                               self.properties,
-                                               zone=self.zone)
+        self.terminal = self._get_terminal()
         self.proxies = self.terminal.proxies
         self.termination_timeout = (
             self.terminal.properties.termination_timeout)
         self.env = self.proxies.environ.as_local_value()
         self.env.update(self.terminal.properties.update_env_dict)
 
+    def _get_terminal(self):
+        if self.poolhandle is None:
+            return self.terminalpools.get(self.shelldicts,
+                                          self.properties,
+                                          zone=self.zone)
+        return self.terminalpools.get_with_handle(self.poolhandle,
+                                                  self.properties)
+
     def _finalize_terminal(self):
         self.terminal.set_terminal_cleanup(lambda: None)
         self.terminalpools.put(self.terminal)
@@ -202,7 +225,7 @@ class _AsyncProcessWithoutPty(_ForegroundProcessWithoutPty):
     def _get_lines_iterator_proxy(self, pro, timeout):
         lines_iterator = self.proxies.iter_until_empty(pro.stdout.readline)
         lines_iterator.set_remote_proxy_timeout(timeout)
-        return lines_iterator
+        return lines_iterator.as_chunked_iterator()
 
 
 class _BackgroundProcessBase(_ProcessBase):
@@ -1,5 +1,7 @@
 from contextlib import contextmanager
-from crl.interactivesessions._terminalpools import _TerminalPools
+from crl.interactivesessions._terminalpools import (
+    _TerminalPools,
+    _TerminalPoolHandle)
 from ._process import (
     _AsyncProcessWithoutPty,
     _ForegroundProcessWithoutPty,
@@ -17,11 +19,23 @@ class _RunnerInTarget(object):
         self.shelldicts = shelldicts
         self.properties = _TargetProperties()
         self.terminalpools = _TerminalPools()
+        self._poolhandles = {}
+
+    def get_poolhandle(self, zone=None):
+        """Return :class:`._terminalpools._TerminalPoolHandle` of the target
+        for *zone*. The handles are created only once per zone.
+        """
+        try:
+            return self._poolhandles[zone]
+        except KeyError:
+            handle = _TerminalPoolHandle(self.shelldicts, zone=zone)
+            self._poolhandles[zone] = handle
+            return handle
 
     @contextmanager
     def active_terminal(self):
-        with self.terminalpools.active_terminal(self.shelldicts,
-                                                self.properties) as terminal:
+        with self.terminalpools.active_terminal_with_handle(
+                self.get_poolhandle(), self.properties) as terminal:
             yield terminal
 
     def run(self, cmd, timeout, executable=None, progress_log=False):
@@ -34,21 +48,27 @@ class _RunnerInTarget(object):
             executable=self._get_executable(executable),
             shelldicts=self.shelldicts,
             properties=self.properties,
+            poolhandle=self.get_poolhandle(processcls.zone),
             timeout=timeout).run()
 
     def run_in_background(self, cmd, executable=None):
         return _BackgroundProcessWithoutPty(
-            **self._get_background_kwargs(cmd, executable)).run()
+            **self._get_background_kwargs(_BackgroundProcessWithoutPty,
+                                          cmd,
+                                          executable)).run()
 
     def run_in_nocomm_background(self, cmd, executable=None):
         return _NoCommBackgroudProcess(
-            **self._get_background_kwargs(cmd, executable)).run()
+            **self._get_background_kwargs(_NoCommBackgroudProcess,
+                                          cmd,
+                                          executable)).run()
 
-    def _get_background_kwargs(self, cmd, executable):
+    def _get_background_kwargs(self, processcls, cmd, executable):
         return {'cmd': cmd,
                 'executable': self._get_executable(executable),
                 'shelldicts': self.shelldicts,
-                'properties': self.properties}
+                'properties': self.properties,
+                'poolhandle': self.get_poolhandle(processcls.zone)}
 
     def _get_executable(self, executable):
         return (self.properties.default_executable
@@ -56,8 +76,8 @@ class _RunnerInTarget(object):
                 executable)
 
     def get_terminal(self):
-        return self.terminalpools.get(shelldicts=self.shelldicts,
-                                      properties=self.properties)
+        return self.terminalpools.get_with_handle(self.get_poolhandle(),
+                                                  properties=self.properties)
 
     def put_terminal(self, terminal):
         return self.terminalpools.put(terminal)
@@ -0,0 +1,123 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+import six
+from monotonic import monotonic
+from crl.interactivesessions._metasingleton import MetaSingleton
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _TokenBucket(object):
+    """Token bucket with *rate* tokens per second and with the capacity of
+    *burst* tokens. The bucket is initially full.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Reserve a token and return the delay in seconds after which the
+        reserved token is available.
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class _NoSemaphore(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+@six.add_metaclass(MetaSingleton)
+class _SessionRateLimiter(object):
+    """Per host chain limiter of the new session creations. At most
+    *max_concurrent* sessions are created concurrently via the same chain of
+    hosts and
+    the creations are started with the rate of *rate* sessions per second
+    while bursts of at most *burst* sessions are allowed. The throttled
+    creations are delayed additionally by a random jitter of at most
+    *jitter* seconds in order to avoid the synchronized retries. If *rate* or
+    *max_concurrent* is *None*, the corresponding limit is not used. By
+    default, the creations are not limited. *ValueError* is raised if *rate*
+    is not positive or *burst* is less than one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._limiters = {}
+        self.rate = None
+        self.burst = None
+        self.max_concurrent = None
+        self.jitter = None
+        self.set_limits()
+
+    def set_limits(self, rate=None, burst=10, max_concurrent=None, jitter=0.2):
+        if rate is not None and rate <= 0:
+            raise ValueError('rate must be positive or None: {!r}'.format(rate))
+        if burst < 1:
+            raise ValueError('burst must be at least 1: {!r}'.format(burst))
+        with self._lock:
+            self.rate = rate
+            self.burst = burst
+            self.max_concurrent = max_concurrent
+            self.jitter = jitter
+            self._limiters = {}
+
+    @contextmanager
+    def limit(self, host):
+        """Context manager for creating a new session to *host*. The *host*
+        is the hashable identifier of the chain of hosts, e.g. a tuple of the
+        host names. If *host* is *None*, the creation is not limited.
+        """
+        if host is None:
+            yield None
+            return
+        bucket, semaphore = self._get_limiters(host)
+        with semaphore:
+            self._delay(host, bucket)
+            yield None
+
+    def _get_limiters(self, host):
+        with self._lock:
+            try:
+                return self._limiters[host]
+            except KeyError:
+                limiters = (self._create_bucket(), self._create_semaphore())
+                self._limiters[host] = limiters
+                return limiters
+
+    def _create_bucket(self):
+        return (None
+                if self.rate is None else
+                _TokenBucket(rate=self.rate, burst=self.burst))
+
+    def _create_semaphore(self):
+        return (_NoSemaphore()
+                if self.max_concurrent is None else
+                threading.Semaphore(self.max_concurrent))
+
+    def _delay(self, host, bucket):
+        delay = 0 if bucket is None else bucket.reserve()
+        if delay:
+            delay += random.uniform(0, self.jitter)
+            LOGGER.debug('Delaying session creation to %s by %.3f seconds',
+                         host, delay)
+            time.sleep(delay)
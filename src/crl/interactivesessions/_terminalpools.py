@@ -1,11 +1,13 @@
 import logging
 import random
-from copy import deepcopy
 from collections import OrderedDict
 from contextlib import contextmanager
 import six
+from monotonic import monotonic
 from crl.interactivesessions._metasingleton import MetaSingleton
 from crl.interactivesessions._pool import _Pool
+from crl.interactivesessions._adaptivesizing import _AdaptiveSizing
+from crl.interactivesessions._sessionratelimiter import _SessionRateLimiter
 from crl.interactivesessions._terminalpoolkey import _TerminalPoolKey
 from crl.interactivesessions.autorunnerterminal import AutoRunnerTerminal
 from crl.interactivesessions._remoterunnerproxies import (
@@ -26,13 +28,33 @@ class PoolNotFoundError(InteractiveSessionError):
     pass
 
 
+class _TerminalPoolHandle(object):
+    """Precomputed reference to the terminal pool of *shelldicts* in *zone*.
+
+    The pool key is computed only once and the resolved pool is cached in
+    the handle so that the repeated checkouts via
+    :meth:`._TerminalPools.get_with_handle` do not need to build the key nor
+    to look up the pool. The cached pool is resolved again only if some
+    pools have been removed after the resolution.
+    """
+
+    def __init__(self, shelldicts, zone=None):
+        self.shelldicts = shelldicts
+        self.key = _TerminalPoolKey(shelldicts + [{'zone': zone}])
+        self.pool = None
+        self.generation = None
+
+
 class _Terminal(object):
 
-    def __init__(self, key, shelldicts, properties, proxies_factory):
+    def __init__(self, key, shelldicts, properties, proxies_factory,
+                 statistics=None):
         self.key = key
         self.shelldicts = shelldicts
         self.properties = properties
         self._proxies_factory = proxies_factory
+        self._statistics = statistics
+        self._is_initialized = False
         self.terminal = None
         self.proxies = None
         self._initialize(shelldicts)
@@ -52,13 +74,29 @@ class _Terminal(object):
         self.terminal = AutoRunnerTerminal()
         self.proxies = self._proxies_factory(self.terminal)
         self.terminal.initialize_with_shelldicts(
-            shelldicts=deepcopy(shelldicts),
+            shelldicts=[shelldict.copy() for shelldict in shelldicts],
             prepare=self._prepare)
+        self.terminal.session.set_initialized(self._initialized)
+        self.terminal.session.set_spawn_context(self._spawn_context)
         self._initialize_terminal()
 
+    def _spawn_context(self):
+        return _SessionRateLimiter().limit(self._get_host_chain())
+
+    def _get_host_chain(self):
+        hosts = tuple(shelldict['host']
+                      for shelldict in self.shelldicts if 'host' in shelldict)
+        return hosts or None
+
     def _prepare(self):
         self.proxies.prepare()
 
+    def _initialized(self, elapsed):
+        if self._statistics is not None:
+            self._statistics.add_creation(elapsed,
+                                          is_recovery=self._is_initialized)
+        self._is_initialized = True
+
     def initialize_with_properties(self, properties):
         self.properties = properties
         self._initialize_terminal()
@@ -80,11 +118,24 @@ class _TerminalPools(object):
     def __init__(self):
         self._pools = OrderedDict()
         self._maxsize = 256
+        self._size = 0
+        self._generation = 0
+        self._adaptivesizing = None
         self._proxies_factory = _RemoteRunnerProxies
 
     def set_maxsize(self, maxsize):
         self._maxsize = maxsize
 
+    def set_adaptive_sizing(self, window, headroom=1.25):
+        """Enable adaptive sizing of the pools with demand observation
+        *window* in seconds and *headroom* multiplier of the peak demand.
+        See :class:`._adaptivesizing._AdaptiveSizing` for details. If *window*
+        is *None*, the adaptive sizing is disabled.
+        """
+        self._adaptivesizing = (None
+                                if window is None else
+                                _AdaptiveSizing(window=window, headroom=headroom))
+
     def set_proxies_factory(self, proxies_factory):
         self._proxies_factory = proxies_factory
 
@@ -94,41 +145,73 @@ class _TerminalPools(object):
 
     @property
     def size(self):
-        size = 0
-        for _, pool in self._pools.items():
-            size += pool.size
-        return size
+        return self._size
+
+    def _resized(self, delta):
+        self._size += delta
 
     def get(self, shelldicts, properties, zone=None):
-        pool = self._get_pool(_TerminalPoolKey(shelldicts + [{'zone': zone}]),
-                              shelldicts,
-                              properties)
+        return self.get_with_handle(_TerminalPoolHandle(shelldicts, zone=zone),
+                                    properties)
+
+    def get_with_handle(self, handle, properties):
+        """Get terminal from the pool referred by
+        :class:`._TerminalPoolHandle` *handle*.
+        """
+        start = monotonic()
+        pool = self._get_pool_with_handle(handle, properties)
         self._clean_if_needed(pool)
-        return self._get_terminal(pool, properties)
+        terminal = self._get_terminal(pool, properties)
+        pool.statistics.add_checkout_wait(monotonic() - start)
+        return terminal
+
+    def get_statistics(self):
+        """Return dictionary of :meth:`._pool._Pool.get_statistics` of each
+        pool. The dictionary keys are string representations of the pool
+        keys.
+        """
+        return {str(key): pool.get_statistics()
+                for key, pool in self._pools.items()}
 
     @contextmanager
     def active_terminal(self, shelldicts, properties):
-        terminal = self.get(shelldicts, properties)
+        with self.active_terminal_with_handle(_TerminalPoolHandle(shelldicts),
+                                              properties) as terminal:
+            yield terminal
+
+    @contextmanager
+    def active_terminal_with_handle(self, handle, properties):
+        terminal = self.get_with_handle(handle, properties)
         try:
             yield terminal
         finally:
             self.put(terminal)
 
+    def _get_pool_with_handle(self, handle, properties):
+        if handle.generation != self._generation:
+            handle.pool = self._get_pool(handle.key, handle.shelldicts, properties)
+            handle.generation = self._generation
+        pool = handle.pool
+        maxsize = int(properties.max_processes_in_target)
+        if maxsize != pool.maxsize:
+            pool.set_maxsize(maxsize)
+        return pool
+
     def _get_pool(self, key, shelldicts, properties):
 
         def _terminal_factory():
             return _Terminal(key,
                              shelldicts=shelldicts,
                              properties=properties,
-                             proxies_factory=self._proxies_factory)
+                             proxies_factory=self._proxies_factory,
+                             statistics=self._pools[key].statistics)
 
         if key not in self._pools:
             self._pools[key] = _Pool(
                 factory=_terminal_factory,
-                exception=TerminalPoolsBusy)
-        pool = self._pools[key]
-        pool.set_maxsize(properties.max_processes_in_target)
-        return pool
+                exception=TerminalPoolsBusy,
+                resized=self._resized)
+        return self._pools[key]
 
     def _get_pool_from_key(self, key):
         try:
@@ -141,9 +224,14 @@ class _TerminalPools(object):
             self._try_to_clean()
 
     def _try_to_clean(self):
-        if not self._clean_free():
+        if not (self._trim_adaptively() or self._clean_free()):
             self._clean_free_in_random_order_or_raise()
 
+    def _trim_adaptively(self):
+        return (0
+                if self._adaptivesizing is None else
+                self._adaptivesizing.trim_all(self._pools.values()))
+
     def _clean_free(self):
         removed = 0
         for _, pool in self._pools.items():
@@ -155,6 +243,7 @@ class _TerminalPools(object):
             if pool.remove_every_nth_free(1):
                 if not pool.size:
                     del self._pools[key]
+                    self._generation += 1
                 return
         raise TerminalPoolsBusy()
 
@@ -184,12 +273,46 @@ class _TerminalPools(object):
     def _decr_shared(pool, terminal):
         pool.decr_shared(terminal)
 
+    def prewarm(self):
+        """Open new free terminals to the pools having fewer terminals than
+        the adaptive warm size, i.e. the recent peak demand multiplied by
+        the headroom. Neither the maximum size of the pool nor
+        :attr:`maxsize` is exceeded. The terminals which fail to open are
+        removed. If the adaptive sizing is disabled, nothing is done.
+
+        Return:
+            Number of opened terminals.
+        """
+        if self._adaptivesizing is None:
+            return 0
+        opened = 0
+        for pool in list(self._pools.values()):
+            count = min(self._adaptivesizing.get_prewarm_count(pool),
+                        self.maxsize - self.size)
+            for terminal in pool.add_free(count):
+                opened += self._open_or_remove(pool, terminal)
+        return opened
+
+    @staticmethod
+    def _open_or_remove(pool, terminal):
+        try:
+            terminal.terminal.initialize_if_needed()
+            return 1
+        except Exception as e:  # pylint: disable=broad-except
+            LOGGER.debug('Failed to pre-warm terminal %s: %s (%s)',
+                         terminal.key, e.__class__.__name__, e)
+            pool.remove(terminal)
+            return 0
+
     def _put_op(self, op, terminal):
         pool = self._get_pool_from_key(terminal.key)
         if terminal.shall_be_stored():
             op(pool=pool, terminal=terminal)
         else:
             pool.remove(terminal)
+        if self._adaptivesizing is not None:
+            self._adaptivesizing.trim(pool)
+            self._adaptivesizing.trim_all_if_due(self._pools.values())
 
     def remove(self, terminal):
         if terminal.key in self._pools:
@@ -205,3 +328,4 @@ class _TerminalPools(object):
         for _, pool in self._pools.items():
             pool.close()
         self._pools = OrderedDict()
+        self._generation += 1
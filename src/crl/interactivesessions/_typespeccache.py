@@ -0,0 +1,43 @@
+import threading
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+class _TypeSpecCache(object):
+    """Client side cache of the attribute callability of the remote types.
+    The cache is keyed by the remote type key and the attribute name. The
+    specs are filled in bulk so that a single request stores the callability
+    of all public attributes of the type.
+    """
+
+    def __init__(self):
+        self._specs = {}
+        self._lock = threading.Lock()
+
+    def get(self, type_key, name):
+        """Return *True* if attribute *name* of *type_key* is callable.
+
+        Raises:
+            KeyError: if the attribute is not in the cache.
+        """
+        with self._lock:
+            return self._specs[type_key][name]
+
+    def update(self, type_key, spec):
+        """Store *spec* dictionary mapping attribute names of *type_key* to
+        callability.
+        """
+        with self._lock:
+            self._specs.setdefault(type_key, {}).update(spec)
+
+    def invalidate(self, type_key=None):
+        """Remove spec of *type_key* or all specs if *type_key* is *None*."""
+        with self._lock:
+            if type_key is None:
+                self._specs.clear()
+            else:
+                self._specs.pop(type_key, None)
+
+    def __len__(self):
+        return len(self._specs)
@@ -6,6 +6,7 @@ import logging
 import traceback
 import sys
 from contextlib import contextmanager
+from monotonic import monotonic
 from crl.interactivesessions.InteractiveSession import (
     InteractiveSession)
 from crl.interactivesessions.runnerexceptions import (
@@ -17,6 +18,11 @@ __copyright__ = 'Copyright (C) 2019, Nokia'
 LOGGER = logging.getLogger(__name__)
 
 
+@contextmanager
+def _no_spawn_context():
+    yield None
+
+
 class AutoRecoveringTerminal(object):
     """Automatically recovering terminal in case of listed exception occurs in
     :meth:`.run` or in :meth:`.initialize`.
@@ -44,6 +50,8 @@ class AutoRecoveringTerminal(object):
         self._finalize = None
         self._verify = None
         self._in_verify = False
+        self._initialized = lambda elapsed: None
+        self._spawn_context = _no_spawn_context
 
     def initialize(self,
                    shells,
@@ -137,16 +145,33 @@ class AutoRecoveringTerminal(object):
         """
         self._verify = verify
 
+    def set_initialized(self, initialized):
+        """Set callable *initialized* which is called with the duration of
+        the initialization in seconds after each successful
+        :meth:`.initialize_terminal`.
+        """
+        self._initialized = initialized
+
+    def set_spawn_context(self, spawn_context):
+        """Set context manager factory *spawn_context*. The connections of
+        the shells are opened inside the context returned by
+        *spawn_context* e.g. for limiting the rate of the new sessions.
+        """
+        self._spawn_context = spawn_context
+
     def initialize_terminal(self):
         """ Initialize terminal connections."""
+        start = monotonic()
         self._retry(self._initialize_terminal,
                     broken_exceptions=self._init_broken_exceptions)
+        self._initialized(monotonic() - start)
 
     def _initialize_terminal(self):
         self._init_session()
-        self._session.spawn(self._shells[0])
-        for shell in self._shells[1:]:
-            self._session.push(shell)
+        with self._spawn_context():
+            self._session.spawn(self._shells[0])
+            for shell in self._shells[1:]:
+                self._session.push(shell)
         self._prepare()
 
     def _retry(self, function, broken_exceptions):
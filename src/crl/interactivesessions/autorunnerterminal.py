@@ -1,6 +1,7 @@
 # pylint: disable=arguments-differ
 import logging
 from contextlib import contextmanager
+from monotonic import monotonic
 from crl.interactivesessions.autorecoveringterminal import (
     AutoRecoveringTerminal)
 from crl.interactivesessions.runnerterminal import (
@@ -19,14 +20,30 @@ class AutoRunnerTerminal(RunnerTerminal):
     """*Python* terminal session wrapper with the automated recovery feature
     for the session. This wrapper expects that the session is an instance of
     :class:`.autorecoveringterminal.AutoRecoveringTerminal`.
+
+    The session is verified before the proxy calls only if there has not
+    been a successful exchange with the remote end during the last
+    *verification_freshness* seconds. Inside the window, a broken session is
+    detected by the failure of the call itself. The session is then
+    recovered and the call is retried once in the recovered session.
     """
     default_verification_timeout = 10
+    default_verification_freshness = 1
 
     def __init__(self):
         super(AutoRunnerTerminal, self).__init__()
         self.prepare = None
         self.finalize = None
+        self.verification_freshness = self.default_verification_freshness
         self._verify_proxy = None
+        self._last_exchange = None
+
+    def set_verification_freshness(self, verification_freshness):
+        """Set the length of the window in seconds after a successful
+        exchange during which the session is not verified. If
+        *verification_freshness* is zero, the session is always verified.
+        """
+        self.verification_freshness = verification_freshness
 
     def initialize_with_shelldicts(self,
                                    shelldicts,
@@ -119,15 +136,54 @@ class AutoRunnerTerminal(RunnerTerminal):
     def _verify(self):
         if self._verify_proxy is None:
             raise RunnerTerminalSessionBroken()
+        if self._is_fresh():
+            return
 
         self._verify_proxy.as_local_value()
 
+    def _is_fresh(self):
+        if self._last_exchange is None:
+            return False
+        return monotonic() - self._last_exchange < self.verification_freshness
+
+    def run(self, cmd, timeout=-1, _rerun=False, blobs=()):
+        ret = super(AutoRunnerTerminal, self).run(cmd,
+                                                  timeout=timeout,
+                                                  _rerun=_rerun,
+                                                  blobs=blobs)
+        self._last_exchange = monotonic()
+        return ret
+
     def initialize_if_needed(self):
         """Initialize the terminal if necessary."""
         if self.session is None:
             raise RunnerTerminalSessionClosed()
         self.session.initialize_if_needed()
 
+    def call_initialized(self, function, *args, **kwargs):
+        """Initialize the terminal if needed and return the return value of
+        *function* called with *args* and *kwargs*. If the verification of
+        the session was skipped inside the freshness window and the call
+        raises :class:`.runnerexceptions.RunnerTerminalSessionBroken`, the
+        session is recovered and the call is retried once. Inside
+        :meth:`.runnerterminal.RunnerTerminal.batch` the call is only queued
+        and thus it is neither initialized nor retried.
+        """
+        if self.in_batch:
+            return function(*args, **kwargs)
+        unverified = self._is_fresh()
+        self.initialize_if_needed()
+        try:
+            return function(*args, **kwargs)
+        except RunnerTerminalSessionBroken as e:
+            if not unverified:
+                raise
+            LOGGER.debug('Retrying call in the recovered session: %s: %s',
+                         e.__class__.__name__, e)
+        self._last_exchange = None
+        self.initialize_if_needed()
+        return function(*args, **kwargs)
+
     @contextmanager
     def error_handling(self):
         if self.session is None:
@@ -146,3 +202,4 @@ class AutoRunnerTerminal(RunnerTerminal):
         finally:
             self._initialized_session = None
             self._session_id = None
+            self._last_exchange = None
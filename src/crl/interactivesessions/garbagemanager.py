@@ -2,8 +2,7 @@ __copyright__ = 'Copyright (C) 2019, Nokia'
 
 
 class GarbageManager(object):
-    def __init__(self, clean, max_garbage):
-        self._clean = clean
+    def __init__(self, max_garbage):
         self._max_garbage = max_garbage
         self._session_id = None
         self._garbage = []
@@ -15,10 +14,22 @@ class GarbageManager(object):
 
         self._garbage.append(garbage)
 
-    def clean_if_needed(self, session_id):
+    def pop_if_needed(self, session_id):
+        """Return and forget the garbage of the session *session_id* if the
+        amount of garbage exceeds *max_garbage*. Otherwise return empty list.
+        """
         if session_id == self._session_id and len(self._garbage) > self._max_garbage:
-            self._clean(self._garbage)
+            garbage = self._garbage
             self._garbage = []
+            return garbage
+        return []
+
+    def restore(self, session_id, garbage):
+        """Return the popped *garbage* of the session *session_id* to be
+        deleted later. The garbage of the other sessions is ignored.
+        """
+        if session_id == self._session_id:
+            self._garbage = list(garbage) + self._garbage
 
     def __len__(self):
         return len(self._garbage)
@@ -0,0 +1,231 @@
+import time
+import logging
+import threading
+from collections import namedtuple, OrderedDict
+from monotonic import monotonic
+from crl.interactivesessions.runnerexceptions import (
+    RemoteTimeout,
+    responsehandler)
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+LOGGER = logging.getLogger(__name__)
+
+FIRST_COMPLETED = 'FIRST_COMPLETED'
+ALL_COMPLETED = 'ALL_COMPLETED'
+
+
+DoneAndNotDoneFutures = namedtuple('DoneAndNotDoneFutures', ['done', 'not_done'])
+
+
+class RemoteFuture(object):
+    """Future of the remote proxy call executed in the asynchronous mode.
+    The future is created by the proxies set to the future mode by
+    :meth:`.remoteproxies._RemoteProxy.remote_proxy_use_future_response`.
+
+    **Args:**
+
+    *session*: :class:`.runnerterminal.RunnerTerminal` of the call.
+
+    *remotetimeout*: :class:`.runnerexceptions.RemoteTimeout` handle of
+    the pending response or *None* if the future is already completed.
+    """
+
+    def __init__(self, session, remotetimeout=None):
+        self.session = session
+        self.remotetimeout = remotetimeout
+        self._lock = threading.Lock()
+        self._done = False
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+
+    @classmethod
+    def create_with_result(cls, session, result):
+        future = cls(session)
+        future.set_result(result)
+        return future
+
+    @property
+    def response_id(self):
+        return None if self.remotetimeout is None else self.remotetimeout.response_id
+
+    @property
+    def completed(self):
+        """*True* if the response is already received. Unlike :meth:`.done`,
+        the remote end is not polled.
+        """
+        return self._done
+
+    def done(self):
+        """Return *True* if the call is completed. If the response is not
+        received yet, the remote end is polled without waiting.
+        """
+        if not self._done:
+            self._try_to_get_response(timeout=0)
+        return self._done
+
+    def result(self, timeout=None):
+        """Return the value of the call or raise the exception raised by the
+        call. Wait at most *timeout* seconds for the response. If *timeout* is
+        *None*, the default timeout of the terminal is used.
+        :class:`.runnerexceptions.RemoteTimeout` is raised if the response
+        is not received in time.
+        """
+        self._try_to_get_response(timeout)
+        if not self._done:
+            raise self.remotetimeout
+        if self._exception is not None:
+            raise self._exception  # pylint: disable=raising-bad-type
+        return self._result
+
+    def exception(self, timeout=None):
+        """Return the exception raised by the call or *None*. The *timeout* is
+        handled as in :meth:`.result`.
+        """
+        try:
+            self.result(timeout)
+        except RemoteTimeout as e:
+            if e is self.remotetimeout:
+                raise
+        except Exception:  # pylint: disable=broad-except
+            pass
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """Call *callback* with the future as an argument when the future is
+        completed. The callback is called immediately if the future is
+        already completed.
+        """
+        with self._lock:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+        self._call_callback(callback)
+
+    def set_result(self, result):
+        self._set_done(result=result, exception=None)
+
+    def set_exception(self, exception):
+        self._set_done(result=None, exception=exception)
+
+    def _try_to_get_response(self, timeout):
+        if self._done:
+            return
+        try:
+            result = self.session.get_response(self.remotetimeout, timeout)
+        except RemoteTimeout as e:
+            if e.response_id != self.response_id:
+                self.set_exception(e)
+        except Exception as e:  # pylint: disable=broad-except
+            self.set_exception(e)
+        else:
+            self.set_result(result)
+
+    def _set_done(self, result, exception):
+        with self._lock:
+            if self._done:
+                return
+            self._result = result
+            self._exception = exception
+            self._done = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._call_callback(callback)
+
+    def _call_callback(self, callback):
+        try:
+            callback(self)
+        except Exception as e:  # pylint: disable=broad-except
+            LOGGER.info('Callback of future raised %s: %s',
+                        e.__class__.__name__, e)
+
+
+class _FutureResponseHandler(object):
+    """Response handler of the proxies returning :class:`.RemoteFuture`
+    instances.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    def __call__(self, function, response_wrap=lambda x: x):
+        try:
+            return RemoteFuture.create_with_result(
+                self._session, responsehandler(function, response_wrap))
+        except RemoteTimeout as e:
+            return RemoteFuture(self._session, e)
+
+
+def wait(futures, timeout=None, return_when=ALL_COMPLETED, poll_interval=0.1):
+    """Wait until the :class:`.RemoteFuture` instances *futures* are
+    completed. The pending responses of each terminal are polled in a single
+    request. If all the pending futures are from the same terminal, the
+    waiting is done in the remote end. Otherwise the terminals are polled
+    with the interval of *poll_interval* seconds.
+
+    **Args:**
+
+    *timeout*: maximum time to wait in seconds or *None* for no limit.
+
+    *return_when*: *FIRST_COMPLETED* or *ALL_COMPLETED*.
+
+    **Returns:**
+
+    *DoneAndNotDoneFutures* named tuple of the sets *done* and *not_done*.
+    """
+    wait_all = return_when == ALL_COMPLETED
+    deadline = None if timeout is None else monotonic() + timeout
+    done, not_done = _split_done(futures)
+    while not_done and (wait_all or not done):
+        remaining = None if deadline is None else max(0, deadline - monotonic())
+        _poll(not_done, remaining, wait_all, poll_interval)
+        done, not_done = _split_done(futures)
+        if remaining == 0:
+            break
+    return DoneAndNotDoneFutures(done=done, not_done=not_done)
+
+
+def _split_done(futures):
+    done = set()
+    not_done = set()
+    for future in futures:
+        (done if future.completed else not_done).add(future)
+    return done, not_done
+
+
+def _poll(futures, remaining, wait_all, poll_interval):
+    sessions = _get_futures_by_session(futures)
+    if len(sessions) == 1:
+        session, session_futures = sessions.popitem()
+        _get_responses(session, session_futures, remaining, wait_all)
+        return
+    for session, session_futures in sessions.items():
+        _get_responses(session, session_futures, 0, wait_all)
+    if remaining != 0 and not any(f.completed for f in futures):
+        time.sleep(poll_interval
+                   if remaining is None else
+                   min(poll_interval, remaining))
+
+
+def _get_futures_by_session(futures):
+    sessions = OrderedDict()
+    for future in futures:
+        sessions.setdefault(future.session, []).append(future)
+    return sessions
+
+
+def _get_responses(session, futures, timeout, wait_all):
+    outcomes = session.get_responses([f.remotetimeout for f in futures],
+                                     timeout=timeout,
+                                     wait_all=wait_all)
+    for future in futures:
+        try:
+            outcome = outcomes[future.response_id]
+        except KeyError:
+            continue
+        if outcome.exception is None:
+            future.set_result(outcome.result)
+        else:
+            future.set_exception(outcome.exception)
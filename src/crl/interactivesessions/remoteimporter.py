@@ -35,8 +35,10 @@ class RemoteImporter(object):
         self.exec_in_module = self.terminal.create_empty_remote_proxy()
         self._moduleimporters = [ModuleImporter(self),
                                  ModuleImporter(LocalImporter())]
+        self._imported_files = {}
 
     def prepare(self):
+        self._imported_files = {}
         self._import_libraries()
         self._setup_proxies()
 
@@ -58,13 +60,24 @@ class RemoteImporter(object):
         return "runnerhandlerns['{}']".format(objname)
 
     def importfile(self, filepath):
-        modulename = os.path.splitext(os.path.basename(filepath))[0]
+        self._importcontent(filepath, self._get_filecontent(filepath))
+
+    def importfile_if_needed(self, filepath):
+        """Import *filepath* unless the same content of the file is already
+        imported in the current remote session.
+        """
         content = self._get_filecontent(filepath)
+        if self._imported_files.get(filepath) != content:
+            self._importcontent(filepath, content)
+
+    def _importcontent(self, filepath, content):
+        modulename = os.path.splitext(os.path.basename(filepath))[0]
         LOGGER.debug('content: %s', repr(content))
         for importer in self._moduleimporters:
             importer.importmodule(modulename, content)
 
         self.terminal.import_libraries(modulename)
+        self._imported_files[filepath] = content
 
     def importmodule(self, module):
         """
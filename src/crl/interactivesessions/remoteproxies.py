@@ -1,20 +1,36 @@
 import logging
+from collections import deque
 from functools import wraps
+import six
 from crl.interactivesessions.runnerexceptions import (
     responsehandler, asyncresponsehandler, InvalidProxySession)
+from crl.interactivesessions.remotefutures import _FutureResponseHandler
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
 
 LOGGER = logging.getLogger(__name__)
 
+_setattr = object.__setattr__
+
+_SPEC_CLASSES = {}
+
+
+def _create_spec_method(method_name):
+    def method(proxy, *args, **kwargs):
+        # pylint: disable=protected-access
+        return proxy._remote_proxy_run_python_call(
+            '.'.join([proxy._handle, method_name]), args, kwargs)
+
+    method.__name__ = str(method_name)
+    return method
+
 
 def autoinitialize(f):
 
     @wraps(f)
     def inner_function(proxy, *args, **kwargs):
-        proxy.remote_proxy_autoprepare()
-        return f(proxy, *args, **kwargs)
+        return proxy.remote_proxy_call_prepared(f, proxy, *args, **kwargs)
 
     return inner_function
 
@@ -52,7 +68,25 @@ class _RemoteProxy(object):
     *is_remote_owned*:  If *True*, then remote object is deleted as well when
     the proxy is removed from the *Python* interpreter.
 
+    The internal state of the proxy is kept in slots so that the proxies are
+    small and the internal attributes are accessed without
+    :meth:`__getattr__`. The methods of *local_spec* are defined in a
+    subclass shared by the proxies of the same spec.
     """
+    __slots__ = ('_session',
+                 '_handle',
+                 '_spec',
+                 '_remote_proxy_parent',
+                 '_is_remote_owned',
+                 '_remote_proxy_type_key',
+                 '_remote_proxy_instance_default_timeout',
+                 '_remote_proxy_session_id',
+                 '_remote_proxy_timeout',
+                 '_remote_proxy_response',
+                 '_remote_proxy_is_async',
+                 '_remote_proxy_methods',
+                 '__weakref__')
+    _REMOTE_PROXY_ATTRIBUTES = frozenset(__slots__)
 
     _SETATTR_TEMPLATE = "{handle}.{name} = RunnerHandler._deserialize({val!r})"
     _SETATTR_PROXY_TEMPLATE = "{handle}.{name} = {proxy}"
@@ -61,16 +95,18 @@ class _RemoteProxy(object):
     def __init__(self, session, remote_name, local_spec=None,
                  parent=None, is_remote_owned=True):
 
-        self.__dict__['_session'] = session
-        self.__dict__['_handle'] = remote_name
-        self.__dict__['_spec'] = None
-        self.__dict__['__parent'] = parent
-        self.__dict__['_is_remote_owned'] = is_remote_owned
-        self.__dict__['_remote_proxy_default_timeout'] = (
-            _RemoteProxy._remote_proxy_default_timeout)
-        self.__dict__['_remote_proxy_session_id'] = (
-            self._get_remote_proxy_session_id_from_remote_name(session,
-                                                               remote_name))
+        _setattr(self, '_session', session)
+        _setattr(self, '_handle', remote_name)
+        _setattr(self, '_spec', None)
+        _setattr(self, '_remote_proxy_parent', parent)
+        _setattr(self, '_is_remote_owned', is_remote_owned)
+        _setattr(self, '_remote_proxy_type_key', None)
+        _setattr(self, '_remote_proxy_methods', None)
+        _setattr(self, '_remote_proxy_instance_default_timeout',
+                 _RemoteProxy._remote_proxy_default_timeout)
+        _setattr(self, '_remote_proxy_session_id',
+                 self._get_remote_proxy_session_id_from_remote_name(session,
+                                                                    remote_name))
 
         if local_spec:
             self.set_proxy_spec(local_spec)
@@ -110,22 +146,31 @@ class _RemoteProxy(object):
         for n in ['_session',
                   '_handle',
                   '_spec',
-                  '__parent',
+                  '_remote_proxy_parent',
                   '_is_remote_owned',
                   '_remote_proxy_session_id',
-                  '_remote_proxy_response']:
+                  '_remote_proxy_type_key',
+                  '_remote_proxy_response',
+                  '_remote_proxy_is_async']:
             try:
                 self.set_remote_proxy_dict_name(n, proxy_dict[n])
             except KeyError:
                 pass
-        proxy.set_remote_proxy_dict_name('is_remote_owned', False)
+        proxy.set_remote_proxy_dict_name('_is_remote_owned', False)
         proxy.set_remote_proxy_dict_name('_handle', None)
 
     def get_remote_proxy_dict(self):
-        return self.__dict__
+        """Return dictionary of the internal attributes of the proxy."""
+        proxy_dict = {}
+        for name in self._REMOTE_PROXY_ATTRIBUTES:
+            try:
+                proxy_dict[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return proxy_dict
 
     def set_remote_proxy_dict_name(self, name, value):
-        self.__dict__[name] = value
+        _setattr(self, name, value)
 
     @autoinitialize
     def as_local_value(self):
@@ -134,11 +179,33 @@ class _RemoteProxy(object):
             self._handle,
             timeout=self._get_remote_proxy_timeout())
 
+    @autoinitialize
+    def as_chunked_iterator(self, max_items=100, max_bytes=65536, read_ahead=1000):
+        """Returns a local iterator over the items of the proxied iterable.
+        The items are read ahead in the remote end and fetched in chunks of
+        at most *max_items* items or about *max_bytes* bytes per request.
+        The request waits only for the first item of the chunk so the
+        iteration proceeds as soon as the items are available. The timeout
+        of this proxy is used for the requests. The items must be
+        serializable.
+        """
+        chunks = self._session.get_chunked_iterator(self,
+                                                    max_items=max_items,
+                                                    max_bytes=max_bytes,
+                                                    read_ahead=read_ahead)
+        chunks.set_remote_proxy_timeout(self._remote_proxy_timeout)
+        return _ChunkedIterator(chunks)
+
     @autoinitialize
     def as_recursive_proxy(self):
         """Returns a :class:`._RecursiveProxy` for the proxied object."""
         return _RecursiveProxy(self._session, self._handle, parent=self)
 
+    @autoinitialize
+    def as_lazy_proxy(self):
+        """Returns a :class:`._LazyProxy` for the proxied object."""
+        return _LazyProxy(self._session, self._handle, parent=self)
+
     @autoinitialize
     def get_proxy_handle(self):
         """Returns the remote name for the proxied object."""
@@ -149,6 +216,18 @@ class _RemoteProxy(object):
         self._session.initialize_if_needed()
         self.remote_proxy_verify()
 
+    def remote_proxy_call_prepared(self, function, *args, **kwargs):
+        """Return the return value of *function* called with *args* and
+        *kwargs* in the initialized and verified proxy session. See
+        :meth:`.runnerterminal.RunnerTerminal.call_initialized`.
+        """
+        return self._session.call_initialized(self.__verified_call,
+                                              function, args, kwargs)
+
+    def __verified_call(self, function, args, kwargs):
+        self.remote_proxy_verify()
+        return function(*args, **kwargs)
+
     def remote_proxy_verify(self):
         proxy_id_not_session = self._remote_proxy_session_id != self._session.session_id
         if (self._remote_proxy_session_id != 'uninitialized' and (
@@ -161,12 +240,27 @@ class _RemoteProxy(object):
 
     def set_proxy_spec(self, local_spec):
         """Assigns a spec for this proxy object."""
-        if self.__dict__['_spec']:
+        if self._spec:
             raise RuntimeError("")  # FIXME
 
-        self.__dict__['_spec'] = local_spec
+        _setattr(self, '_spec', local_spec)
+        _setattr(self, '__class__', self._get_spec_class(local_spec))
         for method in self.__get_methods(local_spec):
-            self.__add_remote_method(method)
+            if method.startswith('__'):
+                self.__add_remote_method(method)
+
+    @classmethod
+    def _get_spec_class(cls, local_spec):
+        key = (cls, local_spec)
+        try:
+            return _SPEC_CLASSES[key]
+        except KeyError:
+            methods = {name: _create_spec_method(name)
+                       for name in cls.__get_methods(local_spec)
+                       if not name.startswith('__')}
+            methods['__slots__'] = ()
+            _SPEC_CLASSES[key] = type(cls.__name__, (cls,), methods)
+            return _SPEC_CLASSES[key]
 
     @verify
     def get_remote_proxy_response(self, remotetimeout, timeout=None):
@@ -178,7 +272,7 @@ class _RemoteProxy(object):
         return self._session.get_response(remotetimeout, timeout)
 
     def _set_remote_proxy_timeout_from_parent(self):
-        parent = self.__dict__['__parent']
+        parent = self._remote_proxy_parent
         self.set_remote_proxy_timeout(
             self._get_remote_proxy_default_timeout()
             if parent is None else
@@ -197,17 +291,15 @@ class _RemoteProxy(object):
             to *timeout* in case *timeout* is positive. If *timeout* is
             negative then the terminal uses *prompt_timeout* only.
         """
-        self.__dict__['_remote_proxy_timeout'] = (
-            self._get_remote_proxy_default_timeout()
-            if timeout is None else timeout)
+        _setattr(self, '_remote_proxy_timeout',
+                 self._get_remote_proxy_default_timeout()
+                 if timeout is None else timeout)
 
     def _get_remote_proxy_default_timeout(self):
-        return self.__dict__['_remote_proxy_default_timeout']
+        return self._remote_proxy_instance_default_timeout
 
     def _get_remote_proxy_timeout(self):
-        return (-1
-                if self._remote_proxy_response is asyncresponsehandler else
-                self._remote_proxy_timeout)
+        return -1 if self._remote_proxy_is_async else self._remote_proxy_timeout
 
     def remote_proxy_use_synchronous_response(self):
         """Set proxy to use synchronous response and timeout"""
@@ -221,28 +313,53 @@ class _RemoteProxy(object):
         value of the proxy call. Please see a complete example of
         the asynchronous mode usage from :ref:`backgroundrunner`.
         """
-        self._set_remote_proxy_response(asyncresponsehandler)
+        self._set_remote_proxy_response(asyncresponsehandler, is_async=True)
 
-    def _set_remote_proxy_response(self, response):
-        self.__dict__['_remote_proxy_response'] = response
+    def remote_proxy_use_future_response(self):
+        """Set proxy to use asynchronous response without any timeout. In this
+        mode, the proxy calls return :class:`.remotefutures.RemoteFuture`
+        instances. Many futures can be waited with
+        :func:`.remotefutures.wait` which polls all pending responses of a
+        terminal in a single request.
+        """
+        self._set_remote_proxy_response(_FutureResponseHandler(self._session),
+                                        is_async=True)
+
+    def _set_remote_proxy_response(self, response, is_async=False):
+        _setattr(self, '_remote_proxy_response', response)
+        _setattr(self, '_remote_proxy_is_async', is_async)
 
-    @autoinitialize
     def __getattr__(self, name):
-        # we use __setattr__, so manually check __dict__
-        if name in self.__dict__:
-            return self.__dict__[name]
+        # internal attributes are slots so they end up here only if unset
+        if name in self._REMOTE_PROXY_ATTRIBUTES:
+            raise AttributeError(name)
+        methods = self._remote_proxy_methods
+        if methods and name in methods:
+            return methods[name]
+        return self._get_remote_proxy_attribute(name)
 
+    @autoinitialize
+    def _get_remote_proxy_attribute(self, name):
         handle = self.__attr_handle(name)
 
         # if spec is dynamic, add callables to spec
-        if not self._spec and self._session.iscallable(handle):
+        if not self._spec and self._get_remote_proxy_attribute_callability(name):
             self.__add_remote_method(name)
-            return self.__dict__[name]
+            return self._remote_proxy_methods[name]
 
         return self._session.run_python(
             handle,
             timeout=self._get_remote_proxy_timeout())
 
+    def _get_remote_proxy_attribute_callability(self, name, timeout=None):
+        type_key, iscallable = self._session.get_attribute_callability(
+            self._handle, self._remote_proxy_type_key, name, timeout=timeout)
+        _setattr(self, '_remote_proxy_type_key', type_key)
+        if iscallable is None:
+            raise AttributeError("'{0}' has no attribute '{1}'".format(
+                self._handle, name))
+        return iscallable
+
     @autoinitialize
     def __setattr__(self, name, val):
         self.__call_remote_method('setattr', args=(self, name, val),
@@ -278,7 +395,9 @@ class _RemoteProxy(object):
             kwargs={})
 
     def __add_remote_method(self, method_name):
-        self.__dict__[method_name] = self.__build_wrapper(method_name)
+        if self._remote_proxy_methods is None:
+            _setattr(self, '_remote_proxy_methods', {})
+        self._remote_proxy_methods[method_name] = self.__build_wrapper(method_name)
 
     def __call_remote_method(self, callable_, args, kwargs):
         return self._remote_proxy_run_python_call(callable_, args, kwargs)
@@ -306,6 +425,49 @@ class _RemoteProxy(object):
                 yield name
 
 
+class _ChunkedIteratorSpec(object):
+    """Spec of the remote chunked iterator."""
+    def get_chunk(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _ChunkedIterator(object):
+    """Local iterator over the chunks fetched by *chunks* proxy of the
+    remote chunked iterator. The remote read ahead is stopped by
+    :meth:`close` or, if the iteration is abandoned, when the remote
+    iterator is deleted in the garbage cleaning of the *chunks* proxy.
+    """
+
+    def __init__(self, chunks):
+        chunks.set_proxy_spec(_ChunkedIteratorSpec)
+        self._chunks = chunks
+        self._items = deque()
+        self._exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        while not self._items:
+            if self._exhausted:
+                raise StopIteration()
+            items, self._exhausted = self._chunks.get_chunk()
+            self._items.extend(items)
+        return self._items.popleft()
+
+    __next__ = next
+
+    def close(self):
+        """Stop reading ahead in the remote end and end the iteration."""
+        self._items.clear()
+        if not self._exhausted:
+            self._exhausted = True
+            self._chunks.close()
+
+
 class _RecursiveProxy(_RemoteProxy):
     """Wrapper exposing a remote object as a local one.
 
@@ -316,6 +478,8 @@ class _RecursiveProxy(_RemoteProxy):
     value always. The proxied object can be retrieved by calling
     :meth:`._RemoteProxy.as_local_value` on a remote proxy object.
     """
+    __slots__ = ()
+
     def __init__(self, session, remote_name,
                  parent=None, is_remote_owned=None):
         super(_RecursiveProxy, self).__init__(session,
@@ -336,10 +500,10 @@ class _RecursiveProxy(_RemoteProxy):
                 self._session.get_proxy_or_basic_from_call_with_timeout(
                     self._get_remote_proxy_timeout(),
                     handle, args=args, kwargs=kwargs)),
-            response_wrap=self.__get_recursive_proxy_from_response)
+            response_wrap=self._get_remote_proxy_from_response)
 
     @staticmethod
-    def __get_recursive_proxy_from_response(response):
+    def _get_remote_proxy_from_response(response):
         if isinstance(response, _RemoteProxy):
             response = response.as_recursive_proxy()
         return response
@@ -357,13 +521,13 @@ class _RecursiveProxy(_RemoteProxy):
             '.'.join([self._handle, '__str__']), args=(), kwargs={})
 
     @autoinitialize
-    def __getattr__(self, name):
-        if not self._session.run_python(
-                "hasattr({0}, {1!r})".format(self._handle, name),
-                timeout=self._get_remote_proxy_timeout()):
-            raise AttributeError("'{0}' has no attribute '{1}'".format(
-                self._handle, name))
+    def _get_remote_proxy_attribute(self, name):
+        iscallable = self._get_remote_proxy_attribute_callability(
+            name, timeout=self._get_remote_proxy_timeout())
         remotename = '.'.join([self._handle, name])
+        if iscallable and self._session.in_batch:
+            # the call of the method is queued so the method is not fetched
+            return _RecursiveProxy(self._session, remotename, parent=self)
         return self._remote_proxy_response(
             function=lambda: self._session.run_and_return_handled_python(
                 remotename),
@@ -381,3 +545,55 @@ class _RecursiveProxy(_RemoteProxy):
     def __call__(self, *args, **kwargs):
         return self.__get_recursive_proxy_or_basic_from_call(self._handle,
                                                              args, kwargs)
+
+
+class _LazyProxy(_RecursiveProxy):
+    """Recursive proxy building the remote expression locally.
+
+    The attribute access and the item access with integer or string keys
+    return new lazy proxies without any request to the remote end, not even
+    for the initialization or the verification of the session. The
+    expression is evaluated in a single request only when the value, the
+    side effect or the proxy of the value is needed, e.g. in calls and in
+    :meth:`._RemoteProxy.as_local_value`. For example,
+    *lazyos.path.join('a', 'b')* is evaluated in a single request without
+    intermediate handles. The proxies returned by the calls are lazy
+    proxies as well.
+
+    .. note::
+
+        Unlike in :class:`._RecursiveProxy`, the attributes of the
+        *HANDLED_TYPES* are not returned as local values but as lazy proxies
+        and the missing attributes are detected only when the expression is
+        evaluated.
+    """
+    __slots__ = ()
+    _LITERAL_KEY_TYPES = six.integer_types + six.string_types + (bytes,)
+
+    def _get_remote_proxy_attribute(self, name):
+        if name.startswith('__') and name.endswith('__'):
+            return super(_LazyProxy, self)._get_remote_proxy_attribute(name)
+        return self.__get_lazy_attr(name)
+
+    def __get_lazy_attr(self, name):
+        return _LazyProxy(self._session,
+                          '{handle}.{name}'.format(handle=self._handle, name=name),
+                          parent=self)
+
+    def __getitem__(self, key):
+        if self._session.isproxy(key):
+            index = key.get_proxy_handle()
+        elif isinstance(key, self._LITERAL_KEY_TYPES):
+            index = repr(key)
+        else:
+            return self.__get_lazy_attr('__getitem__')(key)
+        return _LazyProxy(self._session,
+                          '{handle}[{index}]'.format(handle=self._handle,
+                                                     index=index),
+                          parent=self)
+
+    @staticmethod
+    def _get_remote_proxy_from_response(response):
+        if isinstance(response, _RemoteProxy):
+            response = response.as_lazy_proxy()
+        return response
@@ -2,6 +2,7 @@ import os
 from contextlib import contextmanager
 import logging
 from ._terminalpools import _TerminalPools
+from ._sessionratelimiter import _SessionRateLimiter
 from .pythonterminal import PythonTerminal
 from ._targetproperties import _TargetProperties
 from ._runnerintarget import _RunnerInTarget
@@ -12,7 +13,7 @@ from ._filecopier import (
     _RemoteScriptRemoteFile,
     _DirRemoteFile,
     _LocalDirCopier)
-from ._process import RunResult, rstrip_runresult
+from ._process import RunResult, PythonResult, rstrip_runresult
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -166,6 +167,7 @@ class RemoteRunner(object):
         self.filecopier = _FileCopier()
         self.targets = dict()
         self.terminalpools = _TerminalPools()
+        self.sessionratelimiter = _SessionRateLimiter()
         self._backgrounds = dict()
         self._nohup_processes = None
 
@@ -340,6 +342,171 @@ class RemoteRunner(object):
         """
         self.terminalpools.set_maxsize(int(maxsize))
 
+    def set_terminalpools_adaptive_sizing(self, window=300, headroom=1.25):
+        """
+        Enable adaptive sizing of the terminal pools. In the adaptive mode
+        the peak number of the concurrently used terminals of each target
+        is followed over the sliding *window*. Free terminals exceeding the
+        peak multiplied by *headroom* are closed so that the idle targets
+        release their SSH connections while the busy targets keep spare
+        terminals for the rising demand. The target property
+        *max_processes_in_target* and \`Set Terminalpools Maxsize\` remain
+        the hard limits. When the pools are full, the terminals exceeding
+        the adaptive sizes are closed first.
+
+        **Arguments:**
+
+        *window*: Length of the demand observation window in seconds. If
+        *None*, the adaptive sizing is disabled.
+
+        *headroom*: Multiplier of the peak demand for the number of the
+        terminals kept in the pool of the target.
+
+        **Returns:**
+
+        Nothing
+
+        **Example:**
+
+        +-----------------------------------+-----+-----+
+        | Set Terminalpools Adaptive Sizing | 600 | 1.5 |
+        +-----------------------------------+-----+-----+
+        """
+        self.terminalpools.set_adaptive_sizing(
+            window=None if window is None else float(window),
+            headroom=float(headroom))
+
+    def prewarm_terminalpools(self):
+        """
+        Open new terminals to the terminal pools which have fewer
+        terminals than the recent peak demand multiplied by the headroom of
+        \`Set Terminalpools Adaptive Sizing\`. This is useful e.g. after
+        the target reboot so that the following executions do not wait for
+        the SSH connections. The target property *max_processes_in_target*
+        and \`Set Terminalpools Maxsize\` are not exceeded. If the adaptive
+        sizing is not enabled, nothing is done.
+
+        **Returns:**
+
+        Number of opened terminals.
+
+        **Example:**
+
+        +-----------------------+
+        | Prewarm Terminalpools |
+        +-----------------------+
+        """
+        return self.terminalpools.prewarm()
+
+    def set_session_rate_limits(self, rate=5, burst=10, max_concurrent=8,
+                                jitter=0.2):
+        """
+        Set limits for opening new sessions to the same host. By default,
+        the openings are not limited. When many
+        terminals are opened at once, e.g. in the beginning of the suite or
+        after the target reboot, SSH server may drop the connections (see
+        *MaxStartups* of *sshd_config*). The failed connections are retried
+        only after a sleep, so it is much faster to throttle the new
+        connections than to retry the dropped ones.
+
+        The rate is limited with a token bucket: at most *burst*
+        sessions are opened without delay and after that new sessions are
+        started with *rate* sessions per second. The delayed openings are
+        further delayed by random jitter in order to spread the openings.
+
+        The limits are applied separately to each chain of hosts in the
+        shell stack, i.e. the sessions to the same host via different
+        gateways are limited separately.
+
+        **Arguments:**
+
+        *rate*: Maximum average number of new sessions per second. If *None*,
+        the rate is not limited. Zero or negative rates are rejected; use
+        *None* to disable the rate limit.
+
+        *burst*: Number of new sessions which can be opened without delay.
+        Must be at least 1.
+
+        *max_concurrent*: Maximum number of sessions being opened
+        concurrently. If *None*, the concurrency is not limited.
+
+        *jitter*: Maximum random additional delay in seconds of the
+        throttled openings.
+
+        **Returns:**
+
+        Nothing
+
+        **Example:**
+
+        +-------------------------+----+----+---+-----+
+        | Set Session Rate Limits | 10 | 20 | 8 | 0.5 |
+        +-------------------------+----+----+---+-----+
+        """
+        self.sessionratelimiter.set_limits(
+            rate=None if rate is None else float(rate),
+            burst=int(burst),
+            max_concurrent=None if max_concurrent is None else int(max_concurrent),
+            jitter=float(jitter))
+
+    def get_terminal_pool_statistics(self):
+        """
+        Get statistics of the terminal pools. The statistics are useful
+        e.g. for finding out whether the slowness of the executions is caused
+        by the reconnections, by the exhaustion of the pool or by the commands
+        themselves. They also help to choose suitable values for
+        \`Set Terminalpools Maxsize\` and for the target property
+        *max_processes_in_target*.
+
+        **Returns:**
+
+        Dictionary of the pool statistics dictionaries. The keys are
+        the pool keys containing the target shell dictionaries and the
+        execution zone. The statistics dictionary contains:
+
+        +------------------+-------------------------------------------------+
+        | Key              | Description                                     |
+        +==================+=================================================+
+        | size             | Number of terminals in the pool.                |
+        +------------------+-------------------------------------------------+
+        | maxsize          | Maximum number of terminals in the pool.        |
+        +------------------+-------------------------------------------------+
+        | free             | Number of free terminals.                       |
+        +------------------+-------------------------------------------------+
+        | inuse            | Number of terminals in use.                     |
+        +------------------+-------------------------------------------------+
+        | shared           | Number of terminals shared by the background    |
+        |                  | executions.                                     |
+        +------------------+-------------------------------------------------+
+        | hits             | Number of checkouts served by free terminals.   |
+        +------------------+-------------------------------------------------+
+        | misses           | Number of checkouts requiring a new terminal.   |
+        +------------------+-------------------------------------------------+
+        | creations        | Number of terminal connection setups including  |
+        |                  | recoveries.                                     |
+        +------------------+-------------------------------------------------+
+        | creation_latency | Dictionary of percentiles *p50*, *p90*, *p99*   |
+        |                  | and maximum *max* of the connection setup       |
+        |                  | durations in seconds.                           |
+        +------------------+-------------------------------------------------+
+        | checkout_wait    | Dictionary of percentiles *p50*, *p90*, *p99*   |
+        |                  | and maximum *max* of the checkout durations     |
+        |                  | in seconds.                                     |
+        +------------------+-------------------------------------------------+
+        | evictions        | Number of free terminals closed due to the      |
+        |                  | pool size limits.                               |
+        +------------------+-------------------------------------------------+
+        | recoveries       | Number of reconnections of broken terminals.    |
+        +------------------+-------------------------------------------------+
+
+        **Example:**
+
+        +-------------+------------------------------+
+        | ${stats}=   | Get Terminal Pool Statistics |
+        +-------------+------------------------------+
+        """
+        return self.terminalpools.get_statistics()
+
     def execute_command_in_target(self,
                                   command,
                                   target='default',
@@ -397,6 +564,114 @@ class RemoteRunner(object):
                            executable=executable,
                            progress_log=progress_log))
 
+    def execute_python_in_target(self,
+                                 code,
+                                 target='default',
+                                 timeout=3600,
+                                 module_path=None):
+        """
+        Executes *Python* code directly in the remote interpreter of the
+        target without spawning a shell.
+
+        If *code* is an expression, its value is returned. Otherwise
+        *code* is executed as statements. The code is executed in a namespace
+        of its own so it has to import the modules it uses.
+
+        **Arguments:**
+
+        *code*: *Python* expression or statements to execute.
+
+        *target*: Name of the target where to execute the code.
+
+        *timeout*: Timeout for the execution in seconds.
+
+        *module_path*: Path to the local *Python* file uploaded to the
+        target as a module prior to the execution. The module is uploaded
+        only once per remote interpreter unless the file is changed.
+
+        **Returns:**
+
+        Python *namedtuple* with arguments *status*, *value*, *stdout* and
+        *exception*. The *status* is *'0'* on success and *'1'* if
+        an exception was raised. The *value* is the value of the expression
+        or *None*. The *stdout* is the captured output written to
+        *sys.stdout* and the *exception* is the formatted exception or
+        *None*. The *value* must be picklable.
+
+        **Example:**
+
+        +----------------+------------------+-------------------------------+
+        | ${result}=     | Execute Python   | os.path.isdir('/tmp')         |
+        |                | In Target        |                               |
+        +----------------+------------------+-------------------------------+
+        | Should Be True | ${result.value}  |                               |
+        +----------------+------------------+-------------------------------+
+        | ${result}=     | Execute Python   | import os; print(os.getpid()) |
+        |                | In Target        |                               |
+        +----------------+------------------+-------------------------------+
+        | Log            | ${result.stdout} |                               |
+        +----------------+------------------+-------------------------------+
+        """
+        LOGGER.debug("execute_python_in_target(code='%s', target='%s')",
+                     code, target)
+        with self._proxyterminalhandle(target) as terminal:
+            return PythonResult.create(*terminal.terminal.call_initialized(
+                self._run_python_in_terminal, terminal, module_path,
+                terminal.terminal.execute_python, code, timeout=timeout))
+
+    def call_python_function_in_target(self, function, *args, **kwargs):
+        """
+        Calls *Python* function directly in the remote interpreter of the
+        target without spawning a shell.
+
+        **Arguments:**
+
+        *function*: Dotted name of the function, e.g. *os.path.getsize*.
+        The module of the function is imported if needed.
+
+        *args*: Positional arguments of the function.
+
+        *kwargs*: Keyword arguments of the function. The keyword
+        arguments *target*, *timeout* and *module_path* are reserved for
+        the name of the target, the timeout in seconds and the path to the
+        local module file as in \`Execute Python In Target\`.
+
+        **Returns:**
+
+        Python *namedtuple* as in \`Execute Python In Target\` where
+        *value* is the return value of the function.
+
+        **Example:**
+
+        +----------------+------------------+------------------+--------------+
+        | ${result}=     | Call Python      | mymodule.check   | /etc/hosts   |
+        |                | Function In      |                  |              |
+        |                | Target           |                  |              |
+        +----------------+------------------+------------------+--------------+
+        | ...            | module_path=     |                  |              |
+        |                | ${CURDIR}/       |                  |              |
+        |                | mymodule.py      |                  |              |
+        +----------------+------------------+------------------+--------------+
+        | Should Be Equal| ${result.status} | 0                |              |
+        +----------------+------------------+------------------+--------------+
+        """
+        target = kwargs.pop('target', 'default')
+        timeout = kwargs.pop('timeout', 3600)
+        module_path = kwargs.pop('module_path', None)
+        LOGGER.debug("call_python_function_in_target(function='%s', target='%s')",
+                     function, target)
+        with self._proxyterminalhandle(target) as terminal:
+            return PythonResult.create(*terminal.terminal.call_initialized(
+                self._run_python_in_terminal, terminal, module_path,
+                terminal.terminal.call_python_function,
+                function, args=args, kwargs=kwargs, timeout=timeout))
+
+    @staticmethod
+    def _run_python_in_terminal(terminal, module_path, run, *args, **kwargs):
+        if module_path is not None:
+            terminal.proxies.remoteimporter.importfile_if_needed(str(module_path))
+        return run(*args, **kwargs)
+
     def execute_background_command_in_target(self,
                                              command,
                                              target='default',
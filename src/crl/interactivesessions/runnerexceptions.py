@@ -1,4 +1,5 @@
 from contextlib import contextmanager
+from ._batch import _BatchFuture
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -70,7 +71,10 @@ def remotetimeouthandler(response_wrap):
 def responsehandler(function,
                     response_wrap=lambda x: x):
     with remotetimeouthandler(response_wrap):
-        return response_wrap(function())
+        response = function()
+        if isinstance(response, _BatchFuture):
+            return response.add_response_wrap(response_wrap)
+        return response_wrap(response)
 
 
 def asyncresponsehandler(function,
@@ -81,6 +85,28 @@ def asyncresponsehandler(function,
         return e
 
 
+class RemoteResponseExpired(RunnerException):
+    """Exception raised in case the response *response_id* of the timed
+    out or asynchronous call is evicted from the remote response store
+    before it is requested. See
+    :meth:`.runnerterminal.RunnerTerminal.set_response_store_limits`.
+    """
+    def __init__(self, response_id):
+        super(RemoteResponseExpired, self).__init__(response_id)
+        self.response_id = response_id
+
+    def __str__(self):
+        return 'Remote response {} expired before it was requested'.format(
+            self.response_id)
+
+
+class BatchNotSent(RunnerException):
+    """This exception is set to the futures of the calls queued in
+    :meth:`.RunnerTerminal.batch` in case the batch is not sent because an
+    exception is raised inside the batch block.
+    """
+
+
 class InvalidProxySession(RunnerException):
     """This exception is raised by :class:`.remoteproxies._RemoteProxy` methods
     in case the session identifier has been changed. This occurs for example in
@@ -3,8 +3,9 @@ import sys
 import traceback
 import pickle
 import logging
-import uuid
+import threading
 from io import BytesIO
+from itertools import islice
 from collections import namedtuple
 from contextlib import contextmanager
 from six import iteritems
@@ -13,14 +14,18 @@ from crl.interactivesessions.shells import MsgPythonShell
 from crl.interactivesessions.shells.remotemodules.compatibility import (
     to_string, to_bytes)
 from crl.interactivesessions.remoteproxies import (
-    _RemoteProxy, _RecursiveProxy)
+    _RemoteProxy, _RecursiveProxy, _LazyProxy)
 from crl.interactivesessions.runnerexceptions import (
     RunnerTerminalSessionClosed,
     RunnerTerminalSessionBroken,
     RunnerTerminalUnableToDeserialize,
     RemoteTimeout,
+    RemoteResponseExpired,
+    BatchNotSent,
     remotetimeouthandler)
 from .garbagemanager import GarbageManager
+from ._batch import _Batch
+from ._typespeccache import _TypeSpecCache
 from .shells.remotemodules.compatibility import PY3
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -34,6 +39,10 @@ _HandledReturnValue = namedtuple('_HandledReturnValue', [
 _RemoteReturnValue = namedtuple('_RemoteReturnValue', [
     'steeringstring', 'obj'])
 
+_PythonCall = namedtuple('_PythonCall', ['code', 'params'])
+
+_ResponseOutcome = namedtuple('_ResponseOutcome', ['result', 'exception'])
+
 
 class _RemoteRunner(object):
     def __init__(self,
@@ -41,18 +50,23 @@ class _RemoteRunner(object):
                  description,
                  template,
                  timeout=None,
+                 blobs=(),
                  **kwargs):
         self.runnerterminal = runnerterminal
         self.description = description
+        self.blobs = blobs
         self.timeout = None
         self.run_timeout = None
         self._set_timeouts(timeout)
         self.template = template
         self.kwargs = kwargs
+        self.session_id = self.runnerterminal.session_id
+        self.garbage = self.runnerterminal.pop_garbage()
         self.cmd = self.template.format(
             timeout=self.timeout,
             contextmgr=self.runnerterminal.TARGET_CONTEXTMANAGER,
             pickler=self.runnerterminal.TARGET_PICKLER,
+            garbage=self.runnerterminal.get_garbage_arg(self.garbage),
             **self.kwargs)
 
     def _set_timeouts(self, timeout):
@@ -76,9 +90,17 @@ class _RemoteRunner(object):
             with self.runnerterminal.error_handling():
                 return self._response(
                     self.runnerterminal.get_response_or_raise(
-                        self.runnerterminal.run(
-                            self.cmd, timeout=self.run_timeout),
-                        self.description))
+                        self._run_and_collect_garbage(), self.description))
+
+    def _run_and_collect_garbage(self):
+        try:
+            ret = self.runnerterminal.run(
+                self.cmd, timeout=self.run_timeout, blobs=self.blobs)
+        except Exception:
+            self.runnerterminal.restore_garbage(self.session_id, self.garbage)
+            raise
+        self.runnerterminal.release_garbage(self.session_id, self.garbage)
+        return ret
 
     @staticmethod
     def _response(response):
@@ -97,6 +119,27 @@ class _TimeoutRemoteRunner(_RemoteRunner):
         return response
 
 
+class _HandleAllocator(object):
+    """Allocator of the compact proxy handles *table[index]* referring to
+    the slots of the remote handle table *table*. Released handles are reused.
+    """
+
+    def __init__(self, table):
+        self._table = table
+        self._free = []
+        self._count = 0
+
+    def allocate(self):
+        if self._free:
+            return self._free.pop()
+        handle = '{table}[{index}]'.format(table=self._table, index=self._count)
+        self._count += 1
+        return handle
+
+    def release(self, handles):
+        self._free.extend(handles)
+
+
 class RunnerTerminal(object):
     """ This is the *Python* terminal session wrapper for
     the transparent proxy instances: :class:`.remoteproxies._RemoteProxy`
@@ -114,22 +157,50 @@ class RunnerTerminal(object):
 
     _RUN_TEMPLATE = _RUNNERLOCALS.format(
         method='run',
-        args="{cmd!r}, timeout={timeout}")
+        args="{cmd!r}, timeout={timeout}{params}{garbage}")
 
     _ASSIGN_AND_RUN_TEMPLATE = _RUNNERLOCALS.format(
         method='assign_and_run',
-        args="{handle!r}, {cmd!r}, timeout={timeout}")
+        args="{handle!r}, {cmd!r}, timeout={timeout}{params}{garbage}")
+
+    # reference to the request parameters in the remote code
+    _PARAMS = "runnerhandlerns['_RUNNERHANDLER'].params"
+    _TYPE_SPEC_TEMPLATE = _RUNNERCALL.format(method='get_type_spec',
+                                             args='{handle}, {name!r}')
+    _DEFINE_PROCEDURE_TEMPLATE = '{handle} = ' + _RUNNERCALL.format(
+        method='define_procedure',
+        args='{name!r}, {source}')
+    _EXECUTE_PYTHON_TEMPLATE = _RUNNERCALL.format(method='execute_python',
+                                                  args='{params}[0]')
+    _CALL_PYTHON_FUNCTION_TEMPLATE = _RUNNERCALL.format(
+        method='call_python_function',
+        args='{params}[0], {params}[1], {params}[2]')
+    _CHUNKED_ITERATOR_FACTORY = (
+        "runnerhandlerns['_RUNNERHANDLER'].create_chunked_iterator")
 
     _RUN_AND_RETURN_HANDLED_TEMPLATE = _RUNNERLOCALS.format(
         method='run_and_return_handled',
-        args="{handle!r}, timeout={timeout}")
+        args="{handle!r}, timeout={timeout}{garbage}")
+
+    _GET_RESPONSES_TEMPLATE = _RUNNERLOCALS.format(
+        method='get_responses',
+        args='{response_ids!r}, timeout={timeout}, wait_all={wait_all}{garbage}')
+
+    _RUN_BATCH_TEMPLATE = _RUNNERLOCALS.format(
+        method='run_batch',
+        args="{calls}, timeout={timeout}{garbage}")
 
     _DESERIALIZE_TEMPLATE = _RUNNERCALL.format(method='deserialize',
                                                args='{obj!r}, {unpickler}')
 
-    _GET_RESPONSE_TEMPLATE = _RUNNERCALL.format(
+    # reference to the binary blobs sent out-of-band with the request
+    _DESERIALIZE_BLOB_TEMPLATE = _RUNNERCALL.format(
+        method='deserialize',
+        args='_blobs[{index}], {unpickler}')
+
+    _GET_RESPONSE_TEMPLATE = _RUNNERLOCALS.format(
         method='get_response',
-        args='{response_id}, timeout={timeout}')
+        args='{response_id}, timeout={timeout}{garbage}')
 
     # list of libraries to be imported on the remote end during setup phase
     _IMPORTS = ['pickle', 'base64', 'os']
@@ -154,6 +225,10 @@ class RunnerTerminal(object):
     TARGET_UNPICKLER = 'pickle.Unpickler'
     # maximum number of remote proxies before garbage cleaning
     MAX_GARBAGE = 100
+    # name of the remote dictionary containing the proxied objects
+    HANDLE_TABLE = '_ph'
+    # pickle protocol used before the negotiation and as a fallback
+    FALLBACK_PROTOCOL = 0
 
     def __init__(self):
         self.session = None
@@ -162,8 +237,18 @@ class RunnerTerminal(object):
         self._saved_delaybeforesend = None
         self.default_timeout = 3600
         self.prompt_timeout = 30
-        self._garbage_manager = GarbageManager(clean=self._clean_garbage,
-                                               max_garbage=self.MAX_GARBAGE)
+        self._protocol = self.FALLBACK_PROTOCOL
+        self._handles = None
+        self._garbage_manager = None
+        self._batchlocal = threading.local()
+        self._type_spec_cache = _TypeSpecCache()
+        self._procedures = None
+        self._reset_handles()
+
+    def _reset_handles(self):
+        self._handles = _HandleAllocator(self.HANDLE_TABLE)
+        self._garbage_manager = GarbageManager(max_garbage=self.MAX_GARBAGE)
+        self._procedures = {}
 
     def set_default_timeout(self, default_timeout):
         self.default_timeout = default_timeout
@@ -190,15 +275,67 @@ class RunnerTerminal(object):
     def session_id(self):
         return self._session_id
 
+    @property
+    def protocol(self):
+        """Pickle protocol used in the serialization in both ends."""
+        return self._protocol
+
     def initialize_if_needed(self):
         pass
 
+    def call_initialized(self, function, *args, **kwargs):
+        """Initialize the terminal if needed and return the return value of
+        *function* called with *args* and *kwargs*. Inside :meth:`batch` the
+        terminal is not initialized again.
+        """
+        if not self.in_batch:
+            self.initialize_if_needed()
+        return function(*args, **kwargs)
+
+    @property
+    def _batch(self):
+        return getattr(self._batchlocal, 'batch', None)
+
+    @_batch.setter
+    def _batch(self, batch):
+        self._batchlocal.batch = batch
+
+    @property
+    def in_batch(self):
+        """*True* if the proxy calls of the current thread are queued to
+        :meth:`batch`.
+        """
+        return self._batch is not None
+
     def _prepare_terminal_session(self):
         self.get_session().push(MsgPythonShell())
 
     def _setup_handler(self):
         self.import_libraries(*self._IMPORTS)
+        self._negotiate_protocol()
         self.__setup_handler_module(RunnerHandler.get_python_file_path())
+        self.run('{table} = {{}}'.format(table=self.HANDLE_TABLE))
+        self._reset_handles()
+        self._type_spec_cache.invalidate()
+
+    def _negotiate_protocol(self):
+        """Set the pickle protocol to the highest protocol supported by both
+        ends. In *Python 2* the serialized arguments are embedded to the
+        commands as strings without *bytes* prefix and thus
+        *FALLBACK_PROTOCOL* is used.
+        """
+        self._protocol = self.FALLBACK_PROTOCOL
+        if PY3:
+            self._protocol = min(pickle.HIGHEST_PROTOCOL,
+                                 self._get_remote_highest_protocol())
+
+    def _get_remote_highest_protocol(self):
+        try:
+            return int(to_string(self.run('pickle.HIGHEST_PROTOCOL')))
+        except (TypeError, ValueError) as e:
+            LOGGER.debug('Using pickle protocol %s: %s: %s',
+                         self.FALLBACK_PROTOCOL, e.__class__.__name__, e)
+            return self.FALLBACK_PROTOCOL
 
     def _set_session_metadata(self):
         self._initialized_session = self.session
@@ -207,8 +344,10 @@ class RunnerTerminal(object):
     def get_session(self):
         return self.session.get_session()
 
-    def run(self, cmd, timeout=-1, _rerun=False):
-        """Run with error handling *run* of the session.
+    def run(self, cmd, timeout=-1, _rerun=False, blobs=()):
+        """Run with error handling *run* of the session. The binary *blobs*
+        are sent out-of-band with *cmd* and *cmd* can refer to them via the
+        remote list *_blobs*.
 
         .. note ::
 
@@ -221,30 +360,61 @@ class RunnerTerminal(object):
                 ' in the closed session. Command has no effect.'.format(
                     cmd=cmd, timeout=timeout))
         try:
-            self._garbage_manager.clean_if_needed(session_id=self._session_id)
-            return self._run_in_session(cmd, timeout)
+            return self._run_in_session(cmd, timeout, blobs)
         except Exception as e:  # pylint: disable=broad-except
             self._raise_session_broken_exception(e)
 
     def add_handle_to_garbage(self, session_id, handle):
         """Adds :class:`crl.interactivesessions.remoteproxies._RemoteProxy`
-        handles (or the derivates of it) into garbage collection. The garbage
-        is cleaned during executions when the treshold *MAX_GARBAGE* is
-        exceeded.
+        handles (or the derivates of it) into garbage collection. When the
+        treshold *MAX_GARBAGE* is exceeded, the garbage is deleted in the remote
+        end as a part of the next remote handler request so that the garbage
+        cleaning does not require a round trip of its own.
         """
         if session_id == self._session_id:
             self._garbage_manager.add(session_id=session_id, garbage=handle)
 
-    def _clean_garbage(self, garbage):
-        self._run_in_session('del {garbage}'.format(garbage=', '.join(garbage)),
-                             timeout=(2 * self.prompt_timeout))
+    @property
+    def pending_garbage(self):
+        """Number of handles waiting for the deletion in the remote end."""
+        return len(self._garbage_manager)
+
+    def pop_garbage(self):
+        """Return and forget the handles to be deleted in the remote end as
+        a part of the next remote handler request if the garbage cleaning is
+        needed. Otherwise return empty list. The handles are not reused
+        before they are released via :meth:`release_garbage`.
+        """
+        return self._garbage_manager.pop_if_needed(session_id=self._session_id)
+
+    def release_garbage(self, session_id, garbage):
+        """Release the handles *garbage* deleted in the remote end of the
+        session *session_id* for the reuse.
+        """
+        if session_id == self._session_id:
+            self._handles.release(garbage)
+
+    def restore_garbage(self, session_id, garbage):
+        """Return the handles *garbage* of the failed request back to
+        the garbage of the session *session_id*.
+        """
+        self._garbage_manager.restore(session_id=session_id, garbage=garbage)
+
+    @staticmethod
+    def get_garbage_arg(garbage):
+        """Return the garbage argument for the remote handler request
+        deleting the handles *garbage*. If *garbage* is empty, return empty
+        string.
+        """
+        return ', garbage={!r}'.format(garbage) if garbage else ''
 
-    def _run_in_session(self, cmd, timeout):
-        return self._run_full_output(cmd, timeout=timeout)
+    def _run_in_session(self, cmd, timeout, blobs=()):
+        return self._run_full_output(cmd, timeout=timeout, blobs=blobs)
 
-    def _run_full_output(self, cmd, timeout):
+    def _run_full_output(self, cmd, timeout, blobs=()):
+        kwargs = {'blobs': blobs} if blobs else {}
         return self.get_session().current_shell().exec_command(
-            cmd, timeout=timeout)
+            cmd, timeout=timeout, **kwargs)
 
     @staticmethod
     def _raise_session_broken_exception(exception):
@@ -287,11 +457,31 @@ class RunnerTerminal(object):
         If an exception is raised on the remote end, the traceback is
         logged, and the exception object is raised by this method.
         """
+        return self._run_python(cmd, timeout=timeout)
+
+    def _run_python(self, cmd, timeout=None, params=()):
+        blobs = []
         return _RemoteRunner(runnerterminal=self,
                              template=self._RUN_TEMPLATE,
                              description=cmd,
                              timeout=timeout,
-                             cmd=cmd).run()
+                             cmd=cmd,
+                             params=self._get_params_arg(params, blobs),
+                             blobs=blobs).run()
+
+    def _get_params_arg(self, params, blobs):
+        return (', params={}'.format(self._get_blob_arg(tuple(params), blobs))
+                if params else
+                '')
+
+    def _get_blob_arg(self, arg, blobs):
+        """Append serialized *arg* to *blobs* and return the remote code
+        deserializing it. The blobs are sent out-of-band in the request so
+        that the serialized content is neither escaped nor compiled.
+        """
+        blobs.append(self.serialize(arg))
+        return self._DESERIALIZE_BLOB_TEMPLATE.format(
+            index=len(blobs) - 1, unpickler=self.TARGET_UNPICKLER)
 
     @staticmethod
     @contextmanager
@@ -318,6 +508,10 @@ class RunnerTerminal(object):
         If an exception is raised on the remote end, the traceback is logged,
         and the exception object is raised by this method.
         """
+        return self._assign_and_run_python(handle, cmd, timeout=timeout)
+
+    def _assign_and_run_python(self, handle, cmd, timeout=None, params=()):
+        blobs = []
         return _HandledRemoteRunner(
             runnerterminal=self,
             description=cmd,
@@ -325,6 +519,8 @@ class RunnerTerminal(object):
             timeout=timeout,
             handle=handle,
             cmd=cmd,
+            params=self._get_params_arg(params, blobs),
+            blobs=blobs,
             handled_types=self._get_python_arg(self.HANDLED_TYPES)).run()
 
     def run_and_return_handled_python(self, handle):
@@ -367,6 +563,68 @@ class RunnerTerminal(object):
             timeout=timeout,
             response_id=remotetimeout.response_id).run()
 
+    def get_response_store_stats(self):
+        """Return dictionary of the remote store of the responses not yet
+        requested. The keys are *size*, *completed* and *running* for the
+        number of the stored responses, *evicted_expired* and
+        *evicted_overflow* for the number of the evicted responses and
+        *max_age* and *max_size* for the limits.
+        """
+        return self.run_python(self._RUNNERCALL.format(
+            method='get_response_store_stats', args=''))
+
+    def set_response_store_limits(self, max_age=None, max_size=None):
+        """Set limits of the remote store of the responses of the timed out
+        and asynchronous calls. The completed responses not requested in
+        *max_age* seconds are evicted and at most *max_size* completed
+        responses are kept. The running calls are not evicted. If a limit is
+        *None*, it is not used. By default, the limits are not used.
+        Requesting an evicted response raises
+        :class:`.runnerexceptions.RemoteResponseExpired`.
+        """
+        self.run_python(self._RUNNERCALL.format(
+            method='set_response_store_limits',
+            args='max_age={max_age!r}, max_size={max_size!r}'.format(
+                max_age=max_age, max_size=max_size)))
+
+    def get_responses(self, remotetimeouts, timeout=None, wait_all=False):
+        """Wait in a single request until any or, if *wait_all* is *True*,
+        all of the responses of :class:`.runnerexceptions.RemoteTimeout`
+        instances *remotetimeouts* are completed or until *timeout* expires.
+
+        Return:
+            Dictionary from the response ids of the completed responses to
+            the named tuples with the fields *result* and *exception*.
+            The *result* is the response as returned by
+            :meth:`.get_response` and *exception* is the exception raised
+            while getting the response or *None*.
+        """
+        responses = _RemoteRunner(
+            runnerterminal=self,
+            template=self._GET_RESPONSES_TEMPLATE,
+            description='Get responses with ids {}'.format(
+                [r.response_id for r in remotetimeouts]),
+            timeout=timeout,
+            response_ids=[r.response_id for r in remotetimeouts],
+            wait_all=wait_all).run()
+        remotetimeouts = {r.response_id: r for r in remotetimeouts}
+        outcomes = {}
+        for response_id, response in responses:
+            outcomes[response_id] = self._get_response_outcome(
+                remotetimeouts[response_id], response)
+        return outcomes
+
+    def _get_response_outcome(self, remotetimeout, response):
+        try:
+            with remotetimeouthandler(remotetimeout.response_wrap):
+                return _ResponseOutcome(
+                    result=remotetimeout.response_wrap(self.get_response_or_raise(
+                        response, 'Get response with id {}'.format(
+                            remotetimeout.response_id))),
+                    exception=None)
+        except Exception as e:  # pylint: disable=broad-except
+            return _ResponseOutcome(result=None, exception=e)
+
     def get_response_or_raise(self, out, cmd):
         return self.__identity_or_raise(self._try_to_deserialize(out, cmd))
 
@@ -408,6 +666,8 @@ class RunnerTerminal(object):
             raise outobj  # pylint: disable=raising-bad-type
         if steeringstring == b'timeout':
             raise RemoteTimeout(response_id=outobj)
+        if steeringstring == b'expired':
+            raise RemoteResponseExpired(response_id=outobj)
 
         return _RemoteReturnValue(steeringstring=steeringstring, obj=outobj)
 
@@ -444,9 +704,196 @@ class RunnerTerminal(object):
     def run_python_call_with_timeout(self, timeout, function_name,
                                      args, kwargs):
 
-        return self.run_python(self._get_python_call(function_name,
-                                                     args, kwargs),
-                               timeout=timeout)
+        python_call = self._get_python_call(function_name, args, kwargs)
+        if self._batch is not None:
+            return self._batch.add(python_call)
+        return self._run_python(python_call.code,
+                                timeout=timeout,
+                                params=python_call.params)
+
+    @contextmanager
+    def batch(self, timeout=None):
+        """Context manager queuing the proxy calls made inside the block.
+        The proxy calls are the calls of the proxies and the methods of the
+        proxies, the item access and the attribute assignments. The queued
+        calls return futures instead of the values. On exit, the
+        calls are sent in a single request and executed in order in the
+        remote end. Then the values and the exceptions of the calls are set
+        to the corresponding futures.
+
+        The *timeout* is the timeout of the whole batch request in seconds.
+        If *timeout* is *None*, the default timeout is used. The timeouts of
+        the individual proxy calls are not used.
+
+        Example:
+
+            >>> with runnerterminal.batch():
+            ...     exists = path.exists('/tmp')
+            ...     isdir = path.isdir('/tmp')
+            >>> isdir.result()
+            True
+
+        Only the calls of the thread running the block are queued. The
+        terminal is initialized if needed once at the beginning of the block
+        and the queued calls do not initialize or verify the terminal.
+
+        .. note::
+
+            The futures can be used only after the block.
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+        self.initialize_if_needed()
+        batch = self._batch = _Batch()
+        try:
+            yield batch
+        except Exception:
+            batch.set_exception(BatchNotSent('Exception raised inside batch'))
+            raise
+        finally:
+            self._batch = None
+        self._run_batch(batch, timeout)
+
+    def _run_batch(self, batch, timeout):
+        if not batch:
+            return
+        blobs = []
+        try:
+            responses = _RemoteRunner(
+                runnerterminal=self,
+                template=self._RUN_BATCH_TEMPLATE,
+                description='Batch of {} calls'.format(len(batch)),
+                timeout=timeout,
+                calls=self._get_blob_arg(batch.calls, blobs),
+                blobs=blobs).run()
+        except Exception as e:
+            batch.set_exception(e)
+            raise
+        for future, response in zip(batch.futures, responses):
+            self._set_future_response(future, response)
+
+    def _set_future_response(self, future, response):
+        try:
+            ret = self.__identity_or_raise(response)
+        except Exception as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+            return
+        future.set_response(
+            ret.obj
+            if future.call.handle is None else
+            _HandledReturnValue(isobj=(ret.steeringstring == b'handled'),
+                                obj=ret.obj))
+
+    def get_local_values(self, proxies, timeout=None):
+        """Return the local copies of the objects proxied by *proxies* in
+        order. The values are fetched in a single request. If fetching the
+        value of some proxy fails, the exception of the first such proxy is
+        raised as :meth:`.remoteproxies._RemoteProxy.as_local_value` would
+        raise it.
+
+        The *timeout* is the timeout of the request in seconds. If *timeout*
+        is *None*, the default timeout is used.
+
+        The terminal is initialized if needed only once for all *proxies*.
+        """
+        return self.call_initialized(self._get_local_values, proxies, timeout)
+
+    def _get_local_values(self, proxies, timeout):
+        batch = _Batch()
+        futures = [batch.add(_PythonCall(code=self._get_verified_handle(proxy),
+                                         params=()))
+                   for proxy in proxies]
+        self._run_batch(batch, timeout)
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _get_verified_handle(proxy):
+        proxy.remote_proxy_verify()
+        return proxy._handle  # pylint: disable=protected-access
+
+    def map(self, function, iterable, chunksize=100, timeout=None,
+            return_exceptions=False):
+        """Call remote callable *function* with each item of *iterable* as
+        an argument in the remote end and return the list of the return
+        values in order. The *function* is either a proxy or the remote name
+        of the callable. The calls are sent in chunks of *chunksize* items so
+        that each chunk is executed in a single request.
+
+        If *return_exceptions* is *True*, the exceptions raised by the calls
+        are returned in place of the return values. Otherwise, the exception
+        of the first failing call is raised after its chunk is executed and
+        the rest of the chunks are not sent.
+
+        The *timeout* is the timeout of each chunk request in seconds. If
+        *timeout* is *None*, the default timeout is used.
+
+        The terminal is initialized if needed before the first request.
+
+        Example:
+
+            >>> terminal.map('os.path.exists', ['/tmp', '/nonexistent'])
+            [True, False]
+        """
+        if self.isproxy(function):
+            return self._map(function.get_proxy_handle(), iterable, chunksize,
+                             timeout, return_exceptions)
+        return self.call_initialized(self._map, function, iterable, chunksize,
+                                     timeout, return_exceptions)
+
+    def _map(self, function_name, iterable, chunksize, timeout, return_exceptions):
+        results = []
+        iterator = iter(iterable)
+        items = list(islice(iterator, chunksize))
+        while items:
+            batch = _Batch()
+            futures = [batch.add(self._get_python_call(function_name, (item,), {}))
+                       for item in items]
+            self._run_batch(batch, timeout)
+            results.extend(self._get_map_result(future, return_exceptions)
+                           for future in futures)
+            items = list(islice(iterator, chunksize))
+        return results
+
+    @staticmethod
+    def _get_map_result(future, return_exceptions):
+        if return_exceptions and future.exception() is not None:
+            return future.exception()
+        return future.result()
+
+    def get_chunked_iterator(self, iterable, max_items, max_bytes, read_ahead):
+        """Return :class:`.remoteproxies._RemoteProxy` of the remote iterator
+        reading ahead the items of *iterable* and returning them in chunks.
+        See :meth:`.remoteproxies._RemoteProxy.as_chunked_iterator`.
+        """
+        return self.get_proxy_object_from_call(
+            self._CHUNKED_ITERATOR_FACTORY,
+            iterable, max_items, max_bytes, read_ahead)
+
+    def execute_python(self, code, timeout=None):
+        """Evaluate the expression or execute the statements *code* in the
+        remote interpreter in a namespace of its own while capturing the
+        *stdout* writes of the execution.
+
+        Returns:
+            Tuple of the value of the expression or *None*, the captured
+            *stdout* and the formatted exception raised by *code* or *None*.
+        """
+        return self._run_python(
+            self._EXECUTE_PYTHON_TEMPLATE.format(params=self._PARAMS),
+            timeout=timeout,
+            params=(code,))
+
+    def call_python_function(self, name, args=(), kwargs=None, timeout=None):
+        """Call remote function of dotted *name*, e.g. *os.path.getsize*,
+        with *args* and *kwargs* while capturing the *stdout* writes of the
+        call. The module of the function is imported if needed. The return
+        value is as in :meth:`.execute_python`.
+        """
+        return self._run_python(
+            self._CALL_PYTHON_FUNCTION_TEMPLATE.format(params=self._PARAMS),
+            timeout=timeout,
+            params=(name, tuple(args), kwargs or {}))
 
     def import_libraries(self, *imports):
         """Import the libraries given as arguments on the remote end."""
@@ -486,12 +933,13 @@ class RunnerTerminal(object):
         The call is done as in :meth:`.run_python`, but the return value
         is a :class:`.remoteproxies._RemoteProxy` for the remote return value.
         """
-        handle = self._get_random_handle_name()
+        handle = self._allocate_handle()
 
         python_call = self._get_python_call(function_name, args, kwargs)
 
-        self.run_python("{handle} = {call}".format(handle=handle,
-                                                   call=python_call))
+        self._run_python("{handle} = {call}".format(handle=handle,
+                                                    call=python_call.code),
+                         params=python_call.params)
 
         return _RemoteProxy(self, handle)
 
@@ -513,31 +961,29 @@ class RunnerTerminal(object):
 
     def get_proxy_or_basic_from_call_with_timeout(
             self, timeout, function_name, args, kwargs):
-        handle = self._get_random_handle_name()
+        handle = self._allocate_handle()
 
         python_call = self._get_python_call(function_name, args, kwargs)
+        if self._batch is not None:
+            return self._batch.add(python_call, handle=handle).add_response_wrap(
+                lambda response: self._get_proxy_or_basic(handle, response))
 
         with remotetimeouthandler(lambda response: self._get_proxy_or_basic(
                 handle, response)):  # pylint: disable=bad-continuation
             return self._get_proxy_or_basic(handle,
-                                            self.assign_and_run_python(
-                                                handle, python_call,
-                                                timeout=timeout))
+                                            self._assign_and_run_python(
+                                                handle, python_call.code,
+                                                timeout=timeout,
+                                                params=python_call.params))
 
     def _get_proxy_or_basic(self, handle, response):
-        return response.obj if response.isobj else _RemoteProxy(self, handle)
-
-    def _get_random_handle_name(self):
-        return self._get_handle_for_name(self._get_random_name())
+        if response.isobj:
+            self.add_handle_to_garbage(session_id=self._session_id, handle=handle)
+            return response.obj
+        return _RemoteProxy(self, handle)
 
-    @staticmethod
-    def _get_handle_for_name(name):
-        return "runnerhandlerns['_PROXY_CONTAINER.handle_{name}']".format(
-            name=name)
-
-    @staticmethod
-    def _get_random_name():
-        return str(uuid.uuid4().hex)
+    def _allocate_handle(self):
+        return self._handles.allocate()
 
     def get_recursive_proxy(self, remote_object):
         """Creates a recursive proxy object for remote_object.
@@ -556,9 +1002,56 @@ class RunnerTerminal(object):
                                remote_object,
                                is_remote_owned=False)
 
-    @staticmethod
-    def serialize(content):
-        return pickle.dumps(content, protocol=0)
+    def register_procedure(self, name, source):
+        """Define function *name* in the remote end by executing *source*
+        once and return :class:`.remoteproxies._RemoteProxy` of the function.
+        The calls of the proxy send only the short handle of the function and
+        the serialized arguments. The *source* is executed in a namespace of
+        its own like a module so it has to import the modules it uses. If the
+        same *name* and *source* are already registered in the session, the
+        proxy is returned without a request.
+
+        Example:
+
+            >>> getsize = terminal.register_procedure(
+            ...     'getsize', 'import os\\n'
+            ...                'def getsize(path):\\n'
+            ...                '    return os.stat(path).st_size')
+            >>> getsize('/etc/hosts')
+            158
+        """
+        try:
+            return self._procedures[(name, source)]
+        except KeyError:
+            pass
+        handle = self._allocate_handle()
+        self._run_python(
+            self._DEFINE_PROCEDURE_TEMPLATE.format(
+                handle=handle,
+                name=name,
+                source='{params}[0]'.format(params=self._PARAMS)),
+            params=(source,))
+        procedure = _RemoteProxy(self, handle)
+        self._procedures[(name, source)] = procedure
+        return procedure
+
+    def get_lazy_proxy(self, remote_object):
+        """Creates a lazy proxy object for remote_object.
+
+        **Args:**
+
+        *remote_object*:  the name of the remote object to proxy.
+
+        The attribute and the item access chains of the lazy proxy are
+        collected locally and evaluated in a single request when the value is
+        needed. For more details, see :class:`.remoteproxies._LazyProxy`.
+        """
+        return _LazyProxy(self,
+                          remote_object,
+                          is_remote_owned=False)
+
+    def serialize(self, content):
+        return pickle.dumps(content, protocol=self._protocol)
 
     @staticmethod
     def isproxy(obj):
@@ -569,6 +1062,34 @@ class RunnerTerminal(object):
         """Determines whether *remote_object* is callable or not."""
         return self.run_python("callable({0})".format(remote_object))
 
+    def get_attribute_callability(self, handle, type_key, name, timeout=None):
+        """Determine callability of attribute *name* of *handle* whose type
+        key is *type_key* or *None* if unknown. The callability is looked up
+        from the type spec cache and, if not found, all public attributes of
+        the remote object are fetched in a single request and cached.
+
+        Returns:
+            Tuple of the type key and *True* or *False* for the callable and
+            non-callable attribute, respectively, or *None* if the attribute
+            is missing.
+        """
+        if type_key is not None:
+            try:
+                return type_key, self._type_spec_cache.get(type_key, name)
+            except KeyError:
+                pass
+        type_key, spec = self.run_python(
+            self._TYPE_SPEC_TEMPLATE.format(handle=handle, name=name),
+            timeout=timeout)
+        self._type_spec_cache.update(type_key, spec)
+        return type_key, spec.get(name)
+
+    def invalidate_type_specs(self, type_key=None):
+        """Invalidate the cached attribute callability of the remote type
+        *type_key* or of all types if *type_key* is *None*.
+        """
+        self._type_spec_cache.invalidate(type_key)
+
     def close(self):
         """Close the terminal session.
 
@@ -581,16 +1102,29 @@ class RunnerTerminal(object):
             self.close_session()
 
     def _get_python_call(self, function_name, args, kwargs):
-        """Generates the code for a function call on the remote end."""
+        """Generates :class:`._PythonCall` for a function call on the remote
+        end. The arguments which are not proxies are not embedded to the code
+        but passed as the request parameters so that the remote end can reuse
+        the compiled code of the call.
+        """
         LOGGER.debug("preparing call - %s(*%s, **%s)",
                      function_name, args, kwargs)
-
-        arg_list = [self._get_python_arg(arg) for arg in args]
+        params = []
+        arg_list = [self._get_python_param(arg, params) for arg in args]
         for name, arg in iteritems(kwargs):
-            arg_list.append("{0}={1}".format(name, self._get_python_arg(arg)))
+            arg_list.append("{0}={1}".format(name,
+                                             self._get_python_param(arg, params)))
 
-        return "{fn}({args})".format(
-            fn=function_name, args=', '.join(arg_list))
+        return _PythonCall(code="{fn}({args})".format(fn=function_name,
+                                                      args=', '.join(arg_list)),
+                           params=params)
+
+    def _get_python_param(self, arg, params):
+        if self.isproxy(arg):
+            return arg.get_proxy_handle()
+        params.append(arg)
+        return '{params}[{index}]'.format(params=self._PARAMS,
+                                          index=len(params) - 1)
 
     def _get_python_arg(self, arg):
         """Handle serialization and possible proxy values in arguments.
@@ -628,8 +1162,7 @@ class RunnerTerminal(object):
                      handler_content=(
                          "pickle.loads({b}{dumps!r})".format(
                              b='' if PY3 else 'b',
-                             dumps=pickle.dumps(
-                                 handler_content, protocol=0)))))
+                             dumps=self.serialize(handler_content)))))
         self.run('runnerhandlerns = {}')
         self.run("exec(_handlercode, runnerhandlerns)")
 
@@ -639,9 +1172,11 @@ class RunnerTerminal(object):
             args=(
                 'contextmgr={contextmgr},'
                 ' pickler={pickler},'
+                ' protocol={protocol},'
                 ' handled_types={handled_types}'.format(
                     contextmgr=self.TARGET_CONTEXTMANAGER,
                     pickler=self.TARGET_PICKLER,
+                    protocol=self._protocol,
                     handled_types=self._get_python_arg(self.HANDLED_TYPES)))))
 
     def create_empty_recursive_proxy(self):
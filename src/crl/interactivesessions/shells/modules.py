@@ -8,8 +8,13 @@ Note:
 """
 
 import os
+import zlib
+import base64
 import itertools
-from .termserialization import serialize_from_file
+from .termserialization import (
+    serialize_from_file,
+    serialize_literal_from_file)
+from .remotemodules import bootstrapcache
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -23,8 +28,9 @@ class MainModule(object):
     """
     _cmd_treshold_len = 5000
 
-    def __init__(self, module):
+    def __init__(self, module, source_serializer=serialize_from_file):
         self.module = module
+        self._source_serializer = source_serializer
         self._module_vars = {}
 
     @property
@@ -115,7 +121,7 @@ class MainModule(object):
     @property
     def _compile_cmd(self):
         return ("compile({serialized}, filename='{basename}', "
-                "mode='exec')".format(serialized=serialize_from_file(self.path),
+                "mode='exec')".format(serialized=self._source_serializer(self.path),
                                       basename=os.path.basename(self.path)))
 
 
@@ -124,7 +130,8 @@ class ChildModule(MainModule):
     dictionary.
     """
     def __init__(self, module, parent):
-        super(ChildModule, self).__init__(module)
+        super(ChildModule, self).__init__(
+            module, source_serializer=parent._source_serializer)
         self._parent = parent
 
     def _import_cmd_gen(self):
@@ -135,3 +142,121 @@ class ChildModule(MainModule):
         return "{parent_module_var}.__dict__['{name}']".format(
             parent_module_var=self._parent.module_var,
             name=self.name)
+
+
+class CachedMainModule(object):
+    """CachedMainModule generates commands for loading *module* in the remote
+    end via the cache of :mod:`.remotemodules.bootstrapcache`. The commands
+    of :class:`.MainModule` are joined to a script identified by the SHA-256
+    digest of the content. Only the digest is sent if the script is found in
+    the cache. Otherwise the script is sent once, stored and executed.
+
+    Usage:
+
+        - Run commands of :meth:`.cache_cmds_gen`.
+
+        - Run :attr:`.load_cmd` which returns *True* if the script is loaded
+          from the cache.
+
+        - If not loaded, run commands of :meth:`.store_cmds_gen`.
+    """
+    _cmd_treshold_len = MainModule._cmd_treshold_len
+    _scripts = {}
+
+    def __init__(self, module):
+        self._mainmodule = MainModule(module)
+        self._cachemodule = MainModule(bootstrapcache)
+
+    @property
+    def module_var(self):
+        return self._mainmodule.module_var
+
+    @property
+    def name(self):
+        return self._mainmodule.name
+
+    @property
+    def script(self):
+        """Script built from the commands of :class:`.MainModule`. The script
+        is built only once per module in the process.
+        """
+        try:
+            return self._scripts[self._mainmodule.path]
+        except KeyError:
+            script = '\n'.join(self._mainmodule.cmds_gen())
+            self._scripts[self._mainmodule.path] = script
+            return script
+
+    @property
+    def digest(self):
+        return bootstrapcache.get_digest(self.script)
+
+    def cache_cmds_gen(self):
+        return self._cachemodule.cmds_gen()
+
+    @property
+    def load_cmd(self):
+        return '{cache_var}.load({name!r}, {digest!r}, globals())'.format(
+            cache_var=self._cachemodule.module_var,
+            name=self.name,
+            digest=self.digest)
+
+    def store_cmds_gen(self):
+        script = self.script
+        yield '{parts_var} = []'.format(parts_var=self._parts_var)
+        for i in range(0, len(script), self._cmd_treshold_len):
+            yield '{parts_var}.append({part!r})'.format(
+                parts_var=self._parts_var,
+                part=script[i:i + self._cmd_treshold_len])
+        yield ("{cache_var}.store_and_exec({name!r}, ''.join({parts_var}), "
+               "globals()); del {parts_var}".format(
+                   cache_var=self._cachemodule.module_var,
+                   name=self.name,
+                   parts_var=self._parts_var))
+
+    @property
+    def _parts_var(self):
+        return '{}_parts'.format(self.module_var)
+
+
+class CompressedMainModule(object):
+    """CompressedMainModule generates a single command which imports *module*
+    in the remote end. The commands of :class:`.MainModule` are joined to a
+    script with the module sources as string literals. The script is sent
+    zlib compressed and base64 encoded and it is executed in the remote end
+    by the same command.
+
+    Note:
+        The command has to be run in the raw tty mode as it is typically
+        longer than the canonical mode line length limit.
+    """
+    _blobs = {}
+
+    def __init__(self, module):
+        self._mainmodule = MainModule(
+            module, source_serializer=serialize_literal_from_file)
+
+    @property
+    def module_var(self):
+        return self._mainmodule.module_var
+
+    @property
+    def blob(self):
+        """Compressed and encoded script. The blob is built only once per
+        module in the process.
+        """
+        try:
+            return self._blobs[self._mainmodule.path]
+        except KeyError:
+            script = '\n'.join(self._mainmodule.cmds_gen())
+            blob = base64.b64encode(zlib.compress(script.encode('utf-8'), 9))
+            self._blobs[self._mainmodule.path] = blob
+            return blob
+
+    def get_cmd(self, *post_cmds):
+        """Return command importing the module and running then *post_cmds*.
+        """
+        return '; '.join(
+            ['import zlib, base64',
+             'exec(zlib.decompress(base64.b64decode({blob!r})))'.format(
+                 blob=self.blob)] + list(post_cmds))
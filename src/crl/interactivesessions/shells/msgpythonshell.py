@@ -5,7 +5,9 @@ from crl.interactivesessions.shells.shell import TimeoutError
 from .rawpythonshell import RawPythonShell
 
 from .remotemodules import servers
-from .modules import MainModule
+from .modules import (
+    CachedMainModule,
+    CompressedMainModule)
 from .terminalclient import (
     TerminalClient,
     TerminalClientError,
@@ -13,6 +15,8 @@ from .terminalclient import (
 from .remotemodules.exceptions import FatalPythonError
 from .remotemodules.msgs import (
     ExecCommandRequest,
+    ExecCommandBlobsRequest,
+    CommandBlobs,
     SendCommandRequest,
     ExitRequest,
     ServerIdRequest,
@@ -39,10 +43,12 @@ class MsgPythonShell(RawPythonShell):
                            timeout=RawPythonShell.short_timeout)
 
     _retry = _default_retry
+    _compressed_launch = False
 
     def __init__(self):
         super(MsgPythonShell, self).__init__()
-        self._servers_mod = MainModule(servers)
+        self._servers_mod = CachedMainModule(servers)
+        self._compressed_servers_mod = CompressedMainModule(servers)
         self._client = TerminalClient()
         self._fatalerror = FatalPythonError(Exception(
             'Python server is not started yet'))
@@ -56,25 +62,68 @@ class MsgPythonShell(RawPythonShell):
     def reset_retry(cls):
         cls._retry = cls._default_retry
 
+    @classmethod
+    def set_compressed_launch(cls, compressed_launch):
+        """Start the server with the compressed launcher if
+        *compressed_launch* is *True*. The launcher sets up the raw mode in a
+        single command and then sends the zlib compressed and base64 encoded
+        server modules in the same command which starts the server. The
+        target cache of the server modules is not used by the launcher.
+        """
+        cls._compressed_launch = compressed_launch
+
     def start(self):
         super(MsgPythonShell, self).start()
         self._setup_client()
-        for cmd in self._servers_mod.cmds_gen():
-            self._single_command_no_output(cmd, timeout=self.short_timeout)
+        if self._compressed_launch:
+            self._launch_compressed()
+        else:
+            self._launch_with_cache()
+
+    def _setup_raw(self):
+        if self._compressed_launch:
+            self._setup_raw_in_single_cmd()
+        else:
+            super(MsgPythonShell, self)._setup_raw()
+
+    def _launch_compressed(self):
+        self._terminal.sendline(self._compressed_servers_mod.get_cmd(
+            self._get_serve_cmd(self._compressed_servers_mod.module_var)))
+        self._wait_server_id()
+
+    def _launch_with_cache(self):
+        self._run_cmds(self._servers_mod.cache_cmds_gen())
+        if not self._load_servers_from_cache():
+            self._run_cmds(self._servers_mod.store_cmds_gen())
 
         self._serve()
 
+    def _run_cmds(self, cmds):
+        for cmd in cmds:
+            self._single_command_no_output(cmd, timeout=self.short_timeout)
+
+    def _load_servers_from_cache(self):
+        self._send_input_line(self._servers_mod.load_cmd)
+        out = self._read_until(self._prompt[0], timeout=self.short_timeout)
+        LOGGER.debug('Servers module loaded from cache: %s', out.strip())
+        return out.strip() == 'True'
+
     def _setup_client(self):
         self._client.set_retry(self._retry)
         self._client.set_terminal(self._terminal)
         self._client.set_wrap_timeout_exception(self._wrap_timeout_exception)
 
     def _serve(self):
-        self._terminal.sendline(
-            '{servers_mod_var}.PythonServer.create_and_serve('
-            '{serialized_retry!r})'.format(
-                servers_mod_var=self._servers_mod.module_var,
-                serialized_retry=self._retry.serialize()))
+        self._terminal.sendline(self._get_serve_cmd(self._servers_mod.module_var))
+        self._wait_server_id()
+
+    def _get_serve_cmd(self, servers_mod_var):
+        return ('{servers_mod_var}.PythonServer.create_and_serve('
+                '{serialized_retry!r})'.format(
+                    servers_mod_var=servers_mod_var,
+                    serialized_retry=self._retry.serialize()))
+
+    def _wait_server_id(self):
         self._server_id = self._get_server_id_in_start(timeout=self.short_timeout)
         self._fatalerror = None
 
@@ -82,12 +131,16 @@ class MsgPythonShell(RawPythonShell):
         r = self._client.receive_and_send_ack(timeout)
         return r.server_id
 
-    def exec_command(self, cmd, timeout=-1):
+    def exec_command(self, cmd, timeout=-1, blobs=()):
+        """Execute *cmd* in the remote Python interpreter. The binary
+        *blobs* are sent out-of-band in the same message and they are
+        available for *cmd* in the list *_blobs*.
+        """
         LOGGER.debug('====> MsgPythonShell exec_command %s, timeout=%s', cmd, timeout)
         timeout = self._terminal.timeout if timeout == -1 else timeout
         if self._fatalerror is None:
             with self._fatalerror_handling():
-                ret = self._exec_python_cmd(cmd, timeout)
+                ret = self._exec_python_cmd(cmd, timeout, blobs)
 
         ret = ret if self._fatalerror is None else str(self._fatalerror)
         LOGGER.debug('<==== MsgPythonShell exec_command %s, return %s', cmd, ret)
@@ -136,11 +189,17 @@ class MsgPythonShell(RawPythonShell):
             self._fatalerror = FatalPythonError(e)
             self._exit_serve()
 
-    def _exec_python_cmd(self, cmd, timeout):
-        r = self._send_and_receive(ExecCommandRequest.create(cmd),
+    def _exec_python_cmd(self, cmd, timeout, blobs):
+        r = self._send_and_receive(self._create_exec_command_request(cmd, blobs),
                                    timeout=timeout)
         return r.out
 
+    @staticmethod
+    def _create_exec_command_request(cmd, blobs):
+        return (ExecCommandBlobsRequest.create(CommandBlobs(cmd, blobs))
+                if blobs else
+                ExecCommandRequest.create(cmd))
+
     def _send_and_receive(self, msg, timeout):
         return self._client.send_and_receive(msg, timeout)
 
@@ -21,6 +21,12 @@ class RawPythonShell(PythonShellBase):
         "'endofsetup'"]
     teardown_cmd = 'termios.tcsetattr(_fdin, termios.TCSADRAIN, _orig_inattrs)'
 
+    # echo off and raw mode setup in a single command
+    single_setup_cmd = '; '.join(setup_cmds[:-1])
+    # the output of the ready command differs from its echo
+    _ready_cmd = "'launch' + 'ready'"
+    _ready_out = "'launchready'"
+
     def __init__(self, start_cmd='python -u'):
         super(RawPythonShell, self).__init__(start_cmd)
         self._orig_delaybeforesend = None
@@ -33,9 +39,23 @@ class RawPythonShell(PythonShellBase):
     def start(self):
         super(RawPythonShell, self).start()
         self._terminal.setwinsize(400, 400)
+        self._setup_raw()
+        self._setup_delaybeforesend()
+
+    def _setup_raw(self):
         self._setup_echo_off_and_raw()
         self._verify_setup()
-        self._setup_delaybeforesend()
+
+    def _setup_raw_in_single_cmd(self):
+        """Setup echo off and raw mode with :attr:`.single_setup_cmd`. The
+        echo of the command is skipped by waiting for the output of the ready
+        command sent right after the setup command.
+        """
+        self._sendline(self.single_setup_cmd)
+        self._sendline(self._ready_cmd)
+        self.set_tty_echo(False)
+        self._read_until(self._ready_out, self.short_timeout)
+        self._read_until_prompt(timeout=self.short_timeout)
 
     def _verify_setup(self):
         out = self._read_until_prompt_after_last_command()
@@ -0,0 +1,139 @@
+"""Cache of the bootstrap scripts in the remote end. The scripts are stored
+in the per-user cache directory keyed by the SHA-256 digest of the content
+so that the same script is sent to the remote end only once.
+
+The cache directory is *crl-interactivesessions-<uid>* either in
+*$XDG_RUNTIME_DIR* or in the temporary directory. The cache is not used if
+the directory is not owned by the user or if it is accessible by the other
+users. At most *KEEP_VERSIONS* most recently used versions of each script
+are kept so that the peers using different versions of the scripts do not
+evict each other from the cache.
+"""
+import os
+import stat
+import hashlib
+import tempfile
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+CACHE_DIR_MODE = 0o700
+KEEP_VERSIONS = 4
+
+
+def get_cache_dir():
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    base = (runtime_dir
+            if runtime_dir and os.path.isdir(runtime_dir) else
+            tempfile.gettempdir())
+    return os.path.join(base, 'crl-interactivesessions-{}'.format(os.getuid()))
+
+
+def get_digest(content):
+    return hashlib.sha256(_to_bytes(content)).hexdigest()
+
+
+def load(name, digest, namespace):
+    """Execute the cached script *name* in *namespace* if the content of the
+    script matches *digest*. The modification time of the executed script
+    is updated for tracking the most recently used versions.
+
+    Returns:
+        *True* if the script was executed, otherwise *False*.
+    """
+    cache_dir = _get_safe_cache_dir()
+    if cache_dir is None:
+        return False
+    path = _get_path(cache_dir, name, digest)
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except (IOError, OSError):
+        return False
+    if get_digest(content) != digest:
+        return False
+    _touch(path)
+    _exec(name, content.decode('utf-8'), namespace)
+    return True
+
+
+def _touch(path):
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def store_and_exec(name, content, namespace):
+    """Store script *name* to the cache and execute it in *namespace*. The
+    least recently used versions of the script exceeding *KEEP_VERSIONS* are
+    removed from the cache. The execution
+    is not affected by the failures of the storing.
+    """
+    try:
+        _store(name, content)
+    except (IOError, OSError):
+        pass
+    _exec(name, content, namespace)
+
+
+def _store(name, content):
+    cache_dir = _get_safe_cache_dir(create=True)
+    if cache_dir is None:
+        return
+    fd, tmppath = tempfile.mkstemp(dir=cache_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_to_bytes(content))
+        os.rename(tmppath, _get_path(cache_dir, name, get_digest(content)))
+    except Exception:
+        os.remove(tmppath)
+        raise
+    _remove_old_versions(cache_dir, name, get_digest(content))
+
+
+def _remove_old_versions(cache_dir, name, digest):
+    current = os.path.basename(_get_path(cache_dir, name, digest))
+    versions = []
+    for filename in os.listdir(cache_dir):
+        if filename.startswith(name + '-') and filename != current:
+            try:
+                versions.append((os.stat(os.path.join(cache_dir, filename)).st_mtime,
+                                 filename))
+            except OSError:
+                pass
+    for _, filename in sorted(versions, reverse=True)[KEEP_VERSIONS - 1:]:
+        try:
+            os.remove(os.path.join(cache_dir, filename))
+        except OSError:
+            pass
+
+
+def _get_safe_cache_dir(create=False):
+    cache_dir = get_cache_dir()
+    if create and not os.path.isdir(cache_dir):
+        try:
+            os.mkdir(cache_dir, CACHE_DIR_MODE)
+        except OSError:
+            pass
+    try:
+        st = os.lstat(cache_dir)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        return None
+    return None if st.st_mode & (stat.S_IRWXG | stat.S_IRWXO) else cache_dir
+
+
+def _get_path(cache_dir, name, digest):
+    return os.path.join(cache_dir, '{name}-{digest}.py'.format(name=name,
+                                                               digest=digest))
+
+
+def _exec(name, content, namespace):
+    # pylint: disable=exec-used
+    exec(compile(content, name, 'exec'), namespace)
+
+
+def _to_bytes(s):
+    return s if isinstance(s, bytes) else s.encode('utf-8')
@@ -35,6 +35,7 @@ class CommandHandlerBase(MsgHandlerBase):
         raise NotImplementedError()
 
     def _exec_cmdrequest(self, commandrequest):
+        self._pythoncmdline.set_blobs(commandrequest.blobs)
         return self._pythoncmdline.exec_command(commandrequest.cmd)
 
     def set_pythoncmdline(self, pythoncmdline):
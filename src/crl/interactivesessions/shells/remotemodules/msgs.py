@@ -157,11 +157,51 @@ class CommandMsgBase(MsgBase):
     def cmd(self):
         return compatibility.to_string(self._arg)
 
+    @property
+    def blobs(self):
+        return ()
+
 
 class ExecCommandRequest(CommandMsgBase):
     pass
 
 
+class CommandBlobs(Serializable):
+    """Command *cmd* and binary blobs *blobs* which are available for the
+    command in the remote end without embedding them into the command.
+    """
+    def __init__(self, cmd, blobs):
+        self.cmd = cmd
+        self.blobs = blobs
+
+    def __str__(self):
+        return '{cmd!r} with blob sizes {sizes}'.format(
+            cmd=self.cmd, sizes=[len(blob) for blob in self.blobs])
+
+    def serialize(self):
+        # pylint: disable=protected-access
+        cmd = MsgBase._serialize_string_or_bytes(self.cmd)
+        return b','.join([cmd] + [base64.b64encode(blob) for blob in self.blobs])
+
+
+class ExecCommandBlobsRequest(ExecCommandRequest):
+
+    @property
+    def cmd(self):
+        return compatibility.to_string(self._arg.cmd)
+
+    @property
+    def blobs(self):
+        return self._arg.blobs
+
+    @classmethod
+    def deserialize_arg(cls, serialized_arg):
+        parts = serialized_arg.split(b',')
+        return CommandBlobs(
+            super(ExecCommandBlobsRequest, cls).deserialize_arg(parts[0]),
+            [base64.b64decode(part) for part in parts[1:]])
+
+
 class ExecCommandReply(MsgBase):
 
     @property
@@ -278,4 +318,5 @@ def set_msgclses():
                          ServerIdRequest,
                          ServerIdReply,
                          SendCommandRequest,
-                         Ack)
+                         Ack,
+                         ExecCommandBlobsRequest)
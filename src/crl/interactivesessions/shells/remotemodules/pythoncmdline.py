@@ -1,5 +1,6 @@
 __copyright__ = 'Copyright (C) 2019, Nokia'
 import logging
+from collections import OrderedDict
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,7 +30,11 @@ class PythonCmdline(object):
     >>> p.exec_command('b = 2; b')
     >>> p.exec_command('b')
     2
+
+    The binary blobs set by *set_blobs* are available for the next command
+    in the list *_blobs*.
     """
+    blobs_name = '_blobs'
 
     def __init__(self):
         self._multilinecmd = ''
@@ -44,6 +49,9 @@ class PythonCmdline(object):
     def namespace(self):
         return self._namespace
 
+    def set_blobs(self, blobs):
+        self._namespace[self.blobs_name] = blobs
+
     def exec_command(self, cmd):
         try:
             self._current_cmd = self._multilinecmd + cmd
@@ -65,7 +73,39 @@ class PythonCmdline(object):
         return eval(code_obj, self._namespace)
 
 
+class CodeCache(object):
+    """Least recently used cache of at most *maxsize* code objects keyed
+    by the source and the compilation mode. Sources which cannot be compiled
+    are not cached.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._codes = OrderedDict()
+
+    def get_code_object(self, cmd, mode='exec'):
+        key = (cmd, mode)
+        try:
+            code_obj = self._codes.pop(key)
+        except KeyError:
+            code_obj = _compile(cmd, mode)
+            if len(self._codes) >= self.maxsize:
+                self._codes.popitem(last=False)
+        self._codes[key] = code_obj
+        return code_obj
+
+    def __len__(self):
+        return len(self._codes)
+
+
+_CODE_CACHE = CodeCache()
+
+
 def get_code_object(cmd, mode='exec'):
+    return _CODE_CACHE.get_code_object(cmd, mode)
+
+
+def _compile(cmd, mode):
     try:
         return compile(cmd, '', 'eval')
     except SyntaxError:
@@ -129,6 +129,8 @@ class PythonServer(ServerBase):
         self._handler_maps += [
             HandlerMap(requestcls=msgs.ExecCommandRequest,
                        handler_factory=self._execcmdhandler_factory),
+            HandlerMap(requestcls=msgs.ExecCommandBlobsRequest,
+                       handler_factory=self._execcmdhandler_factory),
             HandlerMap(requestcls=msgs.SendCommandRequest,
                        handler_factory=self._sendcmdhandler_factory)]
 
@@ -4,14 +4,25 @@ import base64
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
 
+# The remote Python version is not known before the bootstrap so the
+# highest protocol supported by both Python 2 and Python 3 is used.
+BOOTSTRAP_PROTOCOL = 2
+
 
 def serialize_from_file(path):
     return serialize(_read_content(path))
 
 
+def serialize_literal_from_file(path):
+    """Serialize content of *path* as a string literal. The literal is
+    suitable only for the commands which are sent in the compressed form.
+    """
+    return repr(_read_content(path))
+
+
 def serialize(s):
     return "pickle.loads(base64.b64decode({!r}))".format(
-        base64.b64encode(pickle.dumps(s, protocol=0)))
+        base64.b64encode(pickle.dumps(s, protocol=BOOTSTRAP_PROTOCOL)))
 
 
 def _read_content(path):
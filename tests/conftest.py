@@ -35,6 +35,19 @@ def pytest_configure(config):  # pylint: disable=unused-argument
     logging.getLogger('flake8').setLevel(logging.WARN)
 
 
+@pytest.fixture(scope='session', autouse=True)
+def bootstrap_cache_runtime_dir(tmpdir_factory):
+    orig = os.environ.get('XDG_RUNTIME_DIR')
+    os.environ['XDG_RUNTIME_DIR'] = str(tmpdir_factory.mktemp('runtime'))
+    try:
+        yield None
+    finally:
+        if orig is None:
+            del os.environ['XDG_RUNTIME_DIR']
+        else:
+            os.environ['XDG_RUNTIME_DIR'] = orig
+
+
 @pytest.fixture(autouse=True)
 def logging_verifier(intcaplog, request):
     def verify_logging():
@@ -36,7 +36,9 @@ class GarbageVerifier(object):
         """Trigger garbage cleaning in case garbage length is already maximum.
         """
         self._proxy_factory(self._runnerterminal)
-        self._runnerterminal.run('None')
+        assert self._runnerterminal.pending_garbage > self._runnerterminal.MAX_GARBAGE
+        self._runnerterminal.run_python('None')
+        assert not self._runnerterminal.pending_garbage
         self.assert_all_proxies_cleaned(handles)
 
     def _assert_all_proxies_exists(self, handles):
@@ -42,8 +42,9 @@ class MockPythonSession(object):
     def __getattr__(self, name):
         return getattr(self.mock_interactivesessionexecutor, name)
 
-    def mock_run_cmdline(self, cmd, **kwargs):  # pylint: disable=unused-argument
+    def mock_run_cmdline(self, cmd, **kwargs):
         LOGGER.debug('MockPythonSession running cmd: %s', cmd)
+        self.namespace['_blobs'] = kwargs.get('blobs', ())
 
         try:
             code_obj = get_code_object(self.multilinecmd + cmd, mode='single')
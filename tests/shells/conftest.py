@@ -74,6 +74,16 @@ def msgpythonshell(normal_pythonterminal):
         yield m
 
 
+@pytest.fixture
+def compressed_msgpythonshell(normal_pythonterminal):
+    MsgPythonShell.set_compressed_launch(True)
+    try:
+        with msgpythonshell_context(normal_pythonterminal) as m:
+            yield m
+    finally:
+        MsgPythonShell.set_compressed_launch(False)
+
+
 @pytest.fixture
 def shortretry_msgpythonshell(retry_shellcontext):
     with retry_shellcontext(Retry(tries=20, interval=0.4, timeout=0.5)) as s:
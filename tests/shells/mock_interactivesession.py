@@ -28,9 +28,10 @@ class PythonShellEmulator(object):
     def __getattr__(self, name):
         return getattr(self.mock_pythonshell_attrs, name)
 
-    def exec_command(self, cmd, timeout=-1):
+    def exec_command(self, cmd, timeout=-1, blobs=()):
         logger.debug('PythonShellEmulator running cmd: %s, timeout=%s',
                      cmd, timeout)
+        self._pythoncmdline.set_blobs(blobs)
         ret = self._pythoncmdline.exec_command(cmd)
         logger.debug("PythonShellEmulator response: %s, type=%s", ret, type(ret))
         return ret
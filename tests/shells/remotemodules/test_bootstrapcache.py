@@ -0,0 +1,74 @@
+import os
+import pytest
+from crl.interactivesessions.shells.remotemodules import bootstrapcache
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+@pytest.fixture
+def runtime_dir(tmpdir, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmpdir))
+    return tmpdir
+
+
+def store_and_load(content):
+    stored = {}
+    bootstrapcache.store_and_exec('script', content, stored)
+    loaded = {}
+    is_loaded = bootstrapcache.load('script',
+                                    bootstrapcache.get_digest(content),
+                                    loaded)
+    return is_loaded, stored, loaded
+
+
+def test_store_and_load(runtime_dir):
+    is_loaded, stored, loaded = store_and_load('a = 1')
+
+    assert is_loaded
+    assert stored['a'] == loaded['a'] == 1
+    assert os.stat(bootstrapcache.get_cache_dir()).st_mode & 0o777 == 0o700
+
+
+def test_load_not_cached(runtime_dir):
+    assert not bootstrapcache.load('script', bootstrapcache.get_digest('a = 1'), {})
+
+
+def set_mtime(content, mtime):
+    os.utime(os.path.join(bootstrapcache.get_cache_dir(),
+                          'script-{}.py'.format(bootstrapcache.get_digest(content))),
+             (mtime, mtime))
+
+
+def test_store_removes_least_recently_used_versions(runtime_dir):
+    contents = ['a = {}'.format(i) for i in range(bootstrapcache.KEEP_VERSIONS + 1)]
+    for mtime, content in enumerate(contents[:-1], start=1):
+        store_and_load(content)
+        set_mtime(content, mtime)
+    assert bootstrapcache.load('script', bootstrapcache.get_digest(contents[0]), {})
+
+    store_and_load(contents[-1])
+
+    assert sorted(os.listdir(bootstrapcache.get_cache_dir())) == sorted(
+        'script-{}.py'.format(bootstrapcache.get_digest(c))
+        for c in [contents[0]] + contents[2:])
+
+
+def test_load_modified(runtime_dir):
+    digest = bootstrapcache.get_digest('a = 1')
+    bootstrapcache.store_and_exec('script', 'a = 1', {})
+    with open(os.path.join(bootstrapcache.get_cache_dir(),
+                           'script-{}.py'.format(digest)), 'w') as f:
+        f.write('a = 2')
+
+    assert not bootstrapcache.load('script', digest, {})
+
+
+def test_not_cached_if_accessible_by_others(runtime_dir):
+    os.mkdir(bootstrapcache.get_cache_dir(), 0o755)
+    os.chmod(bootstrapcache.get_cache_dir(), 0o755)
+    is_loaded, stored, _ = store_and_load('a = 1')
+
+    assert not is_loaded
+    assert stored['a'] == 1
+    assert not os.listdir(bootstrapcache.get_cache_dir())
@@ -1,4 +1,9 @@
-from crl.interactivesessions.shells.remotemodules.msgs import MsgBase
+import pytest
+from crl.interactivesessions.shells.remotemodules.msgs import (
+    MsgBase,
+    ExecCommandBlobsRequest,
+    CommandBlobs,
+    set_msgclses)
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -32,3 +37,15 @@ def test_custommsg():
     assert m.uid == cmsgs[0].uid
     assert m.msgid == cmsgs[0].msgid
     assert m.custom == cmsgs[0].custom
+
+
+@pytest.mark.parametrize('blobs', [[b'\x00blob', b''], [b''], []])
+def test_execcommandblobsrequest(blobs):
+    set_msgclses()
+    msg = ExecCommandBlobsRequest.create(CommandBlobs('cmd', blobs))
+
+    m = MsgBase.deserialize(msg.serialize())
+
+    assert isinstance(m, ExecCommandBlobsRequest)
+    assert m.cmd == 'cmd'
+    assert m.blobs == blobs
@@ -1,4 +1,7 @@
-from crl.interactivesessions.shells.remotemodules.pythoncmdline import PythonCmdline
+import pytest
+from crl.interactivesessions.shells.remotemodules.pythoncmdline import (
+    PythonCmdline,
+    CodeCache)
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -20,3 +23,23 @@ def test_pythoncmdline_function():
 def test_pythoncmdline_none():
     p = PythonCmdline()
     assert p.exec_command('None') is None
+
+
+def test_codecache_lru():
+    c = CodeCache(maxsize=2)
+    a = c.get_code_object('a')
+    c.get_code_object('b')
+    assert c.get_code_object('a') is a
+    c.get_code_object('c')
+
+    assert len(c) == 2
+    assert c.get_code_object('a') is a
+    assert c.get_code_object('b', mode='single') is not c.get_code_object('b')
+
+
+def test_codecache_syntaxerror_not_cached():
+    c = CodeCache()
+    with pytest.raises(SyntaxError):
+        c.get_code_object('def f():')
+
+    assert not c
@@ -1,4 +1,7 @@
-from crl.interactivesessions.shells.modules import MainModule
+from crl.interactivesessions.shells.modules import (
+    MainModule,
+    CachedMainModule,
+    CompressedMainModule)
 from crl.interactivesessions.shells.remotemodules.pythoncmdline import (
     PythonCmdline)
 
@@ -27,3 +30,30 @@ def test_module_descendants():
         p.exec_command(cmd)
     assert p.exec_command("{mod}.call_descendants()".format(
         mod=main.module_var)) == mainexample.call_descendants()
+
+
+def test_cachedmainmodule(tmpdir, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmpdir))
+    main = CachedMainModule(mainexample)
+    loaded = []
+    for _ in range(2):
+        p = PythonCmdline()
+        for cmd in main.cache_cmds_gen():
+            p.exec_command(cmd)
+        loaded.append(p.exec_command(main.load_cmd))
+        if not loaded[-1]:
+            for cmd in main.store_cmds_gen():
+                p.exec_command(cmd)
+        assert p.exec_command("{mod}.call_descendants()".format(
+            mod=main.module_var)) == mainexample.call_descendants()
+
+    assert loaded == [False, True]
+
+
+def test_compressedmainmodule():
+    main = CompressedMainModule(mainexample)
+    p = PythonCmdline()
+    p.exec_command(main.get_cmd('_ret = {mod}.call_descendants()'.format(
+        mod=main.module_var)))
+
+    assert p.exec_command('_ret') == mainexample.call_descendants()
@@ -29,6 +29,18 @@ def test_exec_command_success(msgpythonshell):
     assert msgpythonshell.exec_command('a', timeout=1) == '1'
 
 
+def test_exec_command_compressed_launch(compressed_msgpythonshell):
+    compressed_msgpythonshell.exec_command('a=1', timeout=1)
+    assert compressed_msgpythonshell.exec_command('a', timeout=1) == '1'
+
+
+def test_exec_command_blobs(msgpythonshell):
+    blobs = [b'\x00blob', b'']
+    assert msgpythonshell.exec_command('_blobs[0] + _blobs[1]', timeout=1,
+                                       blobs=blobs) == b'\x00blob'
+    assert msgpythonshell.exec_command('_blobs', timeout=1) == '()'
+
+
 def test_exec_command_fails(msgpythonshell):
     out = msgpythonshell.exec_command('syntax error', timeout=1)
     assert 'Traceback' in out
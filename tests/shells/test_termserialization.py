@@ -1,9 +1,10 @@
 import os
 import pickle  # pylint: disable=unused-import; # noqa: F401
-import base64  # pylint: disable=unused-import; # noqa: F401
+import base64
 import pytest
 from crl.interactivesessions.shells.termserialization import (
     serialize_from_file,
+    serialize_literal_from_file,
     serialize)
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -24,5 +25,17 @@ def test_serialize_from_file(tmpfile_factory):
     assert eval(serialize_from_file(tmpfile_factory(content))) == content
 
 
+def test_serialize_literal_from_file(tmpfile_factory):
+    content = "'content'\n"
+    assert eval(serialize_literal_from_file(tmpfile_factory(content))) == content
+
+
 def test_serialize():
     assert eval(serialize('c')) == 'c'
+
+
+def test_serialize_protocol():
+    serialized = serialize('c')
+    pickled = base64.b64decode(
+        serialized[serialized.index("'") + 1:serialized.rindex("'")])
+    assert pickled[:2] == b'\x80\x02'
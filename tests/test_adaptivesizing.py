@@ -0,0 +1,76 @@
+import pytest
+import mock
+from crl.interactivesessions._adaptivesizing import _AdaptiveSizing
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+@pytest.fixture
+def mock_monotonic():
+    with mock.patch('crl.interactivesessions._adaptivesizing.monotonic',
+                    return_value=0) as p:
+        yield p
+
+
+class MockPool(object):
+    def __init__(self, size, peak, maxsize=10):
+        self.size = size
+        self.peak = peak
+        self.maxsize = maxsize
+        self.removed = 0
+
+    def get_peak_demand(self, window):
+        return self.peak
+
+    def remove_n_free(self, n):
+        self.size -= n
+        self.removed += n
+        return n
+
+
+@pytest.mark.parametrize('peak, headroom, maxsize, expected', [
+    (0, 1.25, 10, 0),
+    (1, 1.25, 10, 2),
+    (4, 1.25, 10, 5),
+    (4, 1, 10, 4),
+    (9, 1.5, 10, 10)])
+def test_get_warm_size(peak, headroom, maxsize, expected):
+    s = _AdaptiveSizing(window=10, headroom=headroom)
+
+    assert s.get_warm_size(MockPool(size=0, peak=peak, maxsize=maxsize)) == expected
+
+
+@pytest.mark.parametrize('size, peak, expected_removed', [
+    (5, 4, 0),
+    (8, 4, 3),
+    (3, 0, 3)])
+def test_trim(size, peak, expected_removed):
+    pool = MockPool(size=size, peak=peak)
+
+    assert _AdaptiveSizing(window=10, headroom=1.25).trim(pool) == expected_removed
+    assert pool.removed == expected_removed
+
+
+@pytest.mark.parametrize('size, peak, maxsize, expected_count', [
+    (0, 4, 10, 5),
+    (2, 4, 10, 3),
+    (6, 4, 10, 0),
+    (0, 8, 6, 6)])
+def test_get_prewarm_count(size, peak, maxsize, expected_count):
+    pool = MockPool(size=size, peak=peak, maxsize=maxsize)
+
+    assert _AdaptiveSizing(window=10,
+                           headroom=1.25).get_prewarm_count(pool) == expected_count
+
+
+def test_trim_all_if_due(mock_monotonic):
+    s = _AdaptiveSizing(window=10, headroom=1)
+    pools = [MockPool(size=2, peak=0), MockPool(size=3, peak=1)]
+    mock_monotonic.return_value = 0.5
+    s.trim_all_if_due(pools)
+    assert [p.removed for p in pools] == [0, 0]
+
+    mock_monotonic.return_value = 1
+    s.trim_all_if_due(pools)
+    assert [p.removed for p in pools] == [2, 2]
@@ -1,5 +1,6 @@
 # pylint: disable=unused-argument
 import logging
+from contextlib import contextmanager
 import pytest
 import mock
 from fixtureresources.fixtures import create_patch
@@ -248,3 +249,34 @@ def test_finalize_raises(mock_interactivesession,
     assert 'Failed to finalize the terminal: message' in intcaplog.text
     mock_close_terminal = mock_interactivesession.return_value.close_terminal
     mock_close_terminal.assert_called_once_with()
+
+
+def test_initialized(mock_interactivesession, mock_shell):
+    initialized = mock.Mock()
+    terminal = AutoRecoveringTerminal()
+    terminal.initialize(shells=mock_shell)
+    terminal.set_initialized(initialized)
+    terminal.initialize_terminal()
+
+    elapsed = initialized.call_args[0][0]
+    assert elapsed >= 0
+
+
+def test_spawn_context(mock_interactivesession, mock_shell):
+    calls = []
+
+    @contextmanager
+    def spawn_context():
+        calls.append('enter')
+        yield None
+        calls.append('exit')
+
+    session = mock_interactivesession.return_value
+    session.spawn.side_effect = lambda *args: calls.append('spawn')
+    terminal = AutoRecoveringTerminal()
+    terminal.initialize(shells=mock_shell,
+                        prepare=lambda: calls.append('prepare'))
+    terminal.set_spawn_context(spawn_context)
+    terminal.initialize_terminal()
+
+    assert calls == ['enter', 'spawn', 'exit', 'prepare']
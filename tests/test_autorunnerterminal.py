@@ -1,4 +1,6 @@
+import os
 from collections import namedtuple
+from contextlib import contextmanager
 import logging
 import mock
 import pytest
@@ -11,7 +13,9 @@ from crl.interactivesessions.runnerexceptions import (
     RunnerTerminalSessionClosed,
     InvalidProxySession,
     RunnerTerminalSessionBroken)
-from .shells.mock_interactivesession import break_session
+from .shells.mock_interactivesession import (
+    ExampleShell,
+    break_session)
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -87,6 +91,93 @@ def test_error_handling_session_broken(mock_session,
     mock_session.auto_close.assert_called_once_with()
 
 
+@pytest.fixture
+def mock_monotonic():
+    with mock.patch('crl.interactivesessions.autorunnerterminal.monotonic',
+                    return_value=0) as p:
+        yield p
+
+
+@pytest.mark.parametrize('elapsed,expected_verified', [
+    (0.5, False), (1, True), (2, True)])
+def test_verify_freshness(mock_session,
+                          mock_get_response_or_raise,
+                          mock_monotonic,
+                          elapsed,
+                          expected_verified):
+    terminal = AutoRunnerTerminal()
+    terminal.initialize(session=mock_session)
+    terminal._verify_proxy = mock.Mock()  # pylint: disable=protected-access
+    terminal.set_verification_freshness(1)
+    terminal.run_python('cmd')
+    mock_monotonic.return_value = elapsed
+
+    terminal._verify()  # pylint: disable=protected-access
+
+    assert terminal._verify_proxy.as_local_value.called == expected_verified
+
+
+def test_verify_skipped_by_default(mock_session,
+                                   mock_get_response_or_raise,
+                                   mock_monotonic):
+    terminal = AutoRunnerTerminal()
+    terminal.initialize(session=mock_session)
+    terminal._verify_proxy = mock.Mock()  # pylint: disable=protected-access
+    terminal.run_python('cmd')
+
+    terminal._verify()  # pylint: disable=protected-access
+
+    assert not terminal._verify_proxy.as_local_value.called
+
+
+@pytest.mark.parametrize('elapsed,expected_calls', [(0.5, 2), (2, 1)])
+def test_call_initialized_retries_only_unverified(mock_session,
+                                                  mock_get_response_or_raise,
+                                                  mock_monotonic,
+                                                  elapsed,
+                                                  expected_calls):
+    terminal = AutoRunnerTerminal()
+    terminal.initialize(session=mock_session)
+    terminal.run_python('cmd')
+    mock_monotonic.return_value = elapsed
+    function = mock.Mock(side_effect=[RunnerTerminalSessionBroken, 'ret'])
+
+    if expected_calls == 1:
+        with pytest.raises(RunnerTerminalSessionBroken):
+            terminal.call_initialized(function, 'arg', kwarg='kwarg')
+    else:
+        assert terminal.call_initialized(function, 'arg', kwarg='kwarg') == 'ret'
+
+    assert function.mock_calls == [mock.call('arg', kwarg='kwarg')] * expected_calls
+    assert mock_session.initialize_if_needed.call_count == expected_calls
+
+
+def test_verify_without_exchange(mock_session):
+    terminal = AutoRunnerTerminal()
+    terminal.initialize(session=mock_session)
+    terminal._verify_proxy = mock.Mock()  # pylint: disable=protected-access
+
+    terminal._verify()  # pylint: disable=protected-access
+
+    terminal._verify_proxy.as_local_value.assert_called_once_with()
+
+
+def test_map_initializes_fresh_terminal(mock_session):
+    terminal = AutoRunnerTerminal()
+    terminal.initialize(session=mock_session)
+    calls = mock.Mock()
+    calls.attach_mock(mock_session.initialize_if_needed, 'initialize_if_needed')
+    with mock.patch.object(AutoRunnerTerminal, '_run_batch') as mock_run_batch:
+        calls.attach_mock(mock_run_batch, 'run_batch')
+        mock_run_batch.side_effect = RunnerTerminalSessionBroken
+
+        with pytest.raises(RunnerTerminalSessionBroken):
+            terminal.map('str', [1])
+
+    assert [name for name, _, _ in calls.mock_calls] == [
+        'initialize_if_needed', 'run_batch']
+
+
 def test_error_handling_closed_session(mock_session):
     terminal = AutoRunnerTerminal()
     terminal.initialize(session=mock_session)
@@ -175,3 +266,83 @@ def test_autorecovery_recursive(mock_interactivesession, autorunnerterminal):
     with pytest.raises(InvalidProxySession):
         # pylint: disable=pointless-statement
         a.a
+
+
+def test_autorecovery_broken_inside_freshness(mock_interactivesession,
+                                              autorunnerterminal):
+    autorunnerterminal.set_verification_freshness(60)
+    p = SimpleProxyContainer(autorunnerterminal)
+    autorunnerterminal.initialize_with_shells(shells=ExampleShell(),
+                                              prepare=p.prepare)
+
+    assert p.proxy.as_local_value() == '0'
+    break_session(mock_interactivesession)
+
+    assert p.proxy.as_local_value() == '0'
+
+
+@pytest.fixture
+def fresh_autorunnerterminal(mock_interactivesession, autorunnerterminal):
+    autorunnerterminal.initialize_with_shells(shells=ExampleShell())
+    autorunnerterminal.initialize_if_needed()
+    autorunnerterminal.import_libraries('os')
+    return autorunnerterminal
+
+
+@contextmanager
+def counting_runs(terminal):
+    with mock.patch.object(terminal, 'run', wraps=terminal.run) as mock_run:
+        yield mock_run
+
+
+@pytest.mark.parametrize('freshness, expected_runs', [(1, 1), (0, 2)])
+def test_lazy_proxy_chain_single_request(fresh_autorunnerterminal,
+                                         freshness,
+                                         expected_runs):
+    fresh_autorunnerterminal.set_verification_freshness(freshness)
+    with counting_runs(fresh_autorunnerterminal) as mock_run:
+        joined = fresh_autorunnerterminal.get_lazy_proxy('os').path.join('a', 'b')
+
+    assert joined == os.path.join('a', 'b')
+    assert mock_run.call_count == expected_runs
+
+
+@pytest.mark.parametrize('freshness, expected_runs', [(1, 1), (0, 2)])
+def test_lazy_proxy_item_chain_single_request(fresh_autorunnerterminal,
+                                              freshness,
+                                              expected_runs):
+    fresh_autorunnerterminal.set_verification_freshness(freshness)
+    with counting_runs(fresh_autorunnerterminal) as mock_run:
+        lazypath = fresh_autorunnerterminal.get_lazy_proxy('os').environ['PATH']
+        path = lazypath.as_local_value()
+
+    assert path == os.environ['PATH']
+    assert mock_run.call_count == expected_runs
+
+
+@pytest.mark.parametrize('freshness, expected_runs', [(1, 1), (0, 2)])
+def test_get_local_values_single_request(fresh_autorunnerterminal,
+                                         freshness,
+                                         expected_runs):
+    proxies = [fresh_autorunnerterminal.get_proxy_object(repr(i), None)
+               for i in range(5)]
+    fresh_autorunnerterminal.set_verification_freshness(freshness)
+    with counting_runs(fresh_autorunnerterminal) as mock_run:
+        values = fresh_autorunnerterminal.get_local_values(proxies)
+
+    assert values == list(range(5))
+    assert mock_run.call_count == expected_runs
+
+
+@pytest.mark.parametrize('freshness, expected_runs', [(1, 1), (0, 2)])
+def test_batch_single_request(fresh_autorunnerterminal, freshness, expected_runs):
+    proxy = fresh_autorunnerterminal.get_recursive_proxy('os.path')
+    assert proxy.join('a', 'b') == os.path.join('a', 'b')
+    fresh_autorunnerterminal.set_verification_freshness(freshness)
+    with counting_runs(fresh_autorunnerterminal) as mock_run:
+        with fresh_autorunnerterminal.batch():
+            futures = [proxy.join('a', str(i)) for i in range(5)]
+
+    assert [f.result() for f in futures] == [os.path.join('a', str(i))
+                                             for i in range(5)]
+    assert mock_run.call_count == expected_runs
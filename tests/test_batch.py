@@ -0,0 +1,52 @@
+import pytest
+from crl.interactivesessions._batch import _Batch
+from crl.interactivesessions.runnerterminal import _PythonCall
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+@pytest.fixture
+def batch():
+    return _Batch()
+
+
+def test_batch_calls(batch):
+    batch.add(_PythonCall(code='f()', params=[]))
+    batch.add(_PythonCall(code='g(p[0])', params=[1]), handle='h')
+
+    assert [tuple(c) for c in batch.calls] == [(None, 'f()', ()),
+                                               ('h', 'g(p[0])', (1,))]
+
+
+def test_future_response_wraps(batch):
+    future = batch.add(_PythonCall(code='f()', params=[]))
+    future.add_response_wrap(lambda r: r + 1).add_response_wrap(lambda r: 2 * r)
+
+    assert not future.done()
+    future.set_response(1)
+
+    assert future.done()
+    assert future.result() == 4
+    assert future.exception() is None
+
+
+def test_future_not_done(batch):
+    future = batch.add(_PythonCall(code='f()', params=[]))
+
+    with pytest.raises(RuntimeError):
+        future.result()
+
+
+def test_batch_set_exception(batch):
+    futures = [batch.add(_PythonCall(code='f()', params=[])) for _ in range(2)]
+    futures[0].set_response(0)
+    e = Exception('message')
+
+    batch.set_exception(e)
+
+    assert futures[0].result() == 0
+    assert futures[1].exception() is e
+    with pytest.raises(Exception) as excinfo:
+        futures[1].result()
+    assert excinfo.value is e
@@ -1,5 +1,4 @@
 import pytest
-import mock
 from crl.interactivesessions.garbagemanager import GarbageManager
 
 
@@ -11,12 +10,7 @@ def garbage():
 class Garbage(object):
     def __init__(self, max_garbage):
         self._max_garbage = max_garbage
-        self._clean = mock.Mock()
-        self._manager = GarbageManager(clean=self._clean, max_garbage=self._max_garbage)
-
-    @property
-    def clean(self):
-        return self._clean
+        self._manager = GarbageManager(max_garbage=self._max_garbage)
 
     @property
     def max_garbage(self):
@@ -30,24 +24,36 @@ class Garbage(object):
 def test_garbage_manager(garbage):
     for i in range(garbage.max_garbage):
         garbage.manager.add(session_id=1, garbage=i)
-        garbage.manager.clean_if_needed(session_id=1)
-
-    assert not garbage.clean.mock_calls
+        assert not garbage.manager.pop_if_needed(session_id=1)
 
+    popped = []
     for i in range(garbage.max_garbage, 2 * garbage.max_garbage):
         garbage.manager.add(session_id=1, garbage=i)
-        garbage.manager.clean_if_needed(session_id=1)
+        p = garbage.manager.pop_if_needed(session_id=1)
         if i == garbage.max_garbage:
-            _, args, _ = garbage.clean.mock_calls[0]
-            assert list(args[0]) == list(range(garbage.max_garbage + 1))
+            assert list(p) == list(range(garbage.max_garbage + 1))
+        popped.append(p)
 
-    assert garbage.clean.call_count == 1
+    assert len([p for p in popped if p]) == 1
+    assert len(garbage.manager) == garbage.max_garbage - 1
 
 
 def test_garbage_manager_session_id(garbage):
     for i in range(3 * garbage.max_garbage):
         garbage.manager.add(session_id=i, garbage=i)
-        garbage.manager.clean_if_needed(session_id=i)
+        assert not garbage.manager.pop_if_needed(session_id=i)
 
-    assert not garbage.clean.call_count
     assert len(garbage.manager) == 1
+
+
+def test_garbage_manager_restore(garbage):
+    for i in range(garbage.max_garbage + 1):
+        garbage.manager.add(session_id=1, garbage=i)
+    popped = garbage.manager.pop_if_needed(session_id=1)
+    garbage.manager.add(session_id=1, garbage='new')
+
+    garbage.manager.restore(session_id=2, garbage=popped)
+    assert len(garbage.manager) == 1
+
+    garbage.manager.restore(session_id=1, garbage=popped)
+    assert list(garbage.manager.pop_if_needed(session_id=1)) == popped + ['new']
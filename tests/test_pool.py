@@ -275,3 +275,77 @@ def test_pool_shared_items_close(shareditems):
     shareditems.close()
 
     shareditems.assert_empty_after_clear_count_get_shared_remove()
+
+
+def test_pool_statistics(factory):
+    p = _Pool(factory=factory.create)
+    p.set_maxsize(2)
+    items = [p.get(), p.get()]
+    p.put_incr_shared(items[0])
+    p.put(items[1])
+    p.remove_n_free(2)
+    assert p.get() == items[0]
+
+    stats = p.get_statistics()
+    assert stats['misses'] == 2
+    assert stats['hits'] == 1
+    assert stats['evictions'] == 1
+    assert stats['size'] == 1
+    assert stats['inuse'] == 1
+    assert stats['free'] == 0
+    assert stats['shared'] == 1
+    assert stats['maxsize'] == 2
+
+
+def test_pool_shared_states_removed(factory):
+    p = _Pool(factory=factory.create)
+    p.set_maxsize(2)
+    item = p.get()
+    p.put_incr_shared(item)
+    assert p.shared_size == 1
+    p.remove(item)
+    p.decr_shared(item)
+
+    assert p.shared_size == 0
+    assert not p._states  # pylint: disable=protected-access
+
+
+def test_pool_decr_shared_inuse(factory):
+    p = _Pool(factory=factory.create)
+    p.set_maxsize(1)
+    item = p.get()
+    p.put_incr_shared(item)
+    assert p.get() == item
+    p.decr_shared(item)
+    assert p.remove_n_free(1) == 0
+    p.put(item)
+
+    assert p.remove_n_free(1) == 1
+
+
+def test_pool_peak_demand(factory):
+    p = _Pool(factory=factory.create)
+    p.set_maxsize(3)
+    items = [p.get() for _ in range(3)]
+    for item in items:
+        p.put(item)
+    p.put_incr_shared(p.get())
+
+    assert p.get_peak_demand(window=10) == 3
+    assert p.get_peak_demand(window=0) == 1
+
+
+@pytest.mark.parametrize('n, expected_created', [(2, 2), (5, 3), (-1, 0)])
+def test_pool_add_free(factory, n, expected_created):
+    resized = mock.Mock()
+    p = _Pool(factory=factory.create, resized=resized)
+    p.set_maxsize(4)
+    p.get()
+
+    created = p.add_free(n)
+
+    assert len(created) == expected_created
+    assert p.free == set(created)
+    assert p.size == 1 + expected_created
+    assert resized.call_count == 1 + expected_created
+    assert p.remove_n_free(n) == max(0, min(n, expected_created))
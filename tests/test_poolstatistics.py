@@ -0,0 +1,75 @@
+import pytest
+import mock
+from crl.interactivesessions._poolstatistics import (
+    _LatencySamples,
+    _PeakDemand,
+    _PoolStatistics)
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+@pytest.mark.parametrize('samples, expected', [
+    ([], {'p50': None, 'p90': None, 'p99': None, 'max': None}),
+    ([1], {'p50': 1, 'p90': 1, 'p99': 1, 'max': 1}),
+    (list(range(1, 101)), {'p50': 50, 'p90': 90, 'p99': 99, 'max': 100}),
+    ([3, 1, 2], {'p50': 2, 'p90': 3, 'p99': 3, 'max': 3})])
+def test_latencysamples_percentiles(samples, expected):
+    s = _LatencySamples()
+    for sample in samples:
+        s.add(sample)
+
+    assert s.get_percentiles() == expected
+    assert len(s) == len(samples)
+
+
+def test_latencysamples_maxlen():
+    s = _LatencySamples(maxlen=2)
+    for sample in [10, 1, 2]:
+        s.add(sample)
+
+    assert s.get_percentiles()['max'] == 2
+    assert len(s) == 3
+
+
+def test_poolstatistics():
+    s = _PoolStatistics()
+    s.add_hit()
+    s.add_miss()
+    s.add_miss()
+    s.add_evictions(3)
+    s.add_creation(1)
+    s.add_creation(2, is_recovery=True)
+    s.add_checkout_wait(0.5)
+
+    d = s.as_dict()
+    assert d['hits'] == 1
+    assert d['misses'] == 2
+    assert d['evictions'] == 3
+    assert d['creations'] == 2
+    assert d['recoveries'] == 1
+    assert d['creation_latency']['max'] == 2
+    assert d['checkout_wait']['p50'] == 0.5
+
+
+@pytest.fixture
+def mock_monotonic():
+    with mock.patch('crl.interactivesessions._poolstatistics.monotonic',
+                    return_value=0) as p:
+        yield p
+
+
+def test_peakdemand(mock_monotonic):
+    d = _PeakDemand()
+    assert d.get_peak(10) == 0
+    for t, demand in [(0, 3), (1, 1), (5, 2), (6, 1)]:
+        mock_monotonic.return_value = t
+        d.add(demand)
+
+    assert d.get_peak(10) == 3
+    mock_monotonic.return_value = 12
+    assert d.get_peak(10) == 2
+    mock_monotonic.return_value = 16
+    assert d.get_peak(10) == 1
+    mock_monotonic.return_value = 17
+    assert d.get_peak(10) == 0
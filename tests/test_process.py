@@ -12,6 +12,7 @@ def mock_terminalpools():
                     spec_set=True) as p:
         proxies = mock.Mock()
         p.return_value.get.return_value.proxies = proxies
+        p.return_value.get_with_handle.return_value.proxies = proxies
         proxies.daemon_popen.return_value = 'pid'
         yield p
 
@@ -43,11 +44,23 @@ def test_nocommbackgroundprocess_raises(mock_terminalpools):
     assert_terminalpools(mock_terminalpools, mock_process=p)
 
 
-def create_mock_process():
+def test_nocommbackgroundprocess_with_poolhandle(mock_terminalpools):
+    p = create_mock_process(poolhandle='poolhandle')
+
+    assert p.run() == 'pid'
+
+    tpools = mock_terminalpools.return_value
+    tpools.get_with_handle.assert_called_once_with('poolhandle', {})
+    assert not tpools.get.called
+    tpools.put.assert_called_once_with(p.terminal)
+
+
+def create_mock_process(**kwargs):
     return MockNoCommBackgroundProcess('cmd',
                                        executable='executable',
                                        shelldicts=[{'ExampleShell'}],
-                                       properties={})
+                                       properties={},
+                                       **kwargs)
 
 
 def assert_terminalpools(mock_terminalpools, mock_process):
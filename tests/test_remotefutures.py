@@ -0,0 +1,91 @@
+import pytest
+import mock
+from crl.interactivesessions.remotefutures import (
+    RemoteFuture,
+    wait,
+    FIRST_COMPLETED)
+from crl.interactivesessions.runnerexceptions import RemoteTimeout
+from crl.interactivesessions.runnerterminal import (
+    RunnerTerminal,
+    _ResponseOutcome)
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+class MockSession(object):
+    def __init__(self):
+        self.mock = mock.create_autospec(RunnerTerminal, spec_set=True,
+                                         instance=True)
+        self.mock.get_responses.side_effect = self._get_responses
+        self.completed = {}
+
+    def create_future(self, response_id):
+        return RemoteFuture(self.mock, RemoteTimeout(response_id))
+
+    def complete(self, response_id, result=None, exception=None):
+        self.completed[response_id] = _ResponseOutcome(result=result,
+                                                       exception=exception)
+
+    def _get_responses(self, remotetimeouts, timeout, wait_all):
+        # pylint: disable=unused-argument
+        return {r.response_id: self.completed[r.response_id]
+                for r in remotetimeouts if r.response_id in self.completed}
+
+
+@pytest.fixture
+def sessions():
+    return [MockSession() for _ in range(2)]
+
+
+def test_wait_polls_sessions_once(sessions):
+    futures = [s.create_future(i) for i, s in enumerate(sessions)]
+    for i, s in enumerate(sessions):
+        s.complete(i, result=i)
+
+    done, not_done = wait(futures)
+
+    assert done == set(futures) and not not_done
+    assert [f.result() for f in futures] == [0, 1]
+    for s in sessions:
+        assert s.mock.get_responses.call_count == 1
+
+
+def test_wait_first_completed(sessions):
+    futures = [s.create_future(i) for i, s in enumerate(sessions)]
+    e = Exception('message')
+    sessions[1].complete(1, exception=e)
+
+    done, not_done = wait(futures, return_when=FIRST_COMPLETED)
+
+    assert done == set([futures[1]])
+    assert not_done == set([futures[0]])
+    assert futures[1].exception() is e
+
+
+def test_wait_timeout(sessions):
+    futures = [s.create_future(i) for i, s in enumerate(sessions)]
+
+    done, not_done = wait(futures, timeout=0.05, poll_interval=0.01)
+
+    assert not done
+    assert not_done == set(futures)
+
+
+def test_wait_completed_without_polling(sessions):
+    future = RemoteFuture.create_with_result(sessions[0].mock, 'result')
+
+    assert wait([future]).done == set([future])
+    assert not sessions[0].mock.get_responses.called
+
+
+def test_callbacks(sessions):
+    future = sessions[0].create_future(0)
+    callback = mock.Mock(side_effect=Exception('callback failed'))
+    future.add_done_callback(callback)
+
+    future.set_result('result')
+    future.add_done_callback(callback)
+
+    assert callback.mock_calls == [mock.call(future), mock.call(future)]
+    assert future.result() == 'result'
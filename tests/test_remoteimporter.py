@@ -82,3 +82,21 @@ def test_importfile(mock_terminal, filepath, expected_modulename, testdir,
             expected_modulename)
         mock_exec_in_module.assert_called_once_with(
             'content', mock_types_moduletype.return_value)
+
+
+def test_importfile_if_needed(mock_terminal, testdir,
+                              mock_exec_in_module, mock_types_moduletype):
+    with testdir.as_cwd():
+        r = RemoteImporter(mock_terminal, 1)
+        imports = mock_terminal.import_libraries.call_args_list
+        for _ in range(2):
+            r.importfile_if_needed('test.py')
+        assert imports.count(mock.call('test')) == 1
+
+        testdir.join('test.py').write('newcontent')
+        r.importfile_if_needed('test.py')
+        assert imports.count(mock.call('test')) == 2
+
+        r.prepare()
+        r.importfile_if_needed('test.py')
+        assert imports.count(mock.call('test')) == 3
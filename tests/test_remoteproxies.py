@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 from collections import namedtuple
 import pickle
@@ -9,7 +10,11 @@ from crl.interactivesessions.runnerterminal import (
     RunnerTerminal,
     RunnerTerminalSessionBroken,
     RunnerTerminalUnableToDeserialize,
-    RemoteTimeout)
+    RemoteTimeout,
+    RemoteResponseExpired,
+    BatchNotSent)
+from crl.interactivesessions.remoteproxies import _RemoteProxy, _RecursiveProxy
+from crl.interactivesessions.remotefutures import wait, FIRST_COMPLETED
 from crl.interactivesessions.pexpectplatform import is_windows
 from .mockpythonsession import MockPythonSession
 from .garbageverifier import GarbageVerifier
@@ -72,6 +77,69 @@ def test_get_proxy_object_from_call_raises(initialized_terminal):
     assert excinfo.value.args[0] == 'message'
 
 
+def test_protocol_negotiated(initialized_terminal):
+    assert initialized_terminal.protocol == pickle.HIGHEST_PROTOCOL
+    assert initialized_terminal.run(
+        "runnerhandlerns['_RUNNERHANDLER'].protocol") == pickle.HIGHEST_PROTOCOL
+    assert initialized_terminal.run_python('b"\\x00" * 3') == b'\x00' * 3
+
+
+@pytest.mark.parametrize('remote_highest', ['2', b'2', 2])
+def test_protocol_lower_in_remote(session_factory, runnerterminal, remote_highest):
+    session = session_factory()
+    run_cmdline = session.mock_run_cmdline
+
+    def mock_run_cmdline(cmd, **kwargs):
+        if cmd == 'pickle.HIGHEST_PROTOCOL':
+            return remote_highest
+        return run_cmdline(cmd, **kwargs)
+
+    session.set_exec_command_side_effect(mock_run_cmdline)
+    runnerterminal.initialize(session)
+
+    assert runnerterminal.protocol == 2
+    assert runnerterminal.run_python('1') == 1
+
+
+def test_protocol_fallback(session_factory, runnerterminal):
+    session = session_factory()
+    run_cmdline = session.mock_run_cmdline
+
+    def mock_run_cmdline(cmd, **kwargs):
+        if cmd == 'pickle.HIGHEST_PROTOCOL':
+            return 'Traceback'
+        return run_cmdline(cmd, **kwargs)
+
+    session.set_exec_command_side_effect(mock_run_cmdline)
+    runnerterminal.initialize(session)
+
+    assert runnerterminal.protocol == RunnerTerminal.FALLBACK_PROTOCOL
+    assert runnerterminal.run_python('1') == 1
+
+
+def test_call_arguments_as_params(initialized_terminal):
+    codecache_len = "len(runnerhandlerns['_RUNNERHANDLER'].codecache)"
+    assert initialized_terminal.run_python_call('len', 'a') == 1
+    size = initialized_terminal.run(codecache_len)
+
+    assert initialized_terminal.run_python_call('len', 'abc') == 3
+    assert initialized_terminal.run(codecache_len) == size
+
+
+def test_call_arguments_as_blobs(initialized_terminal):
+    content = bytes(bytearray(range(256))) * 100
+    session = initialized_terminal.session
+    cs = session.mock_interactivesession.current_shell.return_value
+    cs.exec_command.reset_mock()
+
+    assert initialized_terminal.run_python_call('len', content) == len(content)
+
+    args, kwargs = cs.exec_command.call_args
+    assert len(args[0]) < 1000
+    assert len(kwargs['blobs']) == 1
+    assert pickle.loads(kwargs['blobs'][0]) == (content,)
+
+
 def test_import_libraries(initialized_terminal):
     initialized_terminal.import_libraries('re')
     reproxy = initialized_terminal.get_proxy_object('re', None)
@@ -127,6 +195,45 @@ def _get_identity_call_proxy(session_factory, runnerterminal):
     return runnerterminal.get_proxy_object('identity_call', None)
 
 
+@pytest.mark.parametrize('get_proxy', [
+    lambda t: t.get_proxy_object('obj', None),
+    lambda t: t.get_recursive_proxy('obj'),
+    lambda t: t.get_lazy_proxy('obj')])
+def test_proxy_without_dict(initialized_terminal, get_proxy):
+    initialized_terminal.session.namespace['obj'] = SpecClass()
+    proxy = get_proxy(initialized_terminal)
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    with pytest.raises(AttributeError):
+        object.__getattribute__(proxy, '__dict__')
+    assert proxy.get_proxy_handle() == 'obj'
+    assert proxy.get_remote_proxy_dict()['_handle'] == 'obj'
+    assert not exec_command.called
+
+
+def test_unset_internal_attribute_not_fetched(initialized_terminal):
+    proxy = initialized_terminal.get_proxy_object('obj', None)
+    object.__delattr__(proxy, '_remote_proxy_type_key')
+
+    with pytest.raises(AttributeError):
+        proxy._remote_proxy_type_key  # pylint: disable=pointless-statement
+
+
+def test_spec_methods_without_request(initialized_terminal):
+    initialized_terminal.session.namespace['obj'] = SpecClass()
+    proxy = initialized_terminal.get_proxy_object('obj', SpecClass)
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    assert callable(proxy.method)
+    assert not exec_command.called
+    assert proxy.method() == 1
+    other = initialized_terminal.get_proxy_object('obj', SpecClass)
+    assert type(other) is type(proxy)
+    assert isinstance(proxy, _RemoteProxy)
+
+
 def test_proxy_call(session_factory, runnerterminal):
     assert _get_identity_call_proxy(session_factory, runnerterminal)(
         'arg', kwarg='kwarg') == (('arg',), {'kwarg': 'kwarg'})
@@ -153,6 +260,116 @@ def test_recursive_proxy_attribute_error(session_factory, runnerterminal):
     assert excinfo.value.args[0] == res
 
 
+class SpecClass(object):
+    value = 1
+
+    def method(self):
+        return self.value
+
+
+def get_exec_command(terminal):
+    session = terminal.session
+    return session.mock_interactivesession.current_shell.return_value.exec_command
+
+
+def test_recursive_proxy_spec_cached(initialized_terminal):
+    initialized_terminal.session.namespace['SpecClass'] = SpecClass
+    proxies = [initialized_terminal.get_recursive_proxy('SpecClass()')
+               for _ in range(2)]
+    assert proxies[0].method() == 1
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    assert proxies[0].method() == 1
+    assert exec_command.call_count == 2
+    assert proxies[1].value == 1
+    assert exec_command.call_count == 4
+
+
+def test_dynamic_spec_cached(initialized_terminal):
+    initialized_terminal.session.namespace['obj'] = SpecClass()
+    proxy = initialized_terminal.get_proxy_object('obj', None)
+    assert proxy.value == 1
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    assert proxy.method() == 1
+    assert exec_command.call_count == 1
+    with pytest.raises(AttributeError):
+        # pylint: disable=pointless-statement
+        proxy.missing
+
+
+def test_invalidate_type_specs(initialized_terminal):
+    initialized_terminal.session.namespace['obj'] = SpecClass()
+    proxy = initialized_terminal.get_recursive_proxy('obj')
+    assert proxy.value == 1
+    initialized_terminal.invalidate_type_specs()
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    assert proxy.value == 1
+    assert exec_command.call_count == 2
+
+
+class LazyClass(object):
+    items = {'a': [1, 2]}
+
+    def __init__(self, value=0):
+        self.value = value
+
+    def create(self, value):
+        return LazyClass(value)
+
+    def add(self, obj):
+        return self.value + obj.value
+
+
+@pytest.fixture
+def lazy_terminal(initialized_terminal):
+    initialized_terminal.session.namespace['obj'] = LazyClass(1)
+    initialized_terminal.session.namespace['LazyClass'] = LazyClass
+    return initialized_terminal
+
+
+def test_lazy_proxy_chain_in_single_request(lazy_terminal):
+    proxy = lazy_terminal.get_lazy_proxy('obj')
+    exec_command = get_exec_command(lazy_terminal)
+    exec_command.reset_mock()
+
+    created = proxy.create(2)
+    assert exec_command.call_count == 1
+    assert created.value.as_local_value() == 2
+    assert proxy.items['a'][1].as_local_value() == 2
+    assert exec_command.call_count == 3
+
+
+def test_lazy_proxy_call_returns_lazy_proxy(lazy_terminal):
+    proxy = lazy_terminal.get_lazy_proxy('obj')
+    created = proxy.create(3)
+
+    assert created.create(4).value.as_local_value() == 4
+    assert proxy.add(created) == 4
+
+
+def test_lazy_proxy_non_literal_key(lazy_terminal):
+    lazy_terminal.session.namespace['d'] = {(1, 2): 'value'}
+    assert lazy_terminal.get_lazy_proxy('d')[(1, 2)] == 'value'
+
+
+def test_lazy_proxy_missing_attribute(lazy_terminal):
+    missing = lazy_terminal.get_lazy_proxy('obj').missing
+
+    with pytest.raises(AttributeError):
+        missing.as_local_value()
+
+
+def test_as_lazy_proxy(lazy_terminal):
+    proxy = lazy_terminal.get_proxy_object_from_call('LazyClass', 5)
+
+    assert proxy.as_lazy_proxy().value.as_local_value() == 5
+
+
 def test_get_recursive_proxy(session_factory, runnerterminal):
     session = session_factory()
     session.namespace['identity_call'] = identity_call
@@ -208,6 +425,285 @@ def test_garbage_cleaning_session_reset(garbageverifier, session_factory):
         garbageverifier.verify_garbage_cleaning(2)
 
 
+def test_handles_compact_and_reused(initialized_terminal):
+    proxies = [get_proxy_object_from_call(initialized_terminal)
+               for _ in range(initialized_terminal.MAX_GARBAGE + 1)]
+    handles = [p.get_proxy_handle() for p in proxies]
+    assert handles[:2] == ['_ph[0]', '_ph[1]']
+
+    del proxies
+    initialized_terminal.run_python('None')
+    new_proxies = [get_proxy_object_from_call(initialized_terminal)
+                   for _ in range(initialized_terminal.MAX_GARBAGE + 1)]
+
+    assert {p.get_proxy_handle() for p in new_proxies} == set(handles)
+
+
+def test_garbage_restored_if_request_fails(initialized_terminal):
+    proxies = [get_proxy_object_from_call(initialized_terminal)
+               for _ in range(initialized_terminal.MAX_GARBAGE + 1)]
+    handles = {p.get_proxy_handle() for p in proxies}
+    del proxies
+    with mock.patch.object(initialized_terminal, '_run_in_session',
+                           side_effect=Exception('message')):
+        with pytest.raises(RunnerTerminalSessionBroken):
+            initialized_terminal.run_python('None')
+
+    assert initialized_terminal.pending_garbage == len(handles)
+    new_proxy = get_proxy_object_from_call(initialized_terminal)
+    assert new_proxy.get_proxy_handle() not in handles
+
+    initialized_terminal.run_python('None')
+
+    assert not initialized_terminal.pending_garbage
+    new_proxies = [get_proxy_object_from_call(initialized_terminal)
+                   for _ in range(len(handles))]
+    assert {p.get_proxy_handle() for p in new_proxies} == handles
+
+
+def test_garbage_piggybacked(initialized_terminal):
+    proxies = [get_proxy_object_from_call(initialized_terminal)
+               for _ in range(initialized_terminal.MAX_GARBAGE + 1)]
+    handles = [p.get_proxy_handle() for p in proxies]
+    del proxies
+    assert initialized_terminal.pending_garbage == len(handles)
+    session = initialized_terminal.session
+    cs = session.mock_interactivesession.current_shell.return_value
+    cs.exec_command.reset_mock()
+
+    assert initialized_terminal.run_python('1') == 1
+
+    assert cs.exec_command.call_count == 1
+    assert not initialized_terminal.pending_garbage
+    for h in handles:
+        with pytest.raises(KeyError):
+            session.mock_run_cmdline(h)
+
+
+def test_batch(initialized_terminal):
+    initialized_terminal.run_python('values = [1, 2]')
+    values = initialized_terminal.get_proxy_object('values', list)
+    session = initialized_terminal.session
+    cs = session.mock_interactivesession.current_shell.return_value
+    cs.exec_command.reset_mock()
+
+    with initialized_terminal.batch() as b:
+        appended = values.append(3)
+        length = values.__len__()
+        item = values[5]
+        last = values[-1]
+
+    assert cs.exec_command.call_count == 1
+    assert len(b) == 4
+    assert appended.result() is None
+    assert length.result() == 3
+    with pytest.raises(IndexError):
+        item.result()
+    assert last.result() == 3
+
+
+def test_batch_recursive_proxy(initialized_terminal):
+    initialized_terminal.run_python("d = {'a': 1}")
+    recproxy = initialized_terminal.get_recursive_proxy('d')
+    copy = recproxy.copy
+
+    with initialized_terminal.batch():
+        d = copy()
+        s = recproxy.__str__()
+
+    assert isinstance(d.result(), _RecursiveProxy)
+    assert d.result().as_local_value() == {'a': 1}
+    assert s.result() == str({'a': 1})
+
+
+def test_batch_queues_only_own_thread(initialized_terminal):
+    initialized_terminal.run_python('values = [1, 2]')
+    values = initialized_terminal.get_proxy_object('values', list)
+    results = []
+
+    def other_thread():
+        results.append(values.__len__())
+
+    with initialized_terminal.batch() as b:
+        appended = values.append(3)
+        t = threading.Thread(target=other_thread)
+        t.start()
+        t.join(10)
+
+    assert results == [2]
+    assert len(b) == 1
+    assert appended.result() is None
+    assert values.__len__() == 3
+
+
+def test_batch_not_sent(initialized_terminal):
+    values = initialized_terminal.get_proxy_object('list', list)
+
+    with pytest.raises(ValueError):
+        with initialized_terminal.batch():
+            future = values()
+            raise ValueError()
+
+    with pytest.raises(BatchNotSent):
+        future.result()
+    assert values() == []
+
+
+def test_get_local_values(initialized_terminal):
+    initialized_terminal.run_python("d = {'a': 1}")
+    proxies = [initialized_terminal.get_proxy_object(handle, None)
+               for handle in ['d', 'd.keys', "d['a']"]]
+    proxies.append(get_proxy_object_from_call(initialized_terminal))
+    session = initialized_terminal.session
+    cs = session.mock_interactivesession.current_shell.return_value
+    cs.exec_command.reset_mock()
+
+    values = initialized_terminal.get_local_values(proxies)
+
+    assert cs.exec_command.call_count == 1
+    assert values[0] == {'a': 1}
+    assert callable(values[1])
+    assert values[2:] == [1, {}]
+
+
+def test_get_local_values_raises(initialized_terminal):
+    initialized_terminal.run_python("d = {'a': 1}")
+    proxies = [initialized_terminal.get_proxy_object(handle, None)
+               for handle in ['d', "d['b']", 'undefined']]
+
+    with pytest.raises(KeyError):
+        initialized_terminal.get_local_values(proxies)
+
+
+def test_get_local_values_empty(initialized_terminal):
+    assert initialized_terminal.get_local_values([]) == []
+
+
+def test_as_chunked_iterator(initialized_terminal):
+    initialized_terminal.run_python('items = list(range(250))')
+    proxy = initialized_terminal.get_proxy_object('items', None)
+    session = initialized_terminal.session
+    cs = session.mock_interactivesession.current_shell.return_value
+    iterator = proxy.as_chunked_iterator(max_items=100, read_ahead=1000)
+    time.sleep(0.1)
+    cs.exec_command.reset_mock()
+
+    assert list(iterator) == list(range(250))
+    assert cs.exec_command.call_count <= 3
+
+
+def test_as_chunked_iterator_raises(initialized_terminal):
+    initialized_terminal.run_python('def items():\n'
+                                    '    yield 1\n'
+                                    '    raise ValueError("message")')
+    proxy = initialized_terminal.get_proxy_object('items()', None)
+    iterator = proxy.as_chunked_iterator()
+
+    assert next(iterator) == 1
+    with pytest.raises(ValueError):
+        next(iterator)
+
+
+def test_as_chunked_iterator_close(initialized_terminal):
+    initialized_terminal.run_python('import itertools')
+    proxy = initialized_terminal.get_proxy_object('itertools.count()', None)
+    iterator = proxy.as_chunked_iterator(max_items=10, read_ahead=10)
+    assert next(iterator) == 0
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    iterator.close()
+    iterator.close()
+
+    assert exec_command.call_count == 1
+    with pytest.raises(StopIteration):
+        next(iterator)
+
+
+@pytest.mark.parametrize('chunksize,expected_requests', [(2, 3), (10, 1)])
+def test_map(initialized_terminal, chunksize, expected_requests):
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    assert initialized_terminal.map('str', range(5), chunksize=chunksize) == [
+        '0', '1', '2', '3', '4']
+    assert exec_command.call_count == expected_requests
+
+
+def test_map_function_proxy(initialized_terminal):
+    function = initialized_terminal.get_recursive_proxy('len')
+
+    assert initialized_terminal.map(function, ['a', 'bb']) == [1, 2]
+
+
+def test_map_raises(initialized_terminal):
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    with pytest.raises(ValueError):
+        initialized_terminal.map('int', ['1', 'a', '2', '3'], chunksize=2)
+    assert exec_command.call_count == 1
+
+
+def test_map_return_exceptions(initialized_terminal):
+    results = initialized_terminal.map('int', ['1', 'a', '2'],
+                                       return_exceptions=True)
+
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 2
+
+
+def test_map_empty(initialized_terminal):
+    assert initialized_terminal.map('int', []) == []
+
+
+PROCEDURE_SOURCE = """
+import os
+
+
+def _double(value):
+    return 2 * value
+
+
+def getlen(path):
+    return len(os.path.join(path, _double(path)))
+"""
+
+
+def test_register_procedure(initialized_terminal):
+    procedure = initialized_terminal.register_procedure('getlen', PROCEDURE_SOURCE)
+
+    assert procedure('ab') == len('ab/abab')
+    assert '_double' not in initialized_terminal.session.namespace
+
+
+def test_register_procedure_once(initialized_terminal):
+    procedure = initialized_terminal.register_procedure('getlen', PROCEDURE_SOURCE)
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+
+    assert initialized_terminal.register_procedure(
+        'getlen', PROCEDURE_SOURCE) is procedure
+    assert not exec_command.called
+
+
+def test_register_procedure_call_sends_handle(initialized_terminal):
+    procedure = initialized_terminal.register_procedure('getlen', PROCEDURE_SOURCE)
+    exec_command = get_exec_command(initialized_terminal)
+    exec_command.reset_mock()
+    procedure('a')
+
+    cmd = exec_command.call_args[0][0]
+    assert 'getlen' not in cmd
+    assert procedure.get_proxy_handle() in cmd
+
+
+def test_register_procedure_missing_name(initialized_terminal):
+    with pytest.raises(KeyError):
+        initialized_terminal.register_procedure('missing', PROCEDURE_SOURCE)
+
+
 def test_broken_session(session_factory, runnerterminal):
     e = Exception()
 
@@ -351,6 +847,99 @@ def test_remote_proxy_timeout(session_factory,
     _verify_proxy_response(proxy, response)
 
 
+def _get_future_proxy(runnerterminal, function):
+    proxy = runnerterminal.get_proxy_object(function, None)
+    proxy.remote_proxy_use_future_response()
+    return proxy
+
+
+def test_future_response(session_factory, runnerterminal):
+    _setup_sleeper_session(session_factory, runnerterminal)
+    proxy = _get_future_proxy(runnerterminal, 'Sleeper().sleep_and_return')
+    slow, fast = proxy(0.5), proxy(0)
+
+    first = wait([slow, fast], timeout=5, return_when=FIRST_COMPLETED)
+
+    assert first.done == {fast}
+    assert first.not_done == {slow}
+    assert fast.result() == 'return'
+    assert not slow.done()
+
+    session = runnerterminal.session
+    cs = session.mock_interactivesession.current_shell.return_value
+    cs.exec_command.reset_mock()
+    done = []
+    slow.add_done_callback(done.append)
+
+    assert wait([slow, fast], timeout=5) == (set([slow, fast]), set())
+    assert cs.exec_command.call_count == 1
+    assert done == [slow]
+    assert slow.result() == 'return'
+
+
+def test_future_response_timeout(session_factory, runnerterminal):
+    _setup_sleeper_session(session_factory, runnerterminal)
+    future = _get_future_proxy(runnerterminal, 'Sleeper().sleep_and_return')(0.5)
+
+    assert wait([future], timeout=0.1) == (set(), set([future]))
+    with pytest.raises(RemoteTimeout):
+        future.result(timeout=0)
+    assert future.result(timeout=5) == 'return'
+
+
+def test_future_response_exception(initialized_terminal):
+    future = _get_future_proxy(initialized_terminal, 'int')('a')
+
+    assert isinstance(future.exception(timeout=5), ValueError)
+    with pytest.raises(ValueError):
+        future.result()
+
+
+def _wait_completed(terminal, completed):
+    for _ in range(100):
+        if terminal.get_response_store_stats()['completed'] == completed:
+            return
+        time.sleep(0.01)
+    assert 0, 'Responses not completed'
+
+
+def test_response_store_stats(initialized_terminal):
+    proxy = initialized_terminal.get_proxy_object('str', None)
+    proxy.remote_proxy_use_asynchronous_response()
+    handles = [proxy(i) for i in range(3)]
+    _wait_completed(initialized_terminal, 3)
+
+    stats = initialized_terminal.get_response_store_stats()
+    assert stats['size'] == 3
+    assert stats['running'] == 0
+    assert proxy.get_remote_proxy_response(handles[0], timeout=1) == '0'
+    assert initialized_terminal.get_response_store_stats()['size'] == 2
+
+
+@pytest.mark.parametrize('use_future', [True, False])
+def test_response_store_expired(initialized_terminal, use_future):
+    proxy = initialized_terminal.get_proxy_object('str', None)
+    if use_future:
+        proxy.remote_proxy_use_future_response()
+    else:
+        proxy.remote_proxy_use_asynchronous_response()
+    handles = [proxy(i) for i in range(2)]
+    _wait_completed(initialized_terminal, 2)
+
+    initialized_terminal.set_response_store_limits(max_size=1)
+
+    stats = initialized_terminal.get_response_store_stats()
+    assert stats['size'] == 1
+    assert stats['evicted_overflow'] == 1
+    with pytest.raises(RemoteResponseExpired) as excinfo:
+        if use_future:
+            wait(handles, timeout=1)
+            handles[0].result()
+        else:
+            proxy.get_remote_proxy_response(handles[0], timeout=1)
+    assert 'expired' in str(excinfo.value)
+
+
 @pytest.mark.xfail(is_windows(), reason="Windows")
 @pytest.mark.parametrize('is_recursive', [True, False])
 def test_back_to_synchronous_response(session_factory,
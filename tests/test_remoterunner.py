@@ -54,6 +54,40 @@ def test_set_terminalpools_maxsize(mock_terminalpools, maxsize):
     set_maxsize.assert_called_once_with(int(maxsize))
 
 
+@pytest.mark.parametrize('window, headroom, expected_window', [
+    ('600', '1.5', 600.0),
+    (None, 1.25, None)])
+def test_set_terminalpools_adaptive_sizing(mock_terminalpools,
+                                           window,
+                                           headroom,
+                                           expected_window):
+    RemoteRunner().set_terminalpools_adaptive_sizing(window, headroom=headroom)
+    set_adaptive_sizing = mock_terminalpools.return_value.set_adaptive_sizing
+    set_adaptive_sizing.assert_called_once_with(window=expected_window,
+                                                headroom=float(headroom))
+
+
+def test_prewarm_terminalpools(mock_terminalpools):
+    prewarm = mock_terminalpools.return_value.prewarm
+
+    assert RemoteRunner().prewarm_terminalpools() == prewarm.return_value
+    prewarm.assert_called_once_with()
+
+
+def test_set_session_rate_limits():
+    with mock.patch('crl.interactivesessions.remoterunner._SessionRateLimiter',
+                    spec_set=True) as p:
+        RemoteRunner().set_session_rate_limits('10', '20', None, '0.5')
+
+    p.return_value.set_limits.assert_called_once_with(
+        rate=10.0, burst=20, max_concurrent=None, jitter=0.5)
+
+
+def test_get_terminal_pool_statistics(mock_terminalpools):
+    get_statistics = mock_terminalpools.return_value.get_statistics
+    assert RemoteRunner().get_terminal_pool_statistics() == get_statistics.return_value
+
+
 @pytest.mark.parametrize('method', [
     lambda: RemoteRunner().get_target_properties(target='na'),
     lambda: RemoteRunner().set_target_property(target_name='na',
@@ -253,6 +287,39 @@ def test_get_proxy_object_in_terminal(remoterunner,
     assert osproxy.uname() == os.uname()
 
 
+def test_execute_python_in_target(remoterunner, mock_interactivesession):
+    result = remoterunner.execute_python_in_target(
+        'import os\nprint(os.path.sep)')
+
+    assert result == ('0', None, '/', None)
+    assert remoterunner.execute_python_in_target('2 * 3').value == 6
+
+
+def test_execute_python_in_target_raises(remoterunner, mock_interactivesession):
+    result = remoterunner.execute_python_in_target('int("a")')
+
+    assert (result.status, result.value) == ('1', None)
+    assert result.exception.startswith('ValueError')
+
+
+def test_call_python_function_in_target(remoterunner,
+                                        mock_interactivesession,
+                                        proxytestpath):
+    result = remoterunner.call_python_function_in_target(
+        'proxytest.ProxyTest', 1, module_path=proxytestpath, timeout=10)
+
+    assert result.status == '0'
+    assert result.value.testid == 1
+
+
+def test_call_python_function_in_target_kwargs(remoterunner,
+                                               mock_interactivesession):
+    result = remoterunner.call_python_function_in_target(
+        'os.path.join', 'a', 'b', target='default')
+
+    assert result == ('0', os.path.join('a', 'b'), '', None)
+
+
 def test_readline_history(remoterunner, normal_shelldicts):
     with bash_remoterunner() as r:
         t = r.get_terminal()
@@ -0,0 +1,333 @@
+import sys
+import itertools
+import threading
+import time
+import pytest
+import mock
+from crl.interactivesessions.RunnerHandler import (
+    _RunnerHandler,
+    _WorkerPool,
+    _ChunkedIterator,
+    _StdoutCapture,
+    _ResponseStore,
+    _ResponseExpired)
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+def test_workerpool_reuses_workers():
+    pool = _WorkerPool(max_idle=2)
+    threads = set()
+    for _ in range(5):
+        done = threading.Event()
+        pool.submit(lambda: (threads.add(threading.current_thread()), done.set()))
+        assert done.wait(1)
+        time.sleep(0.05)
+
+    assert len(threads) == 1
+    assert pool.size == 1
+
+
+def test_workerpool_blocking_task_not_delaying():
+    pool = _WorkerPool(max_idle=1)
+    release = threading.Event()
+    done = threading.Event()
+    pool.submit(release.wait)
+    pool.submit(done.set)
+
+    assert done.wait(1)
+    assert pool.size == 2
+    release.set()
+
+
+def test_workerpool_max_idle():
+    pool = _WorkerPool(max_idle=1)
+    release = threading.Event()
+    for _ in range(3):
+        pool.submit(release.wait)
+    release.set()
+    for _ in range(100):
+        if pool.size == 1:
+            break
+        time.sleep(0.01)
+
+    assert pool.size == 1
+
+
+def test_workerpool_idle_timeout():
+    pool = _WorkerPool(max_idle=1, idle_timeout=0.01)
+    done = threading.Event()
+    pool.submit(done.set)
+    assert done.wait(1)
+    for _ in range(100):
+        if not pool.size:
+            break
+        time.sleep(0.01)
+
+    assert not pool.size
+
+
+class TypeSpecExample(object):
+    def __init__(self):
+        self.value = 1
+        self.function = len
+        self.property_calls = 0
+
+    def method(self):
+        pass
+
+    @staticmethod
+    def static():
+        pass
+
+    @classmethod
+    def clsmethod(cls):
+        pass
+
+    @property
+    def prop(self):
+        self.property_calls += 1
+        return len
+
+    def __getattr__(self, name):
+        if name == 'dynamic':
+            return len
+        raise AttributeError(name)
+
+
+def test_get_type_spec_does_not_trigger_properties():
+    obj = TypeSpecExample()
+
+    _, spec = _RunnerHandler.get_type_spec(obj, 'dynamic')
+
+    assert obj.property_calls == 0
+    assert {k: v for k, v in spec.items() if k != 'property_calls'} == {
+        'value': False,
+        'function': True,
+        'method': True,
+        'static': True,
+        'clsmethod': True,
+        'prop': False,
+        'dynamic': True}
+
+
+def test_get_type_spec_missing():
+    _, spec = _RunnerHandler.get_type_spec(TypeSpecExample(), 'missing')
+
+    assert 'missing' not in spec
+
+
+def get_all_chunks(chunked):
+    chunks = []
+    exhausted = False
+    while not exhausted:
+        chunk, exhausted = chunked.get_chunk()
+        chunks.append(chunk)
+    return chunks
+
+
+@pytest.mark.parametrize('max_items,max_bytes,expected', [
+    (2, 100, [['a', 'b'], ['c', 'd'], ['e']]),
+    (10, 2, [['a', 'b'], ['c', 'd'], ['e']]),
+    (10, 100, [['a', 'b', 'c', 'd', 'e']])])
+def test_chunkediterator_chunks(max_items, max_bytes, expected):
+    chunked = _ChunkedIterator(iter('abcde'),
+                               max_items=max_items,
+                               max_bytes=max_bytes,
+                               read_ahead=10)
+    time.sleep(0.1)
+
+    assert [c for c in get_all_chunks(chunked) if c] == expected
+
+
+def test_chunkediterator_waits_only_first_item():
+    release = threading.Event()
+
+    def items():
+        yield 1
+        release.wait()
+        yield 2
+
+    chunked = _ChunkedIterator(items(), max_items=10, max_bytes=100, read_ahead=10)
+
+    assert chunked.get_chunk() == ([1], False)
+    release.set()
+    assert [i for c in get_all_chunks(chunked) for i in c] == [2]
+
+
+def test_chunkediterator_raises_after_items():
+    def items():
+        yield 1
+        raise ValueError('message')
+
+    chunked = _ChunkedIterator(items(), max_items=10, max_bytes=100, read_ahead=10)
+    time.sleep(0.1)
+
+    assert chunked.get_chunk() == ([1], False)
+    with pytest.raises(ValueError):
+        chunked.get_chunk()
+
+
+def test_chunkediterator_close_stops_reading():
+    chunked = _ChunkedIterator(itertools.count(), max_items=10, max_bytes=100,
+                               read_ahead=1)
+    thread = chunked._thread  # pylint: disable=protected-access
+
+    chunked.close()
+
+    thread.join(1)
+    assert not thread.is_alive()
+
+
+def test_chunkediterator_deletion_stops_reading():
+    chunked = _ChunkedIterator(itertools.count(), max_items=10, max_bytes=100,
+                               read_ahead=1)
+    thread = chunked._thread  # pylint: disable=protected-access
+
+    del chunked
+
+    thread.join(1)
+    assert not thread.is_alive()
+
+
+class MockResponse(object):
+    def __init__(self, age=None):
+        self.done = age is not None
+        self.done_time = None if age is None else time.time() - age
+
+
+def test_responsestore_evicts_expired():
+    store = _ResponseStore(max_age=10, max_size=None)
+    store.add(1, MockResponse(age=20))
+    store.add(2, MockResponse(age=0))
+    store.add(3, MockResponse(age=None))
+
+    with pytest.raises(_ResponseExpired):
+        store.get(1)
+    assert store.get(2).done
+    assert not store.get(3).done
+    assert store.get_stats()['evicted_expired'] == 1
+
+
+def test_responsestore_evicts_oldest_completed():
+    store = _ResponseStore(max_age=None, max_size=1)
+    store.add(1, MockResponse(age=None))
+    store.add(2, MockResponse(age=0))
+    store.add(3, MockResponse(age=0))
+
+    assert len(store) == 2
+    with pytest.raises(_ResponseExpired):
+        store.get(2)
+    assert store.get_stats()['evicted_overflow'] == 1
+
+
+def test_responsestore_unknown_response():
+    store = _ResponseStore()
+
+    with pytest.raises(KeyError) as excinfo:
+        store.get(1)
+    assert not isinstance(excinfo.value, _ResponseExpired)
+
+
+def test_stdoutcapture_captures_only_current_thread():
+    capture = _StdoutCapture()
+    original = sys.stdout
+    started = threading.Event()
+    release = threading.Event()
+    outputs = []
+
+    def capture_in_thread():
+        with capture.capture() as buf:
+            started.set()
+            release.wait(1)
+            sys.stdout.write('thread')
+        outputs.append(buf.getvalue())
+
+    thread = threading.Thread(target=capture_in_thread)
+    thread.start()
+    assert started.wait(1)
+    with capture.capture() as buf:
+        sys.stdout.write('main')
+    release.set()
+    thread.join(1)
+
+    assert (buf.getvalue(), outputs) == ('main', ['thread'])
+    assert sys.stdout is original
+
+
+@pytest.mark.parametrize('code,expected_value,expected_stdout', [
+    ('1 + 1', 2, ''),
+    ('import os\nprint(os.sep)', None, '/\n')])
+def test_execute_python(code, expected_value, expected_stdout):
+    assert _RunnerHandler().execute_python(code) == (
+        expected_value, expected_stdout, None)
+
+
+def test_execute_python_raises():
+    value, stdout, exception = _RunnerHandler().execute_python(
+        'print(1); 1 / 0')
+
+    assert (value, stdout) == (None, '1\n')
+    assert exception.startswith('ZeroDivisionError')
+
+
+def test_call_python_function():
+    assert _RunnerHandler().call_python_function(
+        'os.path.join', ('a', 'b'), {}) == ('a/b', '', None)
+
+
+def test_import_object_not_found():
+    with pytest.raises(ImportError):
+        _RunnerHandler.import_object('notexistingmodule.function')
+
+
+def test_responsestore_keeps_unfetched_by_default():
+    store = _ResponseStore()
+    for response_id in range(1100):
+        store.add(response_id, MockResponse(age=7200))
+
+    assert len(store) == 1100
+    assert store.get(0).done
+    assert store.get_stats()['evicted_expired'] == 0
+
+
+def test_responsestore_no_eviction_scan_without_limits():
+    store = _ResponseStore()
+    responses = [MockResponse(age=7200) for _ in range(5)]
+    with mock.patch('time.time', side_effect=AssertionError) as mock_time:
+        for response_id, response in enumerate(responses):
+            store.add(response_id, response)
+            assert store.get(response_id) is response
+        assert store.get_stats()['completed'] == 5
+
+    assert not mock_time.called
+
+
+def test_responsestore_evicts_in_completion_order():
+    store = _ResponseStore(max_age=None, max_size=1)
+    running = [MockResponse(age=None) for _ in range(2)]
+    for response_id, response in enumerate(running):
+        store.add(response_id, response)
+    for response_id in (1, 0):
+        running[response_id].done = True
+        running[response_id].done_time = time.time()
+        store.set_done(response_id)
+
+    assert store.get(0) is running[0]
+    with pytest.raises(_ResponseExpired):
+        store.get(1)
+    assert store.get_stats()['running'] == 0
+
+
+def test_responsestore_ids_not_reused_after_eviction():
+    store = _ResponseStore(max_age=None, max_size=0)
+    ids = []
+    for _ in range(5):
+        response_id = store.new_id()
+        store.add(response_id, MockResponse(age=0))
+        ids.append(response_id)
+
+    assert len(set(ids)) == 5
+    with pytest.raises(_ResponseExpired):
+        store.get(ids[0])
@@ -55,4 +55,13 @@ def test_run_in_nocomm_background(executable_kwargs,
             if executable_kwargs else
             r.properties.default_executable),
         shelldicts=runner_in_target_background.shelldicts,
-        properties=r.properties)
+        properties=r.properties,
+        poolhandle=r.get_poolhandle(runner_in_target_background.process_cls.zone))
+
+
+def test_get_poolhandle():
+    r = _RunnerInTarget([{'shellname': 'ExampleShell'}])
+
+    assert r.get_poolhandle() is r.get_poolhandle()
+    assert r.get_poolhandle('background') is not r.get_poolhandle()
+    assert r.get_poolhandle('background').key != r.get_poolhandle().key
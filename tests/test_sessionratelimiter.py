@@ -0,0 +1,104 @@
+import threading
+import pytest
+import mock
+from crl.interactivesessions._sessionratelimiter import (
+    _TokenBucket,
+    _SessionRateLimiter)
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+@pytest.fixture
+def mock_monotonic():
+    with mock.patch('crl.interactivesessions._sessionratelimiter.monotonic',
+                    return_value=0) as p:
+        yield p
+
+
+@pytest.fixture
+def mock_sleep():
+    with mock.patch('time.sleep') as p:
+        yield p
+
+
+@pytest.fixture
+def ratelimiter():
+    r = _SessionRateLimiter()
+    try:
+        yield r
+    finally:
+        r.set_limits()
+
+
+def test_tokenbucket(mock_monotonic):
+    b = _TokenBucket(rate=2, burst=2)
+
+    assert [b.reserve() for _ in range(4)] == [0, 0, 0.5, 1]
+    mock_monotonic.return_value = 3
+    assert [b.reserve() for _ in range(3)] == [0, 0, 0.5]
+
+
+@pytest.mark.usefixtures('mock_monotonic')
+def test_ratelimiter_delays_throttled(ratelimiter, mock_sleep):
+    ratelimiter.set_limits(rate=1, burst=1, max_concurrent=None, jitter=0.5)
+    for _ in range(2):
+        with ratelimiter.limit('host'):
+            pass
+    with ratelimiter.limit('other'):
+        pass
+    with ratelimiter.limit(None):
+        pass
+
+    assert mock_sleep.call_count == 1
+    delay = mock_sleep.call_args[0][0]
+    assert 1 <= delay <= 1.5
+
+
+def test_ratelimiter_disabled_by_default(ratelimiter, mock_sleep):
+    entered = []
+    with ratelimiter.limit('host'):
+        for _ in range(20):
+            with ratelimiter.limit('host'):
+                entered.append(True)
+
+    assert len(entered) == 20
+    assert not mock_sleep.called
+
+
+def test_ratelimiter_no_rate(ratelimiter, mock_sleep):
+    ratelimiter.set_limits(rate=None, max_concurrent=None)
+    for _ in range(20):
+        with ratelimiter.limit('host'):
+            pass
+
+    assert not mock_sleep.called
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'rate': 0},
+    {'rate': -1},
+    {'rate': 1, 'burst': 0}])
+def test_ratelimiter_invalid_limits(ratelimiter, kwargs):
+    ratelimiter.set_limits(rate=1, burst=2)
+    with pytest.raises(ValueError):
+        ratelimiter.set_limits(**kwargs)
+
+    assert (ratelimiter.rate, ratelimiter.burst) == (1, 2)
+
+
+def test_ratelimiter_max_concurrent(ratelimiter):
+    ratelimiter.set_limits(rate=None, max_concurrent=1)
+    entered = threading.Event()
+    with ratelimiter.limit('host'):
+        t = threading.Thread(target=lambda: _enter(ratelimiter, entered))
+        t.start()
+        assert not entered.wait(0.1)
+    t.join(1)
+
+    assert entered.is_set()
+
+
+def _enter(ratelimiter, entered):
+    with ratelimiter.limit('host'):
+        entered.set()
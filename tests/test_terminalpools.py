@@ -3,14 +3,17 @@ import logging
 from collections import namedtuple
 import itertools
 import pytest
+from monotonic import monotonic
 import mock
 from fixtureresources.fixtures import create_patch
 
 from crl.interactivesessions._terminalpools import (
     _TerminalPools,
+    _TerminalPoolHandle,
     TerminalPoolsBusy,
     PoolNotFoundError,
     InteractiveSessionError)
+from crl.interactivesessions._terminalpoolkey import _TerminalPoolKey
 
 
 __copyright__ = 'Copyright (C) 2019, Nokia'
@@ -280,3 +283,199 @@ def test_nonpool_terminal_put(terminalpools, error):
         terminalpools.put(t)
 
     assert t.key == excinfo.value.args[0]
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_statistics(terminalpools):
+    pargs = PropertiesArgs(2)
+    t = terminalpools.get(*pargs.get_args(0))
+    terminalpools.put(t)
+    terminalpools.put(terminalpools.get(*pargs.get_args(0)))
+    for elapsed in [1, 2]:
+        t.terminal.session.set_initialized.call_args[0][0](elapsed)
+
+    stats = terminalpools.get_statistics()[str(t.key)]
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['creations'] == 2
+    assert stats['recoveries'] == 1
+    assert stats['creation_latency']['max'] == 2
+    assert stats['checkout_wait']['max'] is not None
+    assert stats['free'] == 1
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_get_with_handle(terminalpools):
+    terminalpools.set_maxsize(2)
+    pargs = PropertiesArgs(2)
+    shelldicts, properties = pargs.get_args(0)
+    handle = _TerminalPoolHandle(shelldicts)
+    t = terminalpools.get_with_handle(handle, properties)
+    terminalpools.put(t)
+
+    assert terminalpools.get(shelldicts, properties) == t
+    assert t.key == handle.key
+    assert terminalpools.size == 1
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_handle_resolved_after_pool_removal(terminalpools):
+    terminalpools.set_maxsize(1)
+    pargs = PropertiesArgs(1)
+    handles = [_TerminalPoolHandle(pargs.get_args(i)[0]) for i in range(2)]
+    for handle in handles + handles:
+        terminalpools.put(terminalpools.get_with_handle(handle, pargs.properties))
+        assert terminalpools.size == 1
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_size_after_close(terminalpools):
+    terminalpools.set_maxsize(3)
+    pargs = PropertiesArgs(3)
+    for i in range(3):
+        terminalpools.get(*pargs.get_args(i))
+    assert terminalpools.size == 3
+
+    terminalpools.close()
+
+    assert terminalpools.size == 0
+
+
+@pytest.mark.parametrize('shelldicts, expected_host', [
+    ([{'shellname': 'BashShell'}], None),
+    ([{'shellname': 'SshShell', 'host': 'h1'},
+      {'shellname': 'SshShell', 'host': 'h2'}], ('h1', 'h2'))])
+def test_terminal_spawn_context(mock_autorunnerterminal,
+                                terminalpools,
+                                shelldicts,
+                                expected_host):
+    t = terminalpools.get(shelldicts, PropertiesArgs(1).properties)
+    set_spawn_context = t.terminal.session.set_spawn_context
+    with mock.patch('crl.interactivesessions._terminalpools'
+                    '._SessionRateLimiter') as mock_ratelimiter:
+        set_spawn_context.call_args[0][0]()
+
+    mock_ratelimiter.return_value.limit.assert_called_once_with(expected_host)
+
+
+@pytest.fixture
+def adaptive_terminalpools(terminalpools):
+    terminalpools.set_adaptive_sizing(window=60)
+    try:
+        yield terminalpools
+    finally:
+        terminalpools.set_adaptive_sizing(window=None)
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_adaptive_sizing_trims_idle(adaptive_terminalpools):
+    adaptive_terminalpools.set_maxsize(10)
+    pargs = PropertiesArgs(5)
+    terminals = [adaptive_terminalpools.get(*pargs.get_args(0)) for _ in range(4)]
+    for t in terminals:
+        adaptive_terminalpools.put(t)
+    assert adaptive_terminalpools.size == 4
+
+    with mock.patch('crl.interactivesessions._poolstatistics.monotonic',
+                    return_value=monotonic() + 120):
+        adaptive_terminalpools.put(adaptive_terminalpools.get(*pargs.get_args(0)))
+
+    assert adaptive_terminalpools.size == 2
+
+
+def _get_and_remove(terminalpools, pargs, i, n):
+    terminals = [terminalpools.get(*pargs.get_args(i)) for _ in range(n)]
+    for t in terminals:
+        terminalpools.remove(t)
+
+
+@pytest.mark.parametrize('maxsize, expected_opened', [(10, 4), (3, 3)])
+def test_terminalpools_prewarm(mock_autorunnerterminal,
+                               adaptive_terminalpools,
+                               maxsize,
+                               expected_opened):
+    adaptive_terminalpools.set_maxsize(maxsize)
+    pargs = PropertiesArgs(5)
+    _get_and_remove(adaptive_terminalpools, pargs, 0, 3)
+    assert adaptive_terminalpools.size == 0
+
+    assert adaptive_terminalpools.prewarm() == expected_opened
+
+    initialize_if_needed = mock_autorunnerterminal.return_value.initialize_if_needed
+    assert initialize_if_needed.call_count == expected_opened
+    for _ in range(expected_opened):
+        adaptive_terminalpools.get(*pargs.get_args(0))
+    assert adaptive_terminalpools.size == expected_opened
+
+
+def test_terminalpools_prewarm_removes_failed(mock_autorunnerterminal,
+                                              adaptive_terminalpools):
+    pargs = PropertiesArgs(5)
+    _get_and_remove(adaptive_terminalpools, pargs, 0, 2)
+    initialize_if_needed = mock_autorunnerterminal.return_value.initialize_if_needed
+    initialize_if_needed.side_effect = ExampleException
+
+    assert adaptive_terminalpools.prewarm() == 0
+
+    assert adaptive_terminalpools.size == 0
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_prewarm_without_adaptive_sizing(terminalpools):
+    pargs = PropertiesArgs(5)
+    _get_and_remove(terminalpools, pargs, 0, 2)
+
+    assert terminalpools.prewarm() == 0
+    assert terminalpools.size == 0
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_adaptive_sizing_cleans_idle_first(adaptive_terminalpools):
+    adaptive_terminalpools.set_maxsize(4)
+    pargs = PropertiesArgs(4)
+    idle = [adaptive_terminalpools.get(*pargs.get_args(0)) for _ in range(2)]
+    for t in idle:
+        adaptive_terminalpools.put(t)
+    busy = [adaptive_terminalpools.get(*pargs.get_args(1)) for _ in range(2)]
+    for t in busy:
+        adaptive_terminalpools.put(t)
+
+    with mock.patch('crl.interactivesessions._poolstatistics.monotonic',
+                    return_value=monotonic() + 120):
+        t = [adaptive_terminalpools.get(*pargs.get_args(1)) for _ in range(3)]
+
+    assert not set(t).intersection(idle)
+    assert set(busy).issubset(t)
+    assert adaptive_terminalpools.size == 3
+
+
+def _measure_checkouts(terminalpools, npools, ncycles):
+    pargs = PropertiesArgs(2)
+    terminalpools.set_maxsize(2 * npools)
+    handles = [_TerminalPoolHandle(pargs.get_args(i)[0]) for i in range(npools)]
+    for handle in handles:
+        terminalpools.put(terminalpools.get_with_handle(handle, pargs.properties))
+
+    with mock.patch.object(_TerminalPoolKey, 'get', autospec=True,
+                           side_effect=_TerminalPoolKey.get) as mock_get:
+        start = monotonic()
+        for i in range(ncycles):
+            terminalpools.put(terminalpools.get_with_handle(handles[i % npools],
+                                                            pargs.properties))
+        average = (monotonic() - start) / ncycles
+
+    logger.info('Average checkout and return with %d pools: %.1f us',
+                npools, average * 1e6)
+    assert terminalpools.size == npools
+    terminalpools.close()
+    return mock_get.call_count
+
+
+@pytest.mark.usefixtures('mock_autorunnerterminal')
+def test_terminalpools_checkout_microbenchmark(terminalpools):
+    ncycles = 10000
+    small_ops = _measure_checkouts(terminalpools, npools=10, ncycles=ncycles)
+    large_ops = _measure_checkouts(terminalpools, npools=1000, ncycles=ncycles)
+
+    assert large_ops == small_ops
+    assert small_ops <= 2 * ncycles
@@ -0,0 +1,38 @@
+import pytest
+from crl.interactivesessions._typespeccache import _TypeSpecCache
+
+
+__copyright__ = 'Copyright (C) 2019, Nokia'
+
+
+@pytest.fixture
+def cache():
+    c = _TypeSpecCache()
+    c.update('a', {'f': True, 'v': False})
+    c.update('b', {'g': True})
+    return c
+
+
+def test_get(cache):
+    assert cache.get('a', 'f')
+    assert not cache.get('a', 'v')
+    with pytest.raises(KeyError):
+        cache.get('a', 'g')
+    with pytest.raises(KeyError):
+        cache.get('c', 'f')
+
+
+def test_update_merges(cache):
+    cache.update('a', {'_private': False})
+
+    assert cache.get('a', 'f')
+    assert not cache.get('a', '_private')
+
+
+@pytest.mark.parametrize('type_key,expected_len', [('a', 1), (None, 0)])
+def test_invalidate(cache, type_key, expected_len):
+    cache.invalidate(type_key)
+
+    assert len(cache) == expected_len
+    with pytest.raises(KeyError):
+        cache.get('a', 'f')